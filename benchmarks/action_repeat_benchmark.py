@@ -0,0 +1,48 @@
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.trainer_config import REWARD_TERMS
+
+ACTION_REPEATS = [1, 2, 4, 8] # Valores de action repeat a comparar
+GENERATIONS = 3 # Generaciones por cada valor
+
+def run_benchmark(action_repeats=ACTION_REPEATS, generations=GENERATIONS) -> list:
+    """
+    Compara pasos por segundo y recompensa por generacion para distintos valores de action repeat.
+    Todas las corridas usan la misma configuracion de recompensas.
+    """
+    from trainer.env.rewards_and_penalty import RewardsAndPenalty
+    from trainer.headless_view import HeadlessView
+    from trainer.training import Train
+
+    RewardsAndPenalty.get_random_rewards_and_penalty()
+    weights = {name: float(getattr(RewardsAndPenalty, name)) for name in REWARD_TERMS}
+
+    results = []
+    for action_repeat in action_repeats:
+        train = Train(HeadlessView(), reward_weights=weights)
+        train.action_repeat = action_repeat
+
+        steps = 0
+        rewards = []
+        start = time.perf_counter()
+        for _ in range(generations):
+            train_rewards = train.run_generation()
+            steps += train.last_generation_steps
+            rewards.append(float(np.mean(train_rewards)))
+            train.evolve_population(avg_rewards=train_rewards)
+        elapsed = time.perf_counter() - start
+
+        results.append({'action_repeat': action_repeat,
+                        'steps_per_sec': steps / elapsed,
+                        'mean_reward': float(np.mean(rewards))})
+        print(f"action_repeat={action_repeat:>2} | {steps / elapsed:10.1f} pasos/s | "
+              f"recompensa media {np.mean(rewards):.3f}")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
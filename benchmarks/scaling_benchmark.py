@@ -0,0 +1,137 @@
+import sys
+import os
+import csv
+import time
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Configuracion base; cada eje se barre por separado manteniendo el resto en la base
+BASE_CONFIG = {'agents': 3, 'foods': 10, 'world_scale': 1, 'steps': 1000}
+AXES = {
+    'agents': [3, 10, 30, 100, 300],
+    'foods': [10, 50, 200, 1000],
+    'world_scale': [1, 2, 4, 8],
+    'steps': [500, 2000, 8000],
+}
+PHASES = ('perception', 'dynamics', 'rewards', 'inference', 'learn')
+RESULTS_PATH = "benchmarks/results/"
+
+def run_config(config: dict) -> dict:
+    """
+    Proceso trabajador (uno nuevo por configuracion, asi el pico de memoria es solo de esta
+    corrida): simula una generacion sin ventana con un Agent por cyra, como Train, y aprende
+    al final. Retorna el throughput, el tiempo de cada fase y el pico de memoria (RSS).
+    """
+    import numpy as np
+    import torch
+    from config.general_config import WINDOWS_WIDTH, WINDOWS_HEIGHT
+    from config.trainer_config import REWARD_TERMS
+    from cyra_ai.agent.agent import Agent
+    from trainer.env.batched_world import BatchedWorld
+    from trainer.env.reward_engine import RewardEngine
+    from trainer.telemetry.memory_monitor import process_memory_mb
+
+    torch.set_num_threads(1)
+    num_agents = config['agents']
+    width = WINDOWS_WIDTH * config['world_scale']
+    height = WINDOWS_HEIGHT * config['world_scale']
+    engine = RewardEngine({name: 1.0 for name in REWARD_TERMS}, width=width, height=height) # Los pesos no cambian el costo
+    world = BatchedWorld(1, num_agents, config['foods'], width=width, height=height, reward_engine=engine, seed=0)
+    world.phase_times = {}
+    agents = [Agent(record_trajectory=True) for _ in range(num_agents)]
+
+    observations = world.reset()
+    inference_time = 0.0
+    start = time.perf_counter()
+    for _ in range(config['steps']):
+        inference_start = time.perf_counter()
+        for i, agent in enumerate(agents):
+            agent.select_action(observations[0, i])
+        raw_actions = np.stack([agent.actions[-1] for agent in agents])[None]
+        inference_time += time.perf_counter() - inference_start
+
+        observations, rewards, _, _ = world.step(raw_actions)
+        for i, agent in enumerate(agents):
+            agent.store_reward(float(rewards[0, i]))
+    rollout_time = time.perf_counter() - start
+
+    learn_start = time.perf_counter()
+    for agent in agents:
+        agent.learn()
+    learn_time = time.perf_counter() - learn_start
+
+    peak_mb = process_memory_mb(peak=True) # Pico de este proceso (getrusage o GetProcessMemoryInfo en Windows)
+
+    agent_steps = config['steps'] * num_agents
+    result = dict(config)
+    result.update({'agent_steps_per_sec': agent_steps / rollout_time,
+                   'steps_per_sec': config['steps'] / rollout_time,
+                   'generation_seconds': rollout_time + learn_time,
+                   'peak_rss_mb': peak_mb})
+    phase_times = dict(world.phase_times, inference=inference_time, learn=learn_time)
+    for phase in PHASES:
+        result[f"{phase}_seconds"] = phase_times.get(phase, 0.0)
+    return result
+
+def scaling_configs(base: dict=BASE_CONFIG, axes: dict=AXES) -> list:
+    """Una configuracion por valor de cada eje (sin repetir la base)."""
+    configs = [dict(base, axis='base')]
+    for axis, values in axes.items():
+        for value in values:
+            if value != base[axis]:
+                configs.append(dict(base, **{axis: value}, axis=axis))
+    return configs
+
+def run_benchmark(configs: list=None, results_path: str=RESULTS_PATH) -> list:
+    """Corre cada configuracion en un proceso nuevo (de a una, para no mezclar tiempos) y guarda los resultados."""
+    configs = configs or scaling_configs()
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with context.Pool(processes=1, maxtasksperchild=1) as pool:
+        for config in configs:
+            run_config_args = {key: value for key, value in config.items() if key != 'axis'}
+            result = pool.apply(run_config, (run_config_args,))
+            result['axis'] = config['axis']
+            results.append(result)
+            print(f"{config['axis']:<12} agentes={result['agents']:<4} comida={result['foods']:<5} "
+                  f"escala={result['world_scale']:<2} pasos={result['steps']:<5} | "
+                  f"{result['agent_steps_per_sec']:10.1f} pasos-agente/s | pico {result['peak_rss_mb']:.0f} MB")
+
+    os.makedirs(results_path, exist_ok=True)
+    with open(os.path.join(results_path, "scaling.csv"), "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+    plot_results(results, results_path)
+    return results
+
+def plot_results(results: list, results_path: str=RESULTS_PATH) -> None:
+    """Una figura por eje: throughput, tiempo por paso de cada fase y pico de memoria."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    base = next(result for result in results if result['axis'] == 'base')
+    for axis in AXES:
+        rows = sorted([base] + [result for result in results if result['axis'] == axis], key=lambda row: row[axis])
+        values = [row[axis] for row in rows]
+
+        figure, (throughput_ax, phases_ax, memory_ax) = plt.subplots(1, 3, figsize=(15, 4))
+        throughput_ax.plot(values, [row['agent_steps_per_sec'] for row in rows], marker="o")
+        throughput_ax.set_title("Pasos-agente por segundo")
+        for phase in PHASES:
+            phases_ax.plot(values, [row[f"{phase}_seconds"] / row['steps'] * 1000 for row in rows], marker="o", label=phase)
+        phases_ax.set_title("ms por paso de cada fase")
+        phases_ax.legend()
+        memory_ax.plot(values, [row['peak_rss_mb'] for row in rows], marker="o")
+        memory_ax.set_title("Pico de memoria (MB)")
+        for ax in (throughput_ax, phases_ax, memory_ax):
+            ax.set_xlabel(axis)
+            ax.set_xscale("log")
+        figure.tight_layout()
+        figure.savefig(os.path.join(results_path, f"scaling_{axis}.png"))
+        plt.close(figure)
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+import json
+import statistics
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modulos de entrada a medir (solo se importan, no se ejecuta el entrenamiento)
+ENTRY_MODULES = [
+    "headless_main",
+    "sweep_main",
+    "trainer.trainer_headless",
+    "trainer.training",
+    "cyra_ai.agent.agent",
+    "main",
+]
+HEAVY_MODULES = ["pygame", "torch", "pandas", "numpy", "dash", "plotly"] # Dependencias pesadas a vigilar
+REPEATS = 5 # Repeticiones por modulo (se reporta la mediana)
+
+MEASURE_CODE = """
+import sys, time, json
+start = time.perf_counter()
+try:
+    import {module}
+    error = None
+except Exception as exc:
+    error = repr(exc)
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy} if name in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy, "error": error}}))
+"""
+
+def measure_module(module: str, repeats: int=REPEATS) -> dict:
+    """Importa el modulo en procesos nuevos y devuelve el tiempo mediano y las dependencias pesadas cargadas."""
+    times = []
+    result = None
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", MEASURE_CODE.format(module=module, heavy=HEAVY_MODULES)],
+                                cwd=ROOT_PATH, capture_output=True, text=True)
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        times.append(result["elapsed"])
+    return {"module": module, "median_ms": statistics.median(times) * 1000,
+            "heavy": result["heavy"], "error": result["error"]}
+
+def run_benchmark() -> list:
+    results = [measure_module(module) for module in ENTRY_MODULES]
+    for result in results:
+        status = f"ERROR {result['error']}" if result["error"] else ", ".join(result["heavy"]) or "-"
+        print(f"{result['module']:<28} {result['median_ms']:9.1f} ms | {status}")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -2,5 +2,126 @@ NUM_AGENTS=3 # El numero de agentes (Cyras) que van a entrenarse al mismo tiempo
 
 MAX_STEPS=20000 # Numero maximo de pasos que va a tener el entrenamiento
 
+ACTION_REPEAT=1 # Cantidad de pasos que se mantiene cada accion (frame-skip). 1 = una inferencia por paso
+
 NEW_TRAIN=True
-TRAIN_AGE=1
\ No newline at end of file
+TRAIN_AGE=1
+
+# --- API local de control
+CONTROL_ENABLED=True # Habilita el servidor local para controlar el entrenamiento (start, stop, pause, etc)
+CONTROL_HOST="127.0.0.1" # Direccion donde escucha el servidor de control
+CONTROL_PORT=8765 # Puerto del servidor de control
+CONTROL_CHECK_STEPS=200 # Cada cuantos pasos se revisan los comandos y eventos (limite de chunk)
+RENDER_INTERVAL=1 # Cada cuantos pasos se actualiza la pantalla (0 = no renderizar durante la generacion)
+HEADLESS_AUTOSTART=True # En modo sin ventana, empieza a entrenar sin esperar el comando "start"
+
+# --- Terminos de recompensa/penalizacion (mismos nombres que RewardsAndPenalty y el csv)
+REWARD_TERMS=(
+    'upgrade_food_dist_bonus', 'food_eat_bonus', 'food_found_bonus', 'hunger_good_bonus',
+    'no_upgrade_food_dist_penalty', 'no_food_in_range_penalty', 'hunger_hungry_penalty', 'hunger_critic_penalty',
+    'energy_recharge_bonus', 'energy_good_bonus', 'energy_weary_penalty', 'energy_critic_penalty',
+    'health_recove_bonus', 'health_any_bonus', 'health_good_bonus', 'health_loss_penalty',
+    'health_wounded_penalty', 'health_critic_penalty', 'dead_penalty',
+    'change_direction_bonus', 'away_border_bonus', 'border_penalty', 'corner_penalty', 'repeat_position_penalty')
+
+# --- Barrido de pesos de recompensa (ASHA / successive halving)
+SWEEP_TRIALS=27 # Cantidad de configuraciones de recompensa a probar
+SWEEP_WORKERS=4 # Procesos en paralelo
+SWEEP_MIN_GENERATIONS=1 # Generaciones del primer escalon (rung)
+SWEEP_MAX_GENERATIONS=27 # Generaciones maximas de una configuracion
+SWEEP_ETA=3 # Factor de reduccion: solo pasa 1/ETA de cada escalon
+
+# --- Rollouts distribuidos (learner / workers por TCP)
+DISTRIBUTED_HOST="127.0.0.1" # Direccion donde escucha el learner
+DISTRIBUTED_PORT=8766 # Puerto del learner
+DISTRIBUTED_TASKS_PER_GENERATION=4 # Rollouts (mundos independientes) por generacion
+DISTRIBUTED_WORKER_TIMEOUT=900 # Segundos maximos que puede tardar un worker en devolver un rollout
+DISTRIBUTED_MAX_RETRIES=3 # Reintentos de un rollout si se pierde el worker
+
+# --- Evaluacion de modelos guardados
+EVAL_EPISODES=16 # Episodios (con semillas distintas) por cada checkpoint
+EVAL_STEPS=5000 # Pasos maximos por episodio de evaluacion
+EVAL_WORKERS=4 # Procesos en paralelo
+EVAL_BASE_SEED=1000 # Semilla del primer episodio (los checkpoints comparten las mismas semillas)
+EVAL_REWARD_AGE=None # Era cuyos pesos de recompensa puntuan todos los checkpoints (None = cada uno con los de su era: los retornos no se comparan entre eras)
+
+# --- Telemetria de memoria
+MEMORY_TELEMETRY=True # Muestra de memoria (RSS, tensores por agente) en cada generacion
+MEMORY_TRACEMALLOC=False # Activa tracemalloc para ver los mayores asignadores (hace mas lento el entrenamiento)
+MEMORY_TOP_ALLOCATORS=5 # Cantidad de asignadores a reportar con tracemalloc
+MEMORY_WARMUP_GENERATIONS=2 # Generaciones antes de fijar la memoria base
+MEMORY_GROWTH_THRESHOLD_MB=256 # Crecimiento (MB) sobre la base que dispara una advertencia
+
+# --- Generaciones en pipeline (aprender mientras se simula la siguiente generacion)
+PIPELINE_ENABLED=False # Aprende la generacion anterior en un hilo mientras se recolecta la siguiente
+PIPELINE_MAX_LAG=1 # Maximo de generaciones que la politica de los actores puede ir por detras del learner
+
+# --- Seleccion con common random numbers (todos los candidatos desde el mismo estado del mundo)
+CRN_SELECTION=False # Elige al mejor agente con evaluaciones desde fotos identicas del mundo
+CRN_EVAL_STEPS=500 # Pasos por evaluacion de cada candidato
+CRN_EPISODES=2 # Fotos (estados iniciales) distintas por evaluacion
+
+# --- Grabacion de frames
+RECORDING_ENABLED=False # Graba frames del entrenamiento (se puede activar con el comando "record 1")
+RECORDING_MODE="surface" # "surface": copia la pantalla | "snapshot": guarda el mundo y lo dibuja el hilo escritor
+RECORDING_STRIDE=10 # Cada cuantos pasos se graba un frame
+RECORDING_DOWNSAMPLE=2 # Reduce la resolucion tomando 1 de cada N pixeles
+RECORDING_QUEUE_SIZE=64 # Frames en espera como maximo (si se llena, se descartan frames en vez de frenar)
+RECORDING_CHUNK_FRAMES=100 # Frames por archivo .npz comprimido
+RECORDING_FORMAT="npz" # "npz" (arrays comprimidos) o "png" (secuencia de imagenes)
+RECORDING_PATH="./recordings/" # Carpeta donde se guardan las grabaciones
+
+# --- Almacen de modelos (hall of fame)
+MODEL_STORE_ENABLED=True # Guarda cada mejor modelo en el almacen direccionado por contenido
+MODEL_STORE_LINEAGE=False # Guarda tambien el elite y los clones mutados de cada generacion (linaje completo, escribe NUM_AGENTS modelos por generacion)
+MODEL_STORE_PATH="./cyraai_models/store/" # Carpeta del almacen
+
+# --- Pre-filtrado de mutantes
+PRESCREEN_ENABLED=False # Genera muchos mutantes y solo pasan a la generacion completa los mejores en rollouts cortos
+PRESCREEN_CANDIDATES=12 # Mutantes generados por generacion
+PRESCREEN_STEPS=300 # Pasos de cada rollout corto
+PRESCREEN_EPISODES=1 # Fotos del mundo por rollout corto (las mismas para todos los mutantes)
+
+# --- Servidor de inferencia
+INFERENCE_HOST="127.0.0.1" # Direccion del servidor de inferencia
+INFERENCE_PORT=8767 # Puerto del servidor de inferencia
+INFERENCE_MAX_BATCH=256 # Observaciones maximas por forward del Actor
+INFERENCE_MAX_WAIT_MS=2.0 # Espera maxima para juntar peticiones en un lote
+INFERENCE_LATENCY_WINDOW=10000 # Peticiones recientes usadas para los percentiles de latencia
+
+# --- Mundos en lote (BatchedWorld)
+BATCHED_NUM_FOODS=10 # Comida por mundo
+BATCHED_EAT_RADIUS=18.0 # Distancia a la que un cyra come (radio de su cuerpo)
+REWARD_BREAKDOWN=False # BatchedWorld devuelve la contribucion de cada termino de recompensa en cada paso
+
+# --- Metricas en vivo
+METRICS_ENABLED=False # Sirve metricas en formato Prometheus mientras se entrena
+METRICS_HOST="127.0.0.1" # Direccion del endpoint de metricas
+METRICS_PORT=8768 # Puerto del endpoint de metricas (GET /metrics)
+
+# --- Estrategias evolutivas (ES)
+ES_PAIRS=32 # Pares antiteticos (semillas) por generacion
+ES_SIGMA=0.02 # Desviacion de las perturbaciones
+ES_LEARNING_RATE=0.01 # Tasa de aprendizaje de la actualizacion ES
+ES_WORKERS=4 # Procesos evaluando candidatos en paralelo
+ES_EPISODE_STEPS=2000 # Pasos por evaluacion de cada candidato
+ES_ANCHOR_INTERVAL=20 # Cada cuantas generaciones se guardan los pesos completos (ancla) para los trabajadores
+ES_BASE_SEED=0 # Semilla base de los episodios (todos los candidatos de una generacion usan la misma)
+
+# --- Percepcion por sectores
+PERCEPTION_SECTORS=0 # Sectores angulares agregados a la observacion de BatchedWorld (0 = desactivado)
+PERCEPTION_RADIUS=150.0 # Radio de la percepcion por sectores (igual al radio de deteccion de Cyra)
+
+# --- Aprendizaje de la poblacion en lote
+BATCHED_LEARN=False # Un solo forward/backward (vmap) y un paso de Adam multi-tensor para toda la poblacion
+
+# --- Cache de fitness (estadisticas del elite entre generaciones)
+FITNESS_CACHE_ENABLED=False # Acumula los retornos por hash de pesos y elige por la estimacion acumulada (el elite no aprende, no se combina con CRN_SELECTION)
+FITNESS_CACHE_Z=1.0 # Errores estandar que se restan a la media al elegir (0 = solo la media)
+FITNESS_CACHE_SKIP_TIGHT=False # El elite con estimacion precisa no se vuelve a simular y su lugar es para otro mutante
+FITNESS_CACHE_MIN_SAMPLES=3 # Muestras minimas antes de considerar precisa una estimacion
+FITNESS_CACHE_TOLERANCE=0.05 # Ancho maximo del intervalo (relativo a la media) para considerarla precisa
+
+# --- Aprendizaje por tramos (rollout truncado)
+CHUNK_LEARN_STEPS=0 # Cada cuantos pasos aprende cada agente dentro de la generacion (0 = solo al final)
+CHUNK_LEARN_EPOCHS=1 # Pasos de optimizacion sobre cada tramo
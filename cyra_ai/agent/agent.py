@@ -5,9 +5,35 @@ import numpy as np
 from torch.optim import lr_scheduler
 from cyra_ai.models.actor import Actor
 from cyra_ai.models.critic import Critic
+from cyra_ai.utils.checkpoints import SharedCheckpoint
+
+# Constantes de la perdida Actor-Critic (compartidas con PopulationLearner)
+ENTROPY_BETA = 0.01 # Peso de la entropia en la perdida del actor
+ADVANTAGE_EPS = 1e-8 # Evita dividir por cero al normalizar las ventajas
+
+def actor_critic_losses(log_probs, entropies, values, returns, mask=None) -> tuple:
+    """
+    Perdidas del actor y del critico por trayectoria; la ultima dimension son los pasos.
+    'mask' marca los pasos validos cuando se apilan trayectorias de distinto largo.
+    Las ventajas se normalizan por trayectoria (con un solo paso no hay desvio y no se normalizan).
+    """
+    if mask is None:
+        mask = torch.ones_like(returns)
+    counts = mask.sum(dim=-1)
+    advantages = (returns - values.detach()) * mask
+    advantages_mean = advantages.sum(dim=-1, keepdim=True) / counts.unsqueeze(-1)
+    advantages_var = (((advantages - advantages_mean) * mask) ** 2).sum(dim=-1, keepdim=True) \
+        / (counts.unsqueeze(-1) - 1).clamp(min=1)
+    normalized = (advantages - advantages_mean) / (advantages_var.sqrt() + ADVANTAGE_EPS)
+    advantages = torch.where(counts.unsqueeze(-1) > 1, normalized, advantages)
+
+    actor_loss = -(log_probs * advantages * mask).sum(dim=-1) / counts \
+        - ENTROPY_BETA * (entropies * mask).sum(dim=-1) / counts
+    critic_loss = (((returns - values) ** 2) * mask).sum(dim=-1) / counts
+    return actor_loss, critic_loss
 
 class Agent:
-    def __init__(self, input_size=31, output_size=5, gamma=0.99) -> None:
+    def __init__(self, input_size=31, output_size=5, gamma=0.99, record_trajectory=False) -> None:
         # Inicializamos el actor (política) y el crítico (valor), usando las clases Actor y Critic
         self.actor = Actor(input_size, output_size) # Actor toma el tamaño de la entrada y el número de acciones posibles
         self.critic = Critic(input_size) # Critic toma solo el tamaño de la entrada (estado)
@@ -28,6 +54,17 @@ class Agent:
         self.values = [] # Almacena los valores estimados por el crítico
         self.rewards = [] # Almacena las recompensas obtenidas
         self.exploration_rate = 1.0 # Tasa de exploración inicial, controla la aleatoriedad de las acciones
+        self.shared_weights = False # Indica si los pesos son tensores compartidos (solo lectura) de un checkpoint
+        
+        # Modo trayectoria: en vez de guardar grafos de autograd se guardan estados y acciones
+        # crudas, y los log_probs/valores se recalculan al aprender (o en otro proceso)
+        self.record_trajectory = record_trajectory
+        self.states = [] # Almacena los estados observados (modo trayectoria)
+        self.actions = [] # Almacena las acciones crudas muestreadas (modo trayectoria)
+        
+        # Linaje para el almacen de modelos: id del modelo padre y mutacion aplicada desde el padre
+        self.lineage_parent = None
+        self.lineage_mutation = None
     
     def select_action(self, state) -> list:
         """
@@ -36,6 +73,8 @@ class Agent:
         """
         # Converte el estado a un tensor de tipo float32 y lo preparamos para pasar al modelo
         state = np.asarray(state, dtype=np.float32)
+        if self.record_trajectory:
+            return self.select_action_recorded(state)
         state = torch.from_numpy(state).unsqueeze(0) # Añade una dimensión extra para lotes de tamaño 1
         
         action_mean = self.actor(state) # El actor genera una media para la distribución de las acciones
@@ -58,6 +97,38 @@ class Agent:
         
         action_np = action.detach().numpy().flatten()
         
+        return self.to_env_action(action_np)
+    
+    def select_action_recorded(self, state) -> list:
+        """
+        Igual que select_action pero sin construir grafos de autograd:
+        guarda el estado y la accion cruda para recalcular todo al aprender.
+        """
+        with torch.no_grad():
+            action_mean = self.actor(torch.from_numpy(state).unsqueeze(0)).squeeze(0)
+            action = torch.normal(action_mean, self.exploration_rate)
+        
+        action_np = action.numpy()
+        self.states.append(state)
+        self.actions.append(action_np)
+        
+        return self.to_env_action(action_np)
+    
+    def act(self, state, deterministic: bool=True) -> list:
+        """
+        Devuelve la acción para un estado sin construir grafos ni escribir en los buffers.
+        Pensado para evaluar o usar un modelo ya entrenado.
+        Con deterministic=True usa la media del actor; si no, muestrea con la tasa de exploración actual.
+        """
+        with torch.inference_mode():
+            state = torch.from_numpy(np.asarray(state, dtype=np.float32)).unsqueeze(0)
+            action = self.actor(state).squeeze(0)
+            if not deterministic:
+                action = torch.normal(action, self.exploration_rate)
+        return self.to_env_action(action.numpy())
+    
+    def to_env_action(self, action_np) -> list:
+        """Convierte la accion cruda del actor en [direcciones, velocidad] para el entorno."""
         directions = [1 if d > 0 else 0 for d in action_np[:4]] # Obtiene direcciones redondeadas
         
         speed = max(0.0, min(abs(action_np[4]), 5.0))
@@ -75,25 +146,76 @@ class Agent:
         Actualiza la política y el critic usando Actor-Critic.
         Calcula retornos y ventajas, normaliza, y aplica regularización por entropía.
         """
-        # Calcular retornos
-        returns = self.discount_rewards(self.rewards, self.gamma)
-        returns = torch.tensor(returns, dtype=torch.float32)
-
-        # Convertir buffers a tensores
-        log_probs = torch.stack(self.log_probs)
-        values = torch.stack(self.values).squeeze()
+        if self.record_trajectory:
+            self.update_from_trajectory(self.states, self.actions, self.rewards)
+        else:
+            # El optimizador modifica los pesos, si son compartidos se hace una copia propia
+            self.unshare_weights()
+            
+            # Convertir buffers a tensores
+            log_probs = torch.stack(self.log_probs)
+            values = torch.stack(self.values).squeeze()
+            entropies = torch.stack(self.entropies)
+            self.update_policy(log_probs, entropies, values, self.rewards)
 
-        # Calcular ventajas
-        advantages = returns - values.detach()
-        advantages = (advantages - advantages.mean()) / (advantages.std() + 1e-8)
+        # Limpiar buffers
+        self.clear_buffers()
 
-        # Entropía
-        entropy_bonus = torch.stack(self.entropies).mean()
-        beta = 0.01
+        # Ajustes dinámicos
+        self.end_generation()
+    
+    def learn_chunk(self, next_state=None, epochs: int=1) -> None:
+        """
+        Aprendizaje por tramos (rollout truncado, requiere modo trayectoria): aplica 'epochs' pasos
+        de Actor-Critic con los pasos guardados desde el tramo anterior y vacia los buffers.
+        Los retornos se completan con el valor del critico en next_state (None si el episodio terminó).
+        No hace los ajustes de fin de generación (scheduler y exploración).
+        """
+        if len(self.rewards) > 0:
+            bootstrap = self.bootstrap_value(next_state)
+            for _ in range(epochs):
+                self.update_from_trajectory(self.states, self.actions, self.rewards, bootstrap)
+        self.clear_buffers()
+    
+    def bootstrap_value(self, state) -> float:
+        """Valor del critico para completar los retornos de un tramo (0 si no hay estado siguiente)."""
+        if state is None:
+            return 0.0
+        with torch.no_grad():
+            return float(self.critic(torch.from_numpy(np.asarray(state, dtype=np.float32)).unsqueeze(0)))
+    
+    def update_from_trajectory(self, states, actions, rewards, bootstrap: float=0.0) -> None:
+        """
+        Recalcula log_probs, entropías y valores de una trayectoria guardada
+        (estados y acciones crudas) y aplica un paso de Actor-Critic.
+        Permite aprender de trayectorias generadas en otro hilo o proceso.
+        """
+        self.unshare_weights()
+        
+        states = torch.from_numpy(np.asarray(states, dtype=np.float32))
+        actions = torch.from_numpy(np.asarray(actions, dtype=np.float32))
+        
+        action_mean = self.actor(states)
+        std = torch.ones_like(action_mean) * self.exploration_rate
+        dist = torch.distributions.Normal(action_mean, std)
+        
+        log_probs = dist.log_prob(actions).sum(dim=1)
+        entropies = dist.entropy().sum(dim=1)
+        values = self.critic(states).squeeze(-1)
+        self.update_policy(log_probs, entropies, values, rewards, bootstrap)
+    
+    def update_policy(self, log_probs, entropies, values, rewards, bootstrap: float=0.0) -> None:
+        """
+        Aplica un paso de optimizacion Actor-Critic a partir de los tensores de la trayectoria.
+        'bootstrap' es el valor estimado despues del ultimo paso (tramos truncados).
+        """
+        # Calcular retornos
+        returns = self.discount_rewards(rewards, self.gamma, bootstrap)
+        returns = torch.tensor(returns, dtype=torch.float32)
 
-        # Pérdidas
-        actor_loss = -(log_probs * advantages).mean() - beta * entropy_bonus
-        critic_loss = (returns - values).pow(2).mean()
+        # Pérdidas (ventajas normalizadas y bonus de entropía)
+        actor_loss, critic_loss = actor_critic_losses(log_probs.reshape(-1), entropies.reshape(-1),
+                                                      values.reshape(-1), returns)
         total_loss = actor_loss + critic_loss
 
         # Optimización
@@ -102,21 +224,25 @@ class Agent:
         total_loss.backward()
         self.actor_optimizer.step()
         self.critic_optimizer.step()
-
-        # Limpiar buffers
+    
+    def clear_buffers(self) -> None:
+        """Vacia los buffers de la generacion."""
         self.log_probs.clear()
         self.entropies.clear()
         self.values.clear()
         self.rewards.clear()
-
-        # Ajustes dinámicos
+        self.states.clear()
+        self.actions.clear()
+    
+    def end_generation(self) -> None:
+        """Ajustes dinámicos al final de cada generacion (tasa de aprendizaje y exploración)."""
         self.scheduler.step()
         self.decay_exploration()
 
-    def discount_rewards(self, rewards, gamma) -> np.ndarray:
+    def discount_rewards(self, rewards, gamma, bootstrap: float=0.0) -> np.ndarray:
         rewards = np.array(rewards, dtype=np.float32)
         discounted = np.zeros_like(rewards)
-        running_add = 0
+        running_add = bootstrap
         for t in reversed(range(len(rewards))):
             running_add = rewards[t] + gamma * running_add
             discounted[t] = running_add
@@ -129,14 +255,51 @@ class Agent:
         self.exploration_rate = max(self.exploration_rate * decay_rate, min_rate) # Disminuimos la exploración multiplicativamente
     
     def save_model(self, path) -> None:
-        """Guarda el modelo en el path dado."""
+        """Guarda el modelo (y su tasa de exploracion) en el path dado."""
         torch.save({
         'actor_state_dict': self.actor.state_dict(),
-        'critic_state_dict': self.critic.state_dict()
+        'critic_state_dict': self.critic.state_dict(),
+        'exploration_rate': float(self.exploration_rate)
         }, path)
 
-    def load_model(self, path) -> None:
-        """Carga el modelo desde el path dado."""
-        checkpoint = torch.load(path)
-        self.actor.load_state_dict(checkpoint['actor_state_dict']) # Carga el estado del actor
-        self.critic.load_state_dict(checkpoint['critic_state_dict']) # Cargamos el estado del crítico
\ No newline at end of file
+    def load_model(self, path, shared: bool=False) -> None:
+        """
+        Carga el modelo desde el path dado.
+        Con shared=True el checkpoint se lee una sola vez (memory mapping) y sus tensores
+        se comparten con los demas agentes que carguen el mismo path (copy-on-write).
+        Los checkpoints sin tasa de exploracion (anteriores) conservan la tasa actual.
+        """
+        if shared:
+            checkpoint = SharedCheckpoint.load(path)
+            self.share_weights(checkpoint)
+        else:
+            self.unshare_weights() # load_state_dict copia sobre los pesos actuales
+            checkpoint = torch.load(path, map_location="cpu", weights_only=True)
+            self.actor.load_state_dict(checkpoint['actor_state_dict']) # Carga el estado del actor
+            self.critic.load_state_dict(checkpoint['critic_state_dict']) # Cargamos el estado del crítico
+        if 'exploration_rate' in checkpoint:
+            self.exploration_rate = float(checkpoint['exploration_rate'])
+    
+    def share_weights(self, checkpoint) -> None:
+        """
+        Apunta los pesos del actor y del critico a los tensores del checkpoint, sin copiarlos.
+        Los tensores quedan compartidos hasta que el agente los modifique (unshare_weights).
+        """
+        for module, key in ((self.actor, 'actor_state_dict'), (self.critic, 'critic_state_dict')):
+            state_dict = checkpoint[key]
+            for name, param in module.named_parameters():
+                param.data = state_dict[name]
+            for name, buffer in module.named_buffers():
+                buffer.data = state_dict[name]
+        self.shared_weights = True
+    
+    def unshare_weights(self) -> None:
+        """Copy-on-write: crea una copia propia de los pesos compartidos antes de modificarlos."""
+        if not self.shared_weights:
+            return
+        for module in (self.actor, self.critic):
+            for param in module.parameters():
+                param.data = param.data.clone()
+            for buffer in module.buffers():
+                buffer.data = buffer.data.clone()
+        self.shared_weights = False
\ No newline at end of file
@@ -0,0 +1,180 @@
+import copy
+import numpy as np
+import torch
+from torch.func import stack_module_state, functional_call, vmap
+from cyra_ai.agent.agent import actor_critic_losses
+
+class PopulationLearner:
+    """
+    Aprendizaje de toda la poblacion en un solo forward/backward.
+
+    Apila los parametros de los actores y criticos de todos los agentes (stack_module_state),
+    calcula las perdidas Actor-Critic de todos a la vez con vmap + functional_call sobre sus
+    trayectorias (estados y acciones crudas) y hace un unico backward de la suma de perdidas:
+    como cada agente tiene sus propios parametros, sus gradientes no se mezclan.
+    El paso de Adam se aplica con operaciones multi-tensor (torch._foreach_*) sobre los
+    parametros apilados, con la tasa de aprendizaje y la correccion de sesgo de cada agente,
+    y el resultado (pesos y estado de Adam) se vuelve a copiar en cada agente.
+    Las perdidas salen de actor_critic_losses (la misma funcion que usa Agent.update_policy)
+    y los hiperparametros de Adam del optimizador de cada agente.
+    """
+
+    # ---------------------------
+    # FUNCIONES DE APRENDIZAJE
+    # ---------------------------
+    def learn(self, agents: list) -> None:
+        """Aprende con los buffers de trayectoria de cada agente y cierra la generacion (como Agent.learn)."""
+        trajectories = [(agent.states, agent.actions, agent.rewards) for agent in agents]
+        self.update(agents, trajectories)
+        for agent in agents:
+            agent.clear_buffers()
+            agent.end_generation()
+
+    def learn_chunk(self, agents: list, next_states: list, epochs: int=1) -> None:
+        """
+        Tramo de rollout truncado para todos los agentes (como Agent.learn_chunk): 'epochs' pasos
+        con retornos completados por el critico en next_states (None por agente si terminó).
+        """
+        trajectories = [(agent.states, agent.actions, agent.rewards) for agent in agents]
+        bootstraps = [agent.bootstrap_value(state) for agent, state in zip(agents, next_states)]
+        for _ in range(epochs):
+            self.update(agents, trajectories, bootstraps)
+        for agent in agents:
+            agent.clear_buffers()
+
+    def update(self, agents: list, trajectories: list, bootstraps: list=None) -> None:
+        """
+        Un paso de Actor-Critic para todos los agentes con sus trayectorias (estados, acciones, recompensas).
+        'bootstraps' es el valor estimado despues del ultimo paso de cada trayectoria (0 por defecto).
+        """
+        bootstraps = bootstraps if bootstraps is not None else [0.0] * len(agents)
+        valid = [i for i, (_, _, rewards) in enumerate(trajectories) if len(rewards) > 0]
+        agents = [agents[i] for i in valid]
+        trajectories = [trajectories[i] for i in valid]
+        bootstraps = [bootstraps[i] for i in valid]
+        if not agents:
+            return
+        for agent in agents:
+            agent.unshare_weights() # Los pesos se sobrescriben al final
+
+        states, actions, returns, mask = self.stack_trajectories(agents, trajectories, bootstraps)
+        actor_params, actor_buffers = stack_module_state([agent.actor for agent in agents])
+        critic_params, critic_buffers = stack_module_state([agent.critic for agent in agents])
+
+        # Modulos base sin datos, solo para functional_call
+        actor_base = copy.deepcopy(agents[0].actor).to("meta")
+        critic_base = copy.deepcopy(agents[0].critic).to("meta")
+
+        def actor_forward(params, buffers, x):
+            return functional_call(actor_base, (params, buffers), (x,))
+
+        def critic_forward(params, buffers, x):
+            return functional_call(critic_base, (params, buffers), (x,))
+
+        action_mean = vmap(actor_forward)(actor_params, actor_buffers, states)               # (agentes, T, 5)
+        values = vmap(critic_forward)(critic_params, critic_buffers, states).squeeze(-1)    # (agentes, T)
+
+        # log_prob y entropia de la Normal con std = tasa de exploracion de cada agente
+        std = torch.tensor([agent.exploration_rate for agent in agents], dtype=torch.float32).view(-1, 1, 1)
+        dist = torch.distributions.Normal(action_mean, std.expand_as(action_mean))
+        log_probs = dist.log_prob(actions).sum(dim=2)
+        entropies = dist.entropy().sum(dim=2)
+
+        # Perdidas por agente (promedios sobre sus pasos validos) y suma para un unico backward
+        actor_loss, critic_loss = actor_critic_losses(log_probs, entropies, values, returns, mask)
+        (actor_loss + critic_loss).sum().backward()
+
+        actor_state = self.adam_step(agents, 'actor', actor_params)
+        critic_state = self.adam_step(agents, 'critic', critic_params)
+        self.write_back(agents, 'actor', actor_params, actor_state)
+        self.write_back(agents, 'critic', critic_params, critic_state)
+
+    def stack_trajectories(self, agents: list, trajectories: list, bootstraps: list) -> tuple:
+        """Apila las trayectorias (rellenando con ceros si tienen distinto largo) y calcula los retornos."""
+        lengths = [len(rewards) for _, _, rewards in trajectories]
+        steps = max(lengths)
+        state_size = agents[0].actor.fc0.in_features
+        action_size = agents[0].actor.fc2.out_features
+
+        states = np.zeros((len(agents), steps, state_size), dtype=np.float32)
+        actions = np.zeros((len(agents), steps, action_size), dtype=np.float32)
+        returns = np.zeros((len(agents), steps), dtype=np.float32)
+        mask = np.zeros((len(agents), steps), dtype=np.float32)
+        for i, (agent, (agent_states, agent_actions, rewards), bootstrap) in enumerate(zip(agents, trajectories, bootstraps)):
+            length = lengths[i]
+            states[i, :length] = np.asarray(agent_states, dtype=np.float32)
+            actions[i, :length] = np.asarray(agent_actions, dtype=np.float32)
+            returns[i, :length] = agent.discount_rewards(rewards, agent.gamma, bootstrap)
+            mask[i, :length] = 1.0
+        return (torch.from_numpy(states), torch.from_numpy(actions),
+                torch.from_numpy(returns), torch.from_numpy(mask))
+
+    # ---------------------------
+    # FUNCIONES DEL OPTIMIZADOR
+    # ---------------------------
+    def adam_step(self, agents: list, part: str, stacked_params: dict) -> tuple:
+        """
+        Paso de Adam (mismas cuentas que torch.optim.Adam) sobre los parametros apilados,
+        con operaciones multi-tensor. Cada agente conserva su tasa de aprendizaje y su contador
+        de pasos; el estado de Adam sale de (y vuelve a) el optimizador de cada agente.
+        """
+        group = self.optimizer(agents[0], part).param_groups[0]
+        beta1, beta2 = group['betas']
+        eps = group['eps']
+        names = list(stacked_params.keys())
+        params = [stacked_params[name].detach() for name in names]
+        grads = [stacked_params[name].grad for name in names]
+        exp_avgs, exp_avg_sqs, steps = self.stack_adam_state(agents, part, names)
+
+        lrs = torch.tensor([self.optimizer(agent, part).param_groups[0]['lr'] for agent in agents], dtype=torch.float32)
+        steps += 1
+        step_sizes = lrs / (1 - beta1 ** steps)
+        bias_corrections2_sqrt = (1 - beta2 ** steps).sqrt()
+
+        torch._foreach_lerp_(exp_avgs, grads, 1 - beta1)
+        torch._foreach_mul_(exp_avg_sqs, beta2)
+        torch._foreach_addcmul_(exp_avg_sqs, grads, grads, value=1 - beta2)
+
+        shapes = [(-1,) + (1,) * (param.dim() - 1) for param in params]
+        denoms = torch._foreach_sqrt(exp_avg_sqs)
+        torch._foreach_div_(denoms, [bias_corrections2_sqrt.view(shape) for shape in shapes])
+        torch._foreach_add_(denoms, eps)
+        updates = torch._foreach_div(exp_avgs, denoms)
+        torch._foreach_mul_(updates, [step_sizes.view(shape) for shape in shapes])
+        torch._foreach_sub_(params, updates)
+
+        return names, exp_avgs, exp_avg_sqs, steps
+
+    def stack_adam_state(self, agents: list, part: str, names: list) -> tuple:
+        """Apila exp_avg, exp_avg_sq y step del optimizador de cada agente (ceros si todavia no dio pasos)."""
+        exp_avgs, exp_avg_sqs = [], []
+        steps = torch.zeros(len(agents), dtype=torch.float32)
+        modules = [getattr(agent, part) for agent in agents]
+        for name in names:
+            avg_list, avg_sq_list = [], []
+            for i, (agent, module) in enumerate(zip(agents, modules)):
+                param = module.get_parameter(name)
+                state = self.optimizer(agent, part).state.get(param, {})
+                avg_list.append(state.get('exp_avg', torch.zeros_like(param)).detach())
+                avg_sq_list.append(state.get('exp_avg_sq', torch.zeros_like(param)).detach())
+                steps[i] = float(state.get('step', 0.0))
+            exp_avgs.append(torch.stack(avg_list))
+            exp_avg_sqs.append(torch.stack(avg_sq_list))
+        return exp_avgs, exp_avg_sqs, steps
+
+    def write_back(self, agents: list, part: str, stacked_params: dict, adam_state: tuple) -> None:
+        """Copia los pesos actualizados y el estado de Adam de vuelta en cada agente."""
+        names, exp_avgs, exp_avg_sqs, steps = adam_state
+        for i, agent in enumerate(agents):
+            module = getattr(agent, part)
+            optimizer = self.optimizer(agent, part)
+            with torch.no_grad():
+                for name, exp_avg, exp_avg_sq in zip(names, exp_avgs, exp_avg_sqs):
+                    param = module.get_parameter(name)
+                    param.copy_(stacked_params[name][i])
+                    optimizer.state[param] = {'step': torch.tensor(float(steps[i])),
+                                              'exp_avg': exp_avg[i].clone(),
+                                              'exp_avg_sq': exp_avg_sq[i].clone()}
+
+    def optimizer(self, agent, part: str) -> torch.optim.Optimizer:
+        return agent.actor_optimizer if part == 'actor' else agent.critic_optimizer
@@ -0,0 +1,214 @@
+import json
+import time
+import queue
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import torch
+from cyra_ai.agent.agent import Agent
+from config.trainer_config import (INFERENCE_HOST, INFERENCE_PORT, INFERENCE_MAX_BATCH, INFERENCE_MAX_WAIT_MS,
+                                   INFERENCE_LATENCY_WINDOW)
+
+class InferenceRequest:
+    """Observaciones de una peticion y el lugar donde el hilo de batching deja las acciones."""
+    def __init__(self, observations: np.ndarray, deterministic: bool) -> None:
+        self.observations = observations
+        self.deterministic = deterministic
+        self.actions = None
+        self.error = None
+        self.done = threading.Event()
+        self.start_time = time.perf_counter()
+
+class InferenceServer:
+    """
+    Servidor HTTP local de inferencia para un modelo entrenado (cyraai_models/agent_{age}.pth).
+
+    Carga el checkpoint una sola vez y responde acciones [direcciones, velocidad] para vectores
+    de observacion. Las peticiones concurrentes se juntan en un lote (hasta 'max_batch'
+    observaciones o 'max_wait_ms' de espera) y se resuelven con un solo forward del Actor.
+
+    Endpoints:
+        POST /act    {"observations": [[...31 valores...], ...], "deterministic": true}
+                     -> {"actions": [[[d0, d1, d2, d3], velocidad], ...]}
+        GET  /stats  latencia (p50/p95/p99), throughput y tamaño medio de lote
+
+    Con "deterministic": false la accion se muestrea de una Normal con desvio 'exploration_rate':
+    el indicado al servidor o, por defecto, el guardado en el checkpoint (1.0 en checkpoints
+    anteriores que no lo guardan).
+    """
+    def __init__(self, path: str, host: str=INFERENCE_HOST, port: int=INFERENCE_PORT,
+                 max_batch: int=INFERENCE_MAX_BATCH, max_wait_ms: float=INFERENCE_MAX_WAIT_MS,
+                 exploration_rate: float=None) -> None:
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+
+        self.agent = Agent()
+        self.agent.load_model(path)
+        if exploration_rate is not None:
+            self.agent.exploration_rate = exploration_rate
+        self.agent.actor.eval()
+        self.input_size = self.agent.actor.fc0.in_features
+
+        self.requests = queue.Queue()
+        self.running = False
+        self.server = None
+        self.batch_thread = None
+
+        # Estadisticas (solo las escribe el hilo de batching)
+        self.stats_lock = threading.Lock()
+        self.started_at = time.perf_counter()
+        self.total_requests = 0
+        self.total_observations = 0
+        self.total_batches = 0
+        self.latencies = deque(maxlen=INFERENCE_LATENCY_WINDOW)
+
+    # ---------------------------
+    # FUNCIONES DEL SERVIDOR
+    # ---------------------------
+    def start(self) -> None:
+        """Inicia el hilo de batching y el servidor HTTP en segundo plano."""
+        self.running = True
+        self.started_at = time.perf_counter()
+        self.batch_thread = threading.Thread(target=self.batch_loop, daemon=True)
+        self.batch_thread.start()
+
+        self.server = ThreadingHTTPServer((self.host, self.port), self.make_handler())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"Servidor de inferencia escuchando en http://{self.host}:{self.port}")
+
+    def stop(self) -> None:
+        """Detiene el servidor y el hilo de batching."""
+        self.running = False
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        self.requests.put(None)
+        if self.batch_thread is not None:
+            self.batch_thread.join()
+            self.batch_thread = None
+
+    def make_handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                if self.path != "/act":
+                    self.send_json(404, {"error": "ruta desconocida"})
+                    return
+                try:
+                    body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                    observations = np.asarray(body["observations"], dtype=np.float32)
+                    if observations.ndim == 1:
+                        observations = observations[None, :]
+                    if observations.ndim != 2 or observations.shape[1] != server.input_size:
+                        raise ValueError(f"se esperan vectores de {server.input_size} valores")
+                except (ValueError, KeyError, TypeError) as error:
+                    self.send_json(400, {"error": str(error)})
+                    return
+                actions = server.infer(observations, bool(body.get("deterministic", True)))
+                self.send_json(200, {"actions": actions})
+
+            def do_GET(self) -> None:
+                if self.path == "/stats":
+                    self.send_json(200, server.get_stats())
+                else:
+                    self.send_json(404, {"error": "ruta desconocida"})
+
+            def send_json(self, code: int, data: dict) -> None:
+                payload = json.dumps(data).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args) -> None:
+                pass # Sin log por peticion
+
+        return Handler
+
+    # ---------------------------
+    # FUNCIONES DE INFERENCIA
+    # ---------------------------
+    def infer(self, observations: np.ndarray, deterministic: bool=True) -> list:
+        """Encola las observaciones y espera las acciones (se llama desde los hilos HTTP)."""
+        request = InferenceRequest(observations, deterministic)
+        self.requests.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.actions
+
+    def batch_loop(self) -> None:
+        """Junta peticiones concurrentes y las resuelve con un solo forward por lote."""
+        while self.running:
+            first = self.requests.get()
+            if first is None:
+                break
+            batch = [first]
+            size = len(first.observations)
+            deadline = time.perf_counter() + self.max_wait
+            while size < self.max_batch:
+                try:
+                    request = self.requests.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if request is None:
+                    self.running = False
+                    break
+                batch.append(request)
+                size += len(request.observations)
+            self.run_batch(batch)
+
+    def run_batch(self, batch: list) -> None:
+        """Un solo forward del Actor para todas las observaciones del lote."""
+        try:
+            observations = torch.from_numpy(np.concatenate([request.observations for request in batch]))
+            with torch.inference_mode():
+                means = self.agent.actor(observations)
+                sampled = torch.normal(means, self.agent.exploration_rate)
+            means, sampled = means.numpy(), sampled.numpy()
+
+            start = 0
+            for request in batch:
+                end = start + len(request.observations)
+                raw = means[start:end] if request.deterministic else sampled[start:end]
+                request.actions = [[directions, float(speed)] # float de Python para poder enviarlo como JSON
+                                   for directions, speed in map(self.agent.to_env_action, raw)]
+                start = end
+        except Exception as error:
+            for request in batch:
+                request.error = error
+
+        finished = time.perf_counter()
+        with self.stats_lock:
+            self.total_batches += 1
+            for request in batch:
+                self.total_requests += 1
+                self.total_observations += len(request.observations)
+                self.latencies.append(finished - request.start_time)
+        for request in batch:
+            request.done.set()
+
+    def get_stats(self) -> dict:
+        """Latencia por peticion, throughput y tamaño medio de lote desde que inicio el servidor."""
+        with self.stats_lock:
+            latencies = np.array(self.latencies) * 1000.0
+            elapsed = time.perf_counter() - self.started_at
+            stats = {'requests': self.total_requests,
+                     'observations': self.total_observations,
+                     'batches': self.total_batches,
+                     'mean_batch_size': self.total_observations / max(1, self.total_batches),
+                     'exploration_rate': float(self.agent.exploration_rate),
+                     'requests_per_second': self.total_requests / elapsed,
+                     'observations_per_second': self.total_observations / elapsed}
+        if len(latencies) > 0:
+            stats.update({'latency_ms_p50': float(np.percentile(latencies, 50)),
+                          'latency_ms_p95': float(np.percentile(latencies, 95)),
+                          'latency_ms_p99': float(np.percentile(latencies, 99))})
+        return stats
@@ -0,0 +1,33 @@
+import os
+import torch
+
+class SharedCheckpoint:
+    """
+    Cache de checkpoints compartidos entre agentes.
+    Cada archivo se lee una sola vez con memory mapping y sus tensores (solo lectura)
+    se reutilizan en todos los agentes que cargan el mismo modelo.
+    """
+    cache = {}
+
+    def load(path) -> dict:
+        """Devuelve el checkpoint del path, leyendolo del disco solo si no esta en cache o cambio."""
+        key = (os.path.abspath(path), os.path.getmtime(path))
+        if key not in SharedCheckpoint.cache:
+            # Si el archivo cambio, se descarta la version anterior
+            SharedCheckpoint.release(path)
+            try:
+                checkpoint = torch.load(path, map_location="cpu", weights_only=True, mmap=True)
+            except RuntimeError: # Formato antiguo (no zip), no se puede mapear
+                checkpoint = torch.load(path, map_location="cpu", weights_only=True)
+            SharedCheckpoint.cache[key] = checkpoint
+        return SharedCheckpoint.cache[key]
+
+    def release(path) -> None:
+        """Quita de la cache las versiones del path (los agentes que lo usan mantienen sus tensores)."""
+        abspath = os.path.abspath(path)
+        for key in [key for key in SharedCheckpoint.cache if key[0] == abspath]:
+            del SharedCheckpoint.cache[key]
+
+    def clear() -> None:
+        """Vacia la cache completa."""
+        SharedCheckpoint.cache.clear()
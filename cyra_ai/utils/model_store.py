@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import torch
+from config.trainer_config import MODEL_STORE_PATH
+
+# Partes del agente que se guardan (mismo formato que Agent.save_model)
+STATE_DICTS = ("actor_state_dict", "critic_state_dict")
+
+class ModelStore:
+    """
+    Almacen de modelos direccionado por contenido.
+
+    Cada tensor se guarda una sola vez en objects/ con el sha256 de su contenido como nombre,
+    asi los clones mutados (que cambian pocos tensores) solo agregan los tensores nuevos.
+    Cada modelo es un manifest JSON en manifests/ con el hash de cada tensor, el padre
+    (linaje padre -> hijo), la mutacion que lo creo y los eventos (elite, mutacion, mejor modelo).
+    El id del modelo es el hash de sus tensores: los mismos pesos siempre tienen el mismo id.
+    """
+    def __init__(self, path: str=MODEL_STORE_PATH) -> None:
+        self.path = path
+        self.objects_path = os.path.join(path, "objects")
+        self.manifests_path = os.path.join(path, "manifests")
+        os.makedirs(self.objects_path, exist_ok=True)
+        os.makedirs(self.manifests_path, exist_ok=True)
+
+        self.tensor_cache = {} # hash -> tensor (los tensores guardados nunca cambian)
+        self.lock = threading.Lock() # Se puede usar desde el hilo del learner (modo pipeline)
+
+    # ---------------------------
+    # FUNCIONES DE GUARDADO
+    # ---------------------------
+    def put_agent(self, agent, metadata: dict=None) -> str:
+        """
+        Guarda los pesos del agente y retorna su id. Usa agent.lineage_parent y
+        agent.lineage_mutation como linaje. Si el modelo ya existe solo agrega el evento.
+        """
+        state = {'actor_state_dict': agent.actor.state_dict(), 'critic_state_dict': agent.critic.state_dict()}
+        return self.put_state(state, parent=agent.lineage_parent, mutation=agent.lineage_mutation,
+                              metadata=metadata, exploration_rate=agent.exploration_rate)
+
+    def put_state(self, state: dict, parent: str=None, mutation: dict=None, metadata: dict=None,
+                  exploration_rate: float=None) -> str:
+        """Guarda un checkpoint con el formato de Agent.save_model y retorna su id."""
+        tensors = {}
+        with self.lock:
+            for part in STATE_DICTS:
+                for name, tensor in state[part].items():
+                    tensors[f"{part}.{name}"] = self.put_tensor(tensor)
+
+            model_id = ModelStore.hash_bytes(json.dumps(tensors, sort_keys=True).encode())[:16]
+            manifest = self.read_manifest(model_id)
+            if manifest is None:
+                manifest = {'id': model_id,
+                            'parent': parent,
+                            'mutation': mutation,
+                            'exploration_rate': exploration_rate,
+                            'created': time.time(),
+                            'hall_of_fame': False,
+                            'events': [],
+                            'tensors': tensors}
+            if metadata:
+                manifest['events'].append(metadata)
+                if metadata.get('hall_of_fame'):
+                    manifest['hall_of_fame'] = True
+            self.write_manifest(manifest)
+        return model_id
+
+    def put_tensor(self, tensor: torch.Tensor) -> str:
+        """Guarda el tensor si su contenido no existe todavia y retorna su hash."""
+        tensor = tensor.detach().cpu().contiguous()
+        digest = hashlib.sha256()
+        digest.update(f"{tensor.dtype}{tuple(tensor.shape)}".encode())
+        digest.update(tensor.numpy().tobytes())
+        tensor_hash = digest.hexdigest()
+
+        path = self.object_path(tensor_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            torch.save(tensor.clone(), path + ".tmp")
+            os.replace(path + ".tmp", path)
+        return tensor_hash
+
+    # ---------------------------
+    # FUNCIONES DE CARGA
+    # ---------------------------
+    def materialize(self, model_id: str) -> dict:
+        """Arma el checkpoint del modelo (mismo formato que Agent.save_model)."""
+        manifest = self.read_manifest(model_id)
+        if manifest is None:
+            raise KeyError(f"No existe el modelo {model_id}")
+        state = {part: {} for part in STATE_DICTS}
+        for key, tensor_hash in manifest['tensors'].items():
+            part, name = key.split(".", 1)
+            state[part][name] = self.get_tensor(tensor_hash)
+        if manifest.get('exploration_rate') is not None:
+            state['exploration_rate'] = manifest['exploration_rate']
+        return state
+
+    def load_into(self, agent, model_id: str) -> None:
+        """Carga el modelo en el agente."""
+        state = self.materialize(model_id)
+        agent.unshare_weights()
+        agent.actor.load_state_dict(state['actor_state_dict'])
+        agent.critic.load_state_dict(state['critic_state_dict'])
+        if 'exploration_rate' in state:
+            agent.exploration_rate = state['exploration_rate']
+        agent.lineage_parent = model_id
+        agent.lineage_mutation = None
+
+    def export(self, model_id: str, path: str) -> None:
+        """Guarda el modelo como un checkpoint normal (por ejemplo, cyraai_models/agent_{age}.pth)."""
+        torch.save(self.materialize(model_id), path)
+
+    def get_tensor(self, tensor_hash: str) -> torch.Tensor:
+        if tensor_hash not in self.tensor_cache:
+            self.tensor_cache[tensor_hash] = torch.load(self.object_path(tensor_hash), map_location="cpu",
+                                                        weights_only=True)
+        return self.tensor_cache[tensor_hash]
+
+    # ---------------------------
+    # FUNCIONES DE CONSULTA
+    # ---------------------------
+    def lineage(self, model_id: str) -> list:
+        """Manifests desde el modelo hasta su primer ancestro guardado."""
+        chain = []
+        while model_id is not None:
+            manifest = self.read_manifest(model_id)
+            if manifest is None or manifest in chain:
+                break
+            chain.append(manifest)
+            model_id = manifest['parent']
+        return chain
+
+    def hall_of_fame(self, age: int=None) -> list:
+        """Mejores modelos guardados (de una era o de todas), ordenados por recompensa."""
+        entries = []
+        for filename in os.listdir(self.manifests_path):
+            manifest = self.read_manifest(filename[:-len(".json")])
+            for event in manifest['events']:
+                if event.get('hall_of_fame') and (age is None or event.get('age') == age):
+                    entries.append({'id': manifest['id'], **event})
+        return sorted(entries, key=lambda entry: entry.get('reward', -float('inf')), reverse=True)
+
+    # ---------------------------
+    # FUNCIONES AUXILIARES
+    # ---------------------------
+    def object_path(self, tensor_hash: str) -> str:
+        return os.path.join(self.objects_path, tensor_hash[:2], tensor_hash + ".pt")
+
+    def read_manifest(self, model_id: str) -> dict:
+        path = os.path.join(self.manifests_path, model_id + ".json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def write_manifest(self, manifest: dict) -> None:
+        path = os.path.join(self.manifests_path, manifest['id'] + ".json")
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=1)
+        os.replace(path + ".tmp", path)
+
+    def hash_bytes(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
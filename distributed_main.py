@@ -0,0 +1,34 @@
+import sys
+from config.trainer_config import DISTRIBUTED_HOST, DISTRIBUTED_PORT
+
+USAGE = """Uso:
+    py distributed_main.py learner [workers_locales] [generaciones]
+    py distributed_main.py worker [host] [puerto]"""
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "learner"
+
+    if mode == "worker":
+        from trainer.distributed.rollout_worker import run_worker
+        host = sys.argv[2] if len(sys.argv) > 2 else DISTRIBUTED_HOST
+        port = int(sys.argv[3]) if len(sys.argv) > 3 else DISTRIBUTED_PORT
+        run_worker(host, port)
+    elif mode == "learner":
+        from trainer.headless_view import HeadlessView
+        from trainer.training import Train
+        from trainer.distributed.rollout_learner import RolloutLearner
+        local_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+        generations = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+        learner = RolloutLearner(Train(HeadlessView()))
+        if local_workers > 0:
+            learner.run_local(local_workers, generations)
+        else:
+            learner.start()
+            try:
+                for _ in range(generations):
+                    learner.run_generation()
+            finally:
+                learner.stop()
+    else:
+        print(USAGE)
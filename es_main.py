@@ -0,0 +1,9 @@
+import sys
+from config.trainer_config import TRAIN_AGE
+
+if __name__ == "__main__":
+    # Era (debe existir en el csv) y generaciones, por ejemplo: py es_main.py 1 100
+    from trainer.evolution.es_engine import EvolutionStrategies
+    age = int(sys.argv[1]) if len(sys.argv) > 1 else TRAIN_AGE
+    generations = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    EvolutionStrategies(age).run(generations)
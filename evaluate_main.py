@@ -0,0 +1,10 @@
+import sys
+from trainer.evaluation.evaluator import Evaluator
+
+if __name__ == "__main__":
+    # Eras a evaluar, por ejemplo: py evaluate_main.py 1 2
+    # Con --reward-age=N todos los checkpoints se puntuan con los pesos de recompensa de la era N
+    reward_ages = [int(arg.split("=", 1)[1]) for arg in sys.argv[1:] if arg.startswith("--reward-age=")]
+    ages = [int(arg) for arg in sys.argv[1:] if not arg.startswith("--")] or [1]
+    evaluator = Evaluator(reward_age=reward_ages[0]) if reward_ages else Evaluator()
+    evaluator.print_summaries(evaluator.evaluate_ages(ages))
@@ -0,0 +1,47 @@
+from typing import TYPE_CHECKING
+import os
+from config.trainer_config import REWARD_TERMS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+class SweepCsvData:
+    
+    csv_path = "graphics_and_data/data/sweeps.csv"
+    csv = None
+    
+    def read_or_create() -> "pd.DataFrame":
+        import pandas as pd # Import diferido: pandas solo se carga cuando se usa el csv
+        if not os.path.exists(SweepCsvData.csv_path):
+            os.makedirs('graphics_and_data/data/', exist_ok=True)
+            columns = ['sweep_id', 'trial_id', 'rung', 'generations', 'best_reward', 'status'] + list(REWARD_TERMS)
+            dataframe = pd.DataFrame(columns=columns)
+            dataframe.to_csv(SweepCsvData.csv_path, index=False)
+            SweepCsvData.csv = dataframe
+            return
+        SweepCsvData.csv = pd.read_csv(SweepCsvData.csv_path)
+    
+    def save_csv() -> None:
+        """
+        Se encarga de guardar los cambios del csv.
+        """
+        SweepCsvData.csv.to_csv(SweepCsvData.csv_path, index=False)
+    
+    def add_trial_result(sweep_id, trial_id, rung, generations, best_reward, status, weights) -> None:
+        """
+        Agrega una fila con el resultado de una prueba (trial) en un escalon del barrido.
+        """
+        SweepCsvData.read_or_create()
+        SweepCsvData.csv.loc[len(SweepCsvData.csv)] = [
+            f"{sweep_id}",
+            f"{trial_id}",
+            f"{rung}",
+            f"{generations}",
+            f"{best_reward}",
+            f"{status}"] + [f"{weights[name]}" for name in REWARD_TERMS]
+        SweepCsvData.save_csv()
+    
+    def get_sweep(sweep_id) -> "pd.DataFrame":
+        """ Retorna todas las filas del barrido indicado """
+        SweepCsvData.read_or_create()
+        return SweepCsvData.csv.loc[SweepCsvData.csv['sweep_id'].astype(str) == str(sweep_id)]
@@ -1,12 +1,16 @@
-import pandas as pd
+from typing import TYPE_CHECKING
 import os
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 class TrainCsvData:
     
     csv_path = "graphics_and_data/data/data.csv"
     csv = None
     
-    def read_or_create() -> pd.DataFrame:
+    def read_or_create() -> "pd.DataFrame":
+        import pandas as pd # Import diferido: pandas solo se carga cuando se usa el csv
         if not os.path.exists(TrainCsvData.csv_path):
             os.makedirs('graphics_and_data/data/', exist_ok=True)
             columns = [
@@ -1,15 +1,15 @@
-import plotly.graph_objects as go
-import plotly.io as pio
 import numpy as np
-import dash
 import threading
-from dash import dcc, html
-from dash.dependencies import Input, Output
 from config.trainer_config import NUM_AGENTS, MAX_STEPS, NUM_EPISODES
 
 
 class TrainGraphics:
     def __init__(self):
+        # Imports diferidos: dash y plotly solo se cargan cuando se usan los graficos
+        import dash
+        from dash import dcc, html
+        from dash.dependencies import Input, Output
+        
         self.rewards_list = np.zeros(NUM_AGENTS)  # Lista de recompensas de los agentes
         self.health_list = np.zeros(NUM_AGENTS)   # Lista para la salud de los agentes
         self.energy_list = np.zeros(NUM_AGENTS)   # Lista para la energia de los agentes
@@ -61,6 +61,7 @@ class TrainGraphics:
         """
         Crea el gráfico actualizado con las recompensas de los agentes
         """
+        import plotly.graph_objects as go
         fig = go.Figure()
         fig.add_trace(go.Bar(x=self.agents_labels, y=self.rewards_list.tolist()))
         fig.update_layout(
@@ -77,6 +78,7 @@ class TrainGraphics:
         """
         Crea el gráfico de Salud, Energía y Hambre para los agentes.
         """
+        import plotly.graph_objects as go
         fig = go.Figure()
 
         # Agregar barras para cada estado
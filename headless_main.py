@@ -0,0 +1,5 @@
+from trainer.trainer_headless import HeadlessTrainer
+
+if __name__ == "__main__":
+    headlessTrainer = HeadlessTrainer()
+    headlessTrainer.run()
@@ -0,0 +1,17 @@
+import sys
+import time
+from config.general_config import AGENT_BASE_PATH
+from config.trainer_config import TRAIN_AGE
+
+if __name__ == "__main__":
+    # Era del modelo a servir y, opcionalmente, desvio de las acciones estocasticas: py inference_main.py 2 0.1
+    from cyra_ai.inference.inference_server import InferenceServer
+    age = int(sys.argv[1]) if len(sys.argv) > 1 else TRAIN_AGE
+    exploration_rate = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    server = InferenceServer(AGENT_BASE_PATH + f"agent_{age}.pth", exploration_rate=exploration_rate)
+    server.start()
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,6 @@
+from trainer.sweep.sweep_scheduler import SweepScheduler
+
+if __name__ == "__main__":
+    scheduler = SweepScheduler()
+    best_trial = scheduler.run()
+    print(f"Mejor configuracion: {best_trial}")
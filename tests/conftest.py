@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los modulos del proyecto se importan desde la raiz del repositorio (sin paquete instalado)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
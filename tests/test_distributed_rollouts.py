@@ -0,0 +1,148 @@
+import socket
+import threading
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from config.trainer_config import REWARD_TERMS
+from cyra_ai.agent.agent import Agent
+import trainer.distributed.rollout_learner as rollout_learner
+from trainer.distributed.protocol import send_message, recv_message
+from trainer.distributed.rollout_learner import RolloutLearner
+from trainer.distributed.rollout_worker import RolloutWorker
+
+NUM_AGENTS = 3
+
+class StubTrain:
+    """Entrenamiento simulado: cada agente recibe por paso la suma de los pesos de recompensa."""
+    def __init__(self, reward_weights: dict) -> None:
+        self.reward_weights = reward_weights
+        self.cyras = [Agent() for _ in range(NUM_AGENTS)]
+        self.generation = 0
+        self.last_generation_steps = 0
+        self.evolved = []
+
+    def run_generation(self, learn: bool=True, max_steps: int=10) -> np.ndarray:
+        reward = sum(self.reward_weights.values())
+        for agent in self.cyras:
+            for _ in range(max_steps):
+                agent.select_action(np.zeros(31, dtype=np.float32))
+                agent.store_reward(reward)
+        self.last_generation_steps = max_steps
+        return np.full(NUM_AGENTS, reward * max_steps)
+
+    def evolve_population(self, avg_rewards) -> None:
+        self.evolved.append(np.asarray(avg_rewards))
+
+class StubWorker(RolloutWorker):
+    def __init__(self, host: str, port: int) -> None:
+        super().__init__(host, port)
+        self.builds = []
+        self.task_ids = [] # Rollouts que completo este worker
+
+    def run_rollout(self, header: dict, blob: bytes) -> tuple:
+        self.task_ids.append(header['task_id'])
+        return super().run_rollout(header, blob)
+
+    def build_train(self, reward_weights: dict) -> StubTrain:
+        self.builds.append(reward_weights)
+        return StubTrain(reward_weights)
+
+class DroppingWorker:
+    """Worker que se conecta, recibe un rollout y cierra el socket sin responder ('connections' veces)."""
+    def __init__(self, port: int, connections: int=1) -> None:
+        self.port = port
+        self.connections = connections
+        self.dropped = []              # Rollouts recibidos y abandonados
+        self.received = threading.Event()
+
+    def run(self) -> None:
+        for _ in range(self.connections):
+            try:
+                sock = socket.create_connection(("127.0.0.1", self.port))
+            except OSError:
+                return
+            try:
+                send_message(sock, {'type': 'hello'})
+                header, _ = recv_message(sock)
+                if header['type'] != 'rollout':
+                    return
+                self.dropped.append(header['task_id'])
+                self.received.set()
+            except (OSError, ConnectionError):
+                return
+            finally:
+                sock.close()
+
+def start_thread(target) -> threading.Thread:
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+def test_learner_and_worker_over_loopback():
+    train = StubTrain({name: 1.0 for name in REWARD_TERMS})
+    learner = RolloutLearner(train, host="127.0.0.1", port=0, tasks_per_generation=2)
+    learner.start()
+    worker = StubWorker("127.0.0.1", learner.port)
+    worker_thread = threading.Thread(target=worker.run, daemon=True)
+    worker_thread.start()
+    try:
+        first = learner.run_generation(steps=4)
+        train.reward_weights = {name: 2.0 for name in REWARD_TERMS} # Nuevos pesos a mitad del entrenamiento
+        second = learner.run_generation(steps=4)
+    finally:
+        learner.stop()
+    worker_thread.join(timeout=10)
+
+    assert not worker_thread.is_alive()
+    assert np.allclose(first, len(REWARD_TERMS) * 1.0 * 4)
+    assert np.allclose(second, len(REWARD_TERMS) * 2.0 * 4) # El worker uso los pesos nuevos
+    assert len(worker.builds) == 2
+    assert train.generation == 2 and len(train.evolved) == 2
+    assert all(len(agent.states) == 0 for agent in train.cyras)
+
+def test_rollout_of_a_lost_worker_is_retried_on_another_worker():
+    train = StubTrain({name: 1.0 for name in REWARD_TERMS})
+    learner = RolloutLearner(train, host="127.0.0.1", port=0, tasks_per_generation=2)
+    learner.start()
+    dropper = DroppingWorker(learner.port)
+    start_thread(dropper.run)
+    fitness = []
+    worker = StubWorker("127.0.0.1", learner.port)
+    worker_thread = None
+    generation_thread = start_thread(lambda: fitness.append(learner.run_generation(steps=4)))
+    try:
+        # El worker bueno se conecta recien cuando el otro ya tomo (y abandono) un rollout
+        assert dropper.received.wait(timeout=10)
+        worker_thread = start_thread(worker.run)
+        generation_thread.join(timeout=20)
+    finally:
+        learner.stop()
+    if worker_thread is not None:
+        worker_thread.join(timeout=10)
+
+    assert not generation_thread.is_alive()
+    assert len(dropper.dropped) == 1
+    assert dropper.dropped[0] in worker.task_ids # El rollout perdido se corrio en el otro worker
+    assert sorted(worker.task_ids) == ['1-0', '1-1']
+    assert np.allclose(fitness[0], len(REWARD_TERMS) * 1.0 * 4)
+    assert train.generation == 1 and len(train.evolved) == 1
+
+def test_rollout_over_the_retry_limit_raises(monkeypatch):
+    monkeypatch.setattr(rollout_learner, "DISTRIBUTED_MAX_RETRIES", 1)
+    monkeypatch.setattr(rollout_learner, "DISTRIBUTED_WORKER_TIMEOUT", 5) # Sin workers, dispatch falla en vez de colgarse
+    train = StubTrain({name: 1.0 for name in REWARD_TERMS})
+    learner = RolloutLearner(train, host="127.0.0.1", port=0, tasks_per_generation=1)
+    learner.start()
+    dropper = DroppingWorker(learner.port, connections=2)
+    dropper_thread = start_thread(dropper.run)
+    try:
+        with pytest.raises(RuntimeError, match="fallo 2 veces"):
+            learner.run_generation(steps=4)
+    finally:
+        learner.stop()
+    dropper_thread.join(timeout=10)
+
+    assert dropper.dropped == ['1-0', '1-0'] # Primer intento + un reintento
+    assert train.evolved == []
@@ -0,0 +1,22 @@
+import pytest
+
+from trainer.telemetry.memory_monitor import MemoryMonitor
+
+def check(monitor: MemoryMonitor, generation: int, rss_mb: float) -> None:
+    """Como sample, sin medir el proceso: cuenta la muestra y revisa el crecimiento."""
+    monitor.samples += 1
+    monitor.check_growth(generation, rss_mb, [])
+
+def test_baseline_without_warmup_warns_on_growth():
+    monitor = MemoryMonitor(use_tracemalloc=False, warmup_generations=0, growth_threshold_mb=100)
+    check(monitor, 1, 500.0)
+    assert monitor.baseline_rss_mb == 500.0
+    with pytest.warns(RuntimeWarning, match="crecio 150.0 MB"):
+        check(monitor, 2, 650.0)
+
+def test_baseline_is_set_after_warmup():
+    monitor = MemoryMonitor(use_tracemalloc=False, warmup_generations=2, growth_threshold_mb=100)
+    check(monitor, 1, 500.0)
+    assert monitor.baseline_rss_mb is None
+    check(monitor, 2, 800.0)
+    assert monitor.baseline_rss_mb == 800.0
@@ -0,0 +1,82 @@
+import copy
+import threading
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from cyra_ai.agent.agent import Agent
+from trainer.pipeline.pipelined_learner import PipelinedLearner
+
+NUM_AGENTS = 3
+STEPS = 5
+
+class StubTrain:
+    """Lo minimo de Train que usa PipelinedLearner, con la seleccion registrada."""
+    def __init__(self) -> None:
+        self.cyras = [Agent(record_trajectory=True) for _ in range(NUM_AGENTS)]
+        for i, agent in enumerate(self.cyras):
+            agent.lineage_parent = f"agent{i}"
+        self.population_learner = None
+        self.selected = []       # Id del elite elegido por el learner en cada seleccion
+        self.recorded = []       # (generacion, recompensa, indice) entregados en el hand-off
+        self.clones = 0
+        self.gate = threading.Semaphore(0) # Cada release deja terminar una seleccion (orden determinista)
+
+    def next_population(self, agents: list, best_index: int) -> list:
+        assert self.gate.acquire(timeout=10)
+        best_agent = agents[best_index]
+        self.selected.append(best_agent.lineage_parent)
+        population = []
+        for i in range(len(agents)):
+            if i == best_index:
+                population.append(best_agent)
+            else:
+                clone = copy.deepcopy(best_agent)
+                self.clones += 1
+                clone.lineage_parent = f"clone{self.clones}"
+                population.append(clone)
+        return population
+
+    def record_generation_result(self, generation: int, best_reward: float, best_index: int) -> None:
+        self.recorded.append((generation, best_reward, best_index))
+
+def simulate(train: StubTrain, fitness_by_id: dict) -> list:
+    """Entorno simulado: el retorno de cada agente depende solo de su id de linaje."""
+    rewards = []
+    for agent in train.cyras:
+        reward = fitness_by_id.get(agent.lineage_parent, 0.0)
+        for _ in range(STEPS):
+            agent.select_action(np.zeros(31, dtype=np.float32))
+            agent.store_reward(reward / STEPS)
+        rewards.append(reward)
+    return rewards
+
+def test_late_generations_are_learned_and_matched_by_identity():
+    train = StubTrain()
+    pipeline = PipelinedLearner(train, max_lag=1)
+    fitness = {'agent0': 1.0, 'agent1': 3.0, 'agent2': 2.0, 'clone1': 5.0}
+    ran = []
+
+    for generation in (1, 2, 3, 4):
+        ran.append([agent.lineage_parent for agent in train.cyras])
+        rewards = simulate(train, fitness)
+        pipeline.submit(generation, rewards)
+        if generation > 1:
+            train.gate.release() # Termina la seleccion de la generacion anterior
+        pipeline.hand_off()
+    train.gate.release()
+    pipeline.stop()
+
+    # Cada generacion (salvo la primera) se simulo mientras el learner aprendia la anterior
+    assert ran == [['agent0', 'agent1', 'agent2'],
+                   ['agent0', 'agent1', 'agent2'],
+                   ['clone1', 'agent1', 'clone2'],
+                   ['clone3', 'agent1', 'clone4']]
+    # Ninguna generacion se descarta y todas llegan al csv
+    assert pipeline.completed == pipeline.submitted == 4
+    assert [generation for generation, _, _ in train.recorded] == [1, 2, 3, 4]
+    # El elite es el agente que obtuvo el fitness; la generacion 4 (atrasada) no reemplaza al elite mejor
+    assert train.selected == ['agent1', 'agent1', 'clone1', 'clone1']
+    assert [reward for _, reward, _ in train.recorded] == [3.0, 3.0, 5.0, 5.0]
+    assert train.cyras[0].lineage_parent == 'clone1'
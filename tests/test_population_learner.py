@@ -0,0 +1,52 @@
+import copy
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from cyra_ai.agent.agent import Agent
+from cyra_ai.agent.population_learner import PopulationLearner
+
+LENGTHS = [6, 3, 1] # Largos distintos (incluido un solo paso) para probar el relleno y la mascara
+ATOL = 1e-5
+
+def make_trajectories(seed: int) -> tuple:
+    """Trayectorias aleatorias (estados, acciones, recompensas) y un bootstrap por agente."""
+    rng = np.random.default_rng(seed)
+    trajectories = [(rng.normal(size=(length, 31)).astype(np.float32),
+                     rng.normal(size=(length, 5)).astype(np.float32),
+                     list(rng.normal(size=length))) for length in LENGTHS]
+    bootstraps = list(rng.normal(size=len(LENGTHS)))
+    return trajectories, bootstraps
+
+def assert_same_state(batched: Agent, single: Agent) -> None:
+    """Mismos pesos y mismo estado de Adam (exp_avg, exp_avg_sq, step) en actor y critico."""
+    for part in ('actor', 'critic'):
+        batched_module, single_module = getattr(batched, part), getattr(single, part)
+        batched_optimizer = getattr(batched, f"{part}_optimizer")
+        single_optimizer = getattr(single, f"{part}_optimizer")
+        for (name, batched_param), single_param in zip(batched_module.named_parameters(), single_module.parameters()):
+            assert torch.allclose(batched_param, single_param, atol=ATOL), f"{part}.{name}"
+            batched_state = batched_optimizer.state[batched_param]
+            single_state = single_optimizer.state[single_param]
+            assert float(batched_state['step']) == float(single_state['step'])
+            for key in ('exp_avg', 'exp_avg_sq'):
+                assert torch.allclose(batched_state[key], single_state[key], atol=ATOL), f"{part}.{name}.{key}"
+
+def test_batched_update_matches_per_agent_update() -> None:
+    torch.manual_seed(0)
+    agents = [Agent(record_trajectory=True) for _ in LENGTHS]
+    for agent, rate in zip(agents, (1.0, 0.5, 0.2)):
+        agent.exploration_rate = rate
+    single_agents = copy.deepcopy(agents)
+    learner = PopulationLearner()
+
+    # Dos pasos: el segundo parte del estado de Adam que dejo el primero
+    for seed in (1, 2):
+        trajectories, bootstraps = make_trajectories(seed)
+        learner.update(agents, trajectories, bootstraps)
+        for agent, (states, actions, rewards), bootstrap in zip(single_agents, trajectories, bootstraps):
+            agent.update_from_trajectory(states, actions, rewards, bootstrap)
+
+    for batched, single in zip(agents, single_agents):
+        assert_same_state(batched, single)
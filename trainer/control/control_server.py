@@ -0,0 +1,124 @@
+import json
+import queue
+import socketserver
+import threading
+from config.trainer_config import CONTROL_HOST, CONTROL_PORT
+
+class ControlServer:
+    """
+    Servidor local (TCP, una linea por comando) para controlar el entrenamiento.
+
+    Los comandos se encolan y el bucle de entrenamiento los aplica solo en los limites
+    de generacion o de chunk, asi el bucle de pasos no hace manejo de entrada por paso.
+    El estado (status) se responde directamente desde la ultima foto publicada.
+
+    Ejemplo con netcat:
+        echo "render_interval 10" | nc 127.0.0.1 8765
+        echo '{"command": "status"}' | nc 127.0.0.1 8765
+    """
+
+    COMMANDS = ("start", "stop", "pause", "resume", "checkpoint", "render_interval", "action_repeat", "record", "status", "quit")
+
+    def __init__(self, host: str=CONTROL_HOST, port: int=CONTROL_PORT) -> None:
+        self.host = host
+        self.port = port
+
+        self.commands = queue.Queue() # Comandos pendientes de aplicar por el entrenamiento
+        self.status = {}              # Ultimo estado publicado por el entrenamiento
+        self.status_lock = threading.Lock()
+
+        self.server = None
+        self.server_thread = None
+
+    # ---------------------------
+    # FUNCIONES DEL SERVIDOR
+    # ---------------------------
+    def start(self) -> None:
+        """Inicia el servidor en un hilo separado."""
+        control = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    response = control.handle_line(line.decode("utf-8").strip())
+                    if response is None:
+                        continue
+                    self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        print(f"Servidor de control escuchando en {self.host}:{self.port}")
+
+    def stop(self) -> None:
+        """Detiene el servidor."""
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+
+    def handle_line(self, line: str) -> dict:
+        """
+        Interpreta una linea recibida. Acepta JSON ({"command": ..., "value": ...})
+        o texto plano ("render_interval 10").
+        """
+        if not line:
+            return None
+        try:
+            if line.startswith("{"):
+                message = json.loads(line)
+                command = str(message.get("command", "")).lower()
+                value = message.get("value")
+            else:
+                parts = line.split()
+                command = parts[0].lower()
+                value = parts[1] if len(parts) > 1 else None
+        except (ValueError, AttributeError):
+            return {"ok": False, "error": "mensaje invalido"}
+
+        if command not in ControlServer.COMMANDS:
+            return {"ok": False, "error": f"comando desconocido: {command}"}
+
+        if command == "status":
+            return {"ok": True, "status": self.get_status()}
+
+        if command == "record":
+            value = str(value).lower() not in ("0", "off", "false", "none")
+
+        if command in ("render_interval", "action_repeat"):
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                return {"ok": False, "error": f"{command} requiere un entero"}
+            minimum = 0 if command == "render_interval" else 1
+            if value < minimum:
+                return {"ok": False, "error": f"{command} debe ser >= {minimum}"}
+
+        self.commands.put((command, value))
+        return {"ok": True, "queued": command}
+
+    # ---------------------------
+    # FUNCIONES PARA EL ENTRENAMIENTO
+    # ---------------------------
+    def poll_commands(self) -> list:
+        """Devuelve (y vacia) la lista de comandos pendientes."""
+        pending = []
+        while True:
+            try:
+                pending.append(self.commands.get_nowait())
+            except queue.Empty:
+                return pending
+
+    def update_status(self, **status) -> None:
+        """Publica el estado actual del entrenamiento."""
+        with self.status_lock:
+            self.status.update(status)
+
+    def get_status(self) -> dict:
+        """Devuelve una copia del ultimo estado publicado."""
+        with self.status_lock:
+            return dict(self.status)
@@ -0,0 +1,65 @@
+import io
+import json
+import struct
+import numpy as np
+
+# Cada mensaje: [largo del encabezado (4 bytes)] [largo del blob (8 bytes)] [encabezado JSON] [blob binario]
+PREFIX = struct.Struct(">IQ")
+
+def send_message(sock, header: dict, blob: bytes=b"") -> None:
+    """Envia un mensaje (encabezado JSON + blob binario opcional) por el socket."""
+    header_bytes = json.dumps(header).encode("utf-8")
+    sock.sendall(PREFIX.pack(len(header_bytes), len(blob)) + header_bytes + blob)
+
+def recv_message(sock) -> tuple:
+    """Recibe un mensaje completo. Retorna (encabezado, blob)."""
+    header_size, blob_size = PREFIX.unpack(recv_exact(sock, PREFIX.size))
+    header = json.loads(recv_exact(sock, header_size).decode("utf-8"))
+    blob = recv_exact(sock, blob_size) if blob_size > 0 else b""
+    return header, blob
+
+def recv_exact(sock, size: int) -> bytes:
+    """Lee exactamente 'size' bytes del socket (o lanza ConnectionError si se cierra)."""
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Conexion cerrada por el otro extremo")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+# ---------------------------
+# SERIALIZACION DE PESOS Y TRAYECTORIAS
+# ---------------------------
+def encode_weights(agents) -> bytes:
+    """Serializa los pesos de los agentes (solo tensores, se cargan con weights_only)."""
+    import torch
+    buffer = io.BytesIO()
+    torch.save([{
+        'actor_state_dict': agent.actor.state_dict(),
+        'critic_state_dict': agent.critic.state_dict()
+    } for agent in agents], buffer)
+    return buffer.getvalue()
+
+def decode_weights(blob: bytes) -> list:
+    """Deserializa los pesos enviados con 'encode_weights'."""
+    import torch
+    return torch.load(io.BytesIO(blob), map_location="cpu", weights_only=True)
+
+def encode_trajectories(agents) -> bytes:
+    """Comprime estados, acciones crudas y recompensas de cada agente."""
+    arrays = {}
+    for i, agent in enumerate(agents):
+        arrays[f"states_{i}"] = np.asarray(agent.states, dtype=np.float32)
+        arrays[f"actions_{i}"] = np.asarray(agent.actions, dtype=np.float32)
+        arrays[f"rewards_{i}"] = np.asarray(agent.rewards, dtype=np.float32)
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+def decode_trajectories(blob: bytes, num_agents: int) -> list:
+    """Retorna una lista de (estados, acciones, recompensas) por agente."""
+    data = np.load(io.BytesIO(blob), allow_pickle=False)
+    return [(data[f"states_{i}"], data[f"actions_{i}"], data[f"rewards_{i}"]) for i in range(num_agents)]
@@ -0,0 +1,197 @@
+import multiprocessing
+import queue
+import socket
+import threading
+import time
+import numpy as np
+from config.trainer_config import (NUM_AGENTS, MAX_STEPS, REWARD_TERMS, DISTRIBUTED_HOST, DISTRIBUTED_PORT,
+                                   DISTRIBUTED_TASKS_PER_GENERATION, DISTRIBUTED_WORKER_TIMEOUT,
+                                   DISTRIBUTED_MAX_RETRIES)
+from trainer.distributed.protocol import send_message, recv_message, encode_weights, decode_trajectories
+
+class RolloutLearner:
+    """
+    Learner de rollouts distribuidos. Acepta workers por TCP, les reparte rollouts con los
+    pesos actuales de la poblacion y con las trayectorias que devuelven aplica Agent
+    (update_from_trajectory) y evolve_population, igual que el entrenamiento local.
+
+    Si un worker se cae o tarda mas de DISTRIBUTED_WORKER_TIMEOUT, su rollout se reintenta
+    con otro worker (hasta DISTRIBUTED_MAX_RETRIES veces).
+    """
+    def __init__(self, train, host: str=DISTRIBUTED_HOST, port: int=DISTRIBUTED_PORT,
+                 tasks_per_generation: int=DISTRIBUTED_TASKS_PER_GENERATION) -> None:
+        self.train = train
+        self.host = host
+        self.port = port
+        self.tasks_per_generation = tasks_per_generation
+
+        self.tasks = queue.Queue()    # Rollouts pendientes de asignar
+        self.results = queue.Queue()  # Resultados (o fallas) de los rollouts
+        self.workers = 0              # Workers conectados
+        self.workers_lock = threading.Lock()
+        self.running = False
+        self.server = None
+        self.local_processes = []
+
+    # ---------------------------
+    # FUNCIONES DEL SERVIDOR
+    # ---------------------------
+    def start(self) -> None:
+        """Abre el socket del learner y acepta workers en un hilo separado."""
+        self.server = socket.create_server((self.host, self.port))
+        self.port = self.server.getsockname()[1]
+        self.running = True
+        threading.Thread(target=self.accept_workers, daemon=True).start()
+        print(f"Learner escuchando workers en {self.host}:{self.port}")
+
+    def stop(self) -> None:
+        """Avisa a los workers que terminen y cierra el servidor."""
+        self.running = False
+        with self.workers_lock:
+            workers = self.workers
+        for _ in range(workers):
+            self.tasks.put(None)
+        if self.server is not None:
+            self.server.close()
+        for process in self.local_processes:
+            process.join(timeout=10)
+
+    def accept_workers(self) -> None:
+        """Acepta conexiones nuevas y atiende cada worker en su propio hilo."""
+        while self.running:
+            try:
+                conn, address = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self.serve_worker, args=(conn, address), daemon=True).start()
+
+    def serve_worker(self, conn, address) -> None:
+        """Asigna rollouts a un worker hasta que se desconecte o se detenga el learner."""
+        try:
+            header, _ = recv_message(conn)
+            if header.get('type') != 'hello':
+                conn.close()
+                return
+        except (OSError, ConnectionError, ValueError):
+            conn.close()
+            return
+
+        with self.workers_lock:
+            self.workers += 1
+        print(f"Worker conectado: {address[0]}:{address[1]}")
+
+        try:
+            while self.running:
+                task = self.tasks.get()
+                if task is None:
+                    send_message(conn, {'type': 'shutdown'})
+                    return
+                try:
+                    conn.settimeout(DISTRIBUTED_WORKER_TIMEOUT)
+                    send_message(conn, task['header'], task['blob'])
+                    header, blob = recv_message(conn)
+                    conn.settimeout(None)
+                except (OSError, ConnectionError, ValueError) as error:
+                    print(f"Worker {address[0]}:{address[1]} perdido ({error}), reintentando rollout {task['header']['task_id']}")
+                    self.retry_task(task)
+                    return
+                self.results.put(('ok', task, header, blob))
+        except (OSError, ConnectionError):
+            pass
+        finally:
+            with self.workers_lock:
+                self.workers -= 1
+            conn.close()
+
+    def retry_task(self, task: dict) -> None:
+        """Vuelve a encolar un rollout fallido, o lo marca como fallido si supero los reintentos."""
+        task['attempts'] += 1
+        if task['attempts'] > DISTRIBUTED_MAX_RETRIES:
+            self.results.put(('failed', task, None, None))
+            return
+        self.tasks.put(task)
+
+    # ---------------------------
+    # FUNCIONES DE ENTRENAMIENTO
+    # ---------------------------
+    def dispatch(self, tasks: list) -> list:
+        """Reparte los rollouts y espera todos los resultados. Retorna [(encabezado, blob), ...]."""
+        for task in tasks:
+            self.tasks.put(task)
+
+        results = []
+        waiting_since = time.time()
+        while len(results) < len(tasks):
+            try:
+                status, task, header, blob = self.results.get(timeout=1.0)
+            except queue.Empty:
+                # Sin workers durante demasiado tiempo: no hay forma de avanzar
+                with self.workers_lock:
+                    workers = self.workers
+                if workers > 0:
+                    waiting_since = time.time()
+                elif time.time() - waiting_since > DISTRIBUTED_WORKER_TIMEOUT:
+                    raise RuntimeError("No hay workers conectados para ejecutar los rollouts")
+                continue
+            if status == 'failed':
+                raise RuntimeError(f"El rollout {task['header']['task_id']} fallo {task['attempts']} veces")
+            results.append((header, blob))
+        return results
+
+    def run_generation(self, steps: int=MAX_STEPS) -> np.ndarray:
+        """
+        Ejecuta una generacion distribuida: cada worker corre un rollout con los pesos actuales,
+        cada agente aprende de todas sus trayectorias y la poblacion evoluciona con el fitness promedio.
+        """
+        self.train.generation += 1
+        agents = self.train.cyras
+        blob = encode_weights(agents)
+        base_header = {'type': 'rollout',
+                       'steps': steps,
+                       'exploration_rates': [agent.exploration_rate for agent in agents],
+                       'reward_weights': self.reward_weights()}
+        tasks = [{'header': dict(base_header, task_id=f"{self.train.generation}-{i}"), 'blob': blob, 'attempts': 0}
+                 for i in range(self.tasks_per_generation)]
+
+        results = self.dispatch(tasks)
+
+        # Cada agente aprende de las trayectorias de todos los rollouts
+        fitness = np.zeros(NUM_AGENTS)
+        for header, trajectories_blob in results:
+            fitness += np.asarray(header['rewards'])
+            for agent, (states, actions, rewards) in zip(agents, decode_trajectories(trajectories_blob, NUM_AGENTS)):
+                if len(rewards) > 0:
+                    agent.update_from_trajectory(states, actions, rewards)
+        for agent in agents:
+            agent.end_generation()
+        fitness /= len(results)
+
+        self.train.evolve_population(avg_rewards=fitness)
+        return fitness
+
+    def reward_weights(self) -> dict:
+        """Pesos de recompensa para los workers: los fijos del entrenamiento (barridos) o los de RewardsAndPenalty."""
+        if self.train.reward_weights is not None:
+            return {name: float(self.train.reward_weights[name]) for name in REWARD_TERMS}
+        from trainer.env.rewards_and_penalty import RewardsAndPenalty
+        return {name: float(getattr(RewardsAndPenalty, name)) for name in REWARD_TERMS}
+
+    def run_local(self, num_workers: int, generations: int) -> None:
+        """
+        Prueba de punta a punta en una sola maquina: lanza 'num_workers' workers por localhost
+        y entrena 'generations' generaciones distribuidas.
+        """
+        from trainer.distributed.rollout_worker import run_worker
+
+        self.start()
+        context = multiprocessing.get_context("spawn")
+        for _ in range(num_workers):
+            process = context.Process(target=run_worker, args=("127.0.0.1", self.port), daemon=True)
+            process.start()
+            self.local_processes.append(process)
+        try:
+            for _ in range(generations):
+                fitness = self.run_generation()
+                print(f"Generacion {self.train.generation} | fitness {np.round(fitness, 3).tolist()}")
+        finally:
+            self.stop()
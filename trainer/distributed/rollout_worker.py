@@ -0,0 +1,79 @@
+import socket
+import time
+from config.trainer_config import DISTRIBUTED_HOST, DISTRIBUTED_PORT
+from trainer.distributed.protocol import send_message, recv_message, decode_weights, encode_trajectories
+
+class RolloutWorker:
+    """
+    Worker de rollouts: se conecta al learner, recibe pesos de la poblacion, corre una
+    generacion sin ventana (sin aprender) y devuelve las trayectorias comprimidas y el fitness.
+    """
+    def __init__(self, host: str=DISTRIBUTED_HOST, port: int=DISTRIBUTED_PORT) -> None:
+        self.host = host
+        self.port = port
+        self.train = None # Se crea con el primer rollout (necesita los pesos de recompensa del learner)
+        self.reward_weights = None # Pesos de recompensa con los que se creo 'train'
+
+    def connect(self, attempts: int=30) -> socket.socket:
+        """Se conecta al learner, reintentando mientras este arrancando."""
+        for _ in range(attempts):
+            try:
+                return socket.create_connection((self.host, self.port))
+            except OSError:
+                time.sleep(1.0)
+        raise ConnectionError(f"No se pudo conectar al learner en {self.host}:{self.port}")
+
+    def run(self) -> None:
+        """Bucle del worker: atiende rollouts hasta recibir 'shutdown' o perder la conexion."""
+        sock = self.connect()
+        try:
+            send_message(sock, {'type': 'hello'})
+            while True:
+                header, blob = recv_message(sock)
+                if header['type'] == 'shutdown':
+                    return
+                if header['type'] == 'rollout':
+                    result, trajectories = self.run_rollout(header, blob)
+                    send_message(sock, result, trajectories)
+        except ConnectionError:
+            print("Conexion con el learner perdida")
+        finally:
+            sock.close()
+
+    def run_rollout(self, header: dict, blob: bytes) -> tuple:
+        """
+        Carga los pesos recibidos, corre una generacion y empaqueta las trayectorias.
+        Si los pesos de recompensa del learner cambiaron, se vuelve a crear el entrenamiento.
+        """
+        if self.train is None or header['reward_weights'] != self.reward_weights:
+            self.reward_weights = header['reward_weights']
+            self.train = self.build_train(self.reward_weights)
+            for agent in self.train.cyras:
+                agent.record_trajectory = True
+
+        for agent, state, exploration_rate in zip(self.train.cyras, decode_weights(blob), header['exploration_rates']):
+            agent.actor.load_state_dict(state['actor_state_dict'])
+            agent.critic.load_state_dict(state['critic_state_dict'])
+            agent.exploration_rate = exploration_rate
+            agent.clear_buffers()
+
+        rewards = self.train.run_generation(learn=False, max_steps=header['steps'])
+        trajectories = encode_trajectories(self.train.cyras)
+        for agent in self.train.cyras:
+            agent.clear_buffers()
+
+        result = {'type': 'result',
+                  'task_id': header['task_id'],
+                  'rewards': [float(reward) for reward in rewards],
+                  'steps': self.train.last_generation_steps}
+        return result, trajectories
+
+    def build_train(self, reward_weights: dict):
+        """Entrenamiento sin ventana con los pesos de recompensa dados."""
+        from trainer.headless_view import HeadlessView
+        from trainer.training import Train
+        return Train(HeadlessView(), reward_weights=reward_weights)
+
+def run_worker(host: str=DISTRIBUTED_HOST, port: int=DISTRIBUTED_PORT) -> None:
+    """Punto de entrada para procesos worker."""
+    RolloutWorker(host, port).run()
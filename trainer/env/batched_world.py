@@ -0,0 +1,360 @@
+import time
+import numpy as np
+from enums.health_actions import HealthActions
+from enums.health_states import HealthStates
+from enums.hunger_states import HungerStates
+from enums.energy_states import EnergyStates
+from config.general_config import WINDOWS_WIDTH, WINDOWS_HEIGHT
+from config.trainer_config import BATCHED_NUM_FOODS, BATCHED_EAT_RADIUS, REWARD_BREAKDOWN, PERCEPTION_SECTORS
+from trainer.env.reward_engine import RewardEngine
+from trainer.env.perception import SectorPerception
+
+# Mismos valores que Cyra
+MAX_SPEED = 5.0
+RESET_MAX_SPEED = 3.0 # Cyra.reset limita la velocidad a 3
+MAX_PREV_POSITIONS = 5
+HUNGER_DECREMENT = 0.002
+HUNGER_HUNGRY_THRESHOLD = 0.5
+HUNGER_CRITIC_THRESHOLD = 0.2
+ENERGY_DECREMENT = 0.001
+ENERGY_INCREMENT_IDLE = 0.0015
+ENERGY_WEARY_THRESHOLD = 0.5
+ENERGY_CRITIC_THRESHOLD = 0.2
+HEALTH_DECREMENT = 0.01
+HEALTH_INCREMENT = 0.015
+HEALTH_WOUNDED_THRESHOLD = 0.5
+HEALTH_CRITIC_THRESHOLD = 0.2
+DETECT_RADIO = 150.0
+
+# Tamaño de la observacion (igual a la entrada del Agent): 16 de Cyra.get_state + 15 de percepcion
+STATE_SIZE = 16
+PERCEPTION_SIZE = 15
+OBSERVATION_SIZE = STATE_SIZE + PERCEPTION_SIZE
+
+class BatchedWorld:
+    """
+    Motor de simulacion de W mundos independientes en un solo proceso.
+
+    Todo el estado vive en arrays con la dimension de mundos primero: cyras (mundos x agentes)
+    y comida (mundos x comidas). Movimiento, vitales, comida y percepcion se calculan con
+    operaciones de numpy sobre todos los mundos y agentes a la vez, siguiendo las reglas de Cyra
+    (Cyra.update_all). Las observaciones salen como un solo array (mundos x agentes x features)
+    que se puede pasar a torch sin copiar (torch.from_numpy) y las recompensas con RewardEngine.
+    Con 'sectors' > 0 se agregan al final las features de SectorPerception (el Agent debe
+    crearse con input_size=observation_size).
+    """
+    def __init__(self, num_worlds: int, num_agents: int, num_foods: int=BATCHED_NUM_FOODS,
+                 width: float=WINDOWS_WIDTH, height: float=WINDOWS_HEIGHT, eat_radius: float=BATCHED_EAT_RADIUS,
+                 reward_engine: RewardEngine=None, breakdown: bool=REWARD_BREAKDOWN, seed: int=None,
+                 sectors: int=PERCEPTION_SECTORS) -> None:
+        self.num_worlds = num_worlds
+        self.num_agents = num_agents
+        self.num_foods = num_foods
+        self.width = width
+        self.height = height
+        self.eat_radius = eat_radius
+        self.breakdown = breakdown
+        self.reward_engine = reward_engine if reward_engine is not None else RewardEngine(width=width, height=height)
+        self.rng = np.random.default_rng(seed)
+        self.sector_perception = SectorPerception(sectors) if sectors > 0 else None
+        self.observation_size = OBSERVATION_SIZE + (self.sector_perception.size if self.sector_perception else 0)
+
+        shape = (num_worlds, num_agents)
+        # --- Cyras
+        self.pos = np.zeros(shape + (2,), dtype=np.float32)
+        self.prev_direction = np.zeros(shape + (2,), dtype=np.float32)
+        self.prev_positions = np.zeros(shape + (MAX_PREV_POSITIONS, 2), dtype=np.float32)
+        self.max_speed = np.zeros(shape, dtype=np.float32)
+        self.last_speed = np.zeros(shape, dtype=np.float32)
+        self.hunger = np.zeros(shape, dtype=np.float32)
+        self.energy = np.zeros(shape, dtype=np.float32)
+        self.health = np.zeros(shape, dtype=np.float32)
+        self.hunger_state = np.zeros(shape, dtype=np.int64)
+        self.energy_state = np.zeros(shape, dtype=np.int64)
+        self.health_state = np.zeros(shape, dtype=np.int64)
+        self.health_action = np.zeros(shape, dtype=np.int64)
+        # --- Comida
+        self.food_pos = np.zeros((num_worlds, num_foods, 2), dtype=np.float32)
+        self.nutrition = np.zeros((num_worlds, num_foods), dtype=np.float32)
+
+        self.all_worlds = np.ones(num_worlds, dtype=bool)
+        self.phase_times = None # Con un diccionario se acumula el tiempo de cada fase del paso (perfilado)
+
+    # ---------------------------
+    # FUNCIONES DEL ENTORNO
+    # ---------------------------
+    def reset(self, worlds: np.ndarray=None) -> np.ndarray:
+        """Reinicia los mundos indicados (mascara de mundos, por defecto todos) y retorna las observaciones."""
+        worlds = self.all_worlds if worlds is None else worlds
+        count = int(worlds.sum())
+        size = np.array([self.width, self.height], dtype=np.float32)
+
+        self.pos[worlds] = self.rng.integers(0, size + 1, size=(count, self.num_agents, 2))
+        self.prev_direction[worlds] = self.pos[worlds] # Igual que Cyra.reset
+        self.prev_positions[worlds] = 0.0
+        self.max_speed[worlds] = RESET_MAX_SPEED
+        self.last_speed[worlds] = 0.0
+        self.hunger[worlds] = 1.0
+        self.energy[worlds] = 1.0
+        self.health[worlds] = 1.0
+        self.hunger_state[worlds] = HungerStates.GOOD.value
+        self.energy_state[worlds] = EnergyStates.GOOD.value
+        self.health_state[worlds] = HealthStates.GOOD.value
+        self.health_action[worlds] = HealthActions.ANY.value
+
+        reset_foods = np.zeros((self.num_worlds, self.num_foods), dtype=bool)
+        reset_foods[worlds] = True
+        self.reset_foods(reset_foods)
+        return self.get_observations()
+
+    def reset_foods(self, mask: np.ndarray) -> None:
+        """Reposiciona la comida indicada (mundos x comidas) con nutricion aleatoria (como Food.reset)."""
+        count = int(mask.sum())
+        if count == 0:
+            return
+        size = np.array([self.width, self.height], dtype=np.float32)
+        self.food_pos[mask] = self.rng.integers(0, size + 1, size=(count, 2))
+        self.nutrition[mask] = self.rng.uniform(0.0, 1.0, size=count)
+
+    def step(self, raw_actions: np.ndarray) -> tuple:
+        """
+        Avanza un paso en todos los mundos.
+        'raw_actions' son las salidas crudas del actor (mundos x agentes x 5).
+        Retorna (observaciones, recompensas (mundos x agentes), done (mundos), info).
+        """
+        directions, speed = BatchedWorld.to_env_actions(raw_actions)
+        start = time.perf_counter()
+
+        # ** Percepcion antes de moverse **
+        food_diff, food_dist, food_in_range = self.food_distances()
+        cant_food = food_in_range.sum(axis=2)
+        nearest_food = self.nearest_food_positions(food_dist, food_in_range)
+        old_dist_food = self.dist_food(nearest_food)
+        old_dist_border = self.dist_border()
+        start = self.add_phase_time('perception', start)
+
+        self.update_health()
+
+        # ** Movimiento **
+        old_pos = self.pos.copy()
+        old_dir = self.prev_direction.copy()
+        new_dir, move_speed = self.move(directions, speed)
+
+        new_dist_food = self.dist_food(nearest_food)
+        new_dist_border = self.dist_border()
+
+        self.update_hunger()
+        self.update_energy(move_speed)
+        self.update_prev_positions(old_pos)
+
+        # ** Comida **
+        ate = self.eat()
+        start = self.add_phase_time('dynamics', start)
+
+        # ** Recompensas **
+        repeated_position = np.any(np.all(self.prev_positions[:, :, :-1] == self.prev_positions[:, :, -1:], axis=3), axis=2)
+        features = self.reward_engine.build_features(
+            old_dist_food, new_dist_food, old_dist_border, new_dist_border,
+            self.pos[..., 0], self.pos[..., 1], np.any(old_dir != new_dir, axis=2), move_speed, cant_food, ate,
+            self.hunger_state, self.energy_state, self.health_state, self.health_action, self.health,
+            repeated_position)
+        rewards, contributions = self.reward_engine.compute(features, breakdown=self.breakdown)
+        start = self.add_phase_time('rewards', start)
+
+        observations = self.get_observations()
+        self.add_phase_time('perception', start)
+
+        done = np.all(self.health <= 0.0, axis=1)
+        info = {'ate': ate, 'cant_food': cant_food, 'contributions': contributions}
+        return observations, rewards, done, info
+
+    def add_phase_time(self, phase: str, start: float) -> float:
+        """Suma el tiempo desde 'start' a la fase (si el perfilado esta activo) y retorna el momento actual."""
+        now = time.perf_counter()
+        if self.phase_times is not None:
+            self.phase_times[phase] = self.phase_times.get(phase, 0.0) + now - start
+        return now
+
+    def to_env_actions(raw_actions: np.ndarray) -> tuple:
+        """Version vectorizada de Agent.to_env_action: (direcciones 0/1, velocidad en [0, 5])."""
+        raw_actions = np.asarray(raw_actions, dtype=np.float32)
+        directions = (raw_actions[..., :4] > 0).astype(np.float32)
+        speed = np.clip(np.abs(raw_actions[..., 4]), 0.0, 5.0)
+        return directions, speed
+
+    # ---------------------------
+    # FUNCIONES DE LOS CYRAS
+    # ---------------------------
+    def update_health(self) -> None:
+        """Salud segun el estado del hambre (Cyra.update_health)."""
+        critic = self.hunger_state == HungerStates.CRITIC.value
+        good = self.hunger_state == HungerStates.GOOD.value
+        self.health = np.where(critic, np.maximum(self.health - HEALTH_DECREMENT, 0.0), self.health)
+        self.health = np.where(good, np.minimum(self.health + HEALTH_INCREMENT, 1.0), self.health).astype(np.float32)
+        self.health_action = np.where(critic, HealthActions.LOSS.value,
+                                      np.where(good, HealthActions.RECOVE.value, HealthActions.ANY.value))
+        # Cyra.update_health sobrescribe DEAD con CRITIC, asi que el estado nunca queda en DEAD
+        self.health_state = np.where(self.health < HEALTH_CRITIC_THRESHOLD, HealthStates.CRITIC.value,
+                                     np.where(self.health < HEALTH_WOUNDED_THRESHOLD, HealthStates.WOUNDED.value,
+                                              HealthStates.GOOD.value))
+
+    def move(self, directions: np.ndarray, speed: np.ndarray) -> tuple:
+        """Movimiento normalizado con velocidad maxima y control de bordes (Cyra.move)."""
+        up, down, left, right = (directions[..., i] for i in range(4))
+        base = np.stack([right - left, down - up], axis=-1)
+        length = np.linalg.norm(base, axis=-1, keepdims=True)
+        base = np.divide(base, length, out=np.zeros_like(base), where=length > 0)
+        new_dir = (base * np.minimum(speed, self.max_speed)[..., None]).astype(np.float32)
+        magnitude = np.linalg.norm(new_dir, axis=-1)
+
+        alive = (self.health > 0.0)[..., None]
+        self.pos = np.where(alive, self.pos + new_dir, self.pos)
+        self.pos[..., 0] = np.clip(self.pos[..., 0], 0, self.width)
+        self.pos[..., 1] = np.clip(self.pos[..., 1], 0, self.height)
+
+        self.last_speed = magnitude
+        self.prev_direction = new_dir
+        return new_dir, magnitude
+
+    def update_hunger(self) -> None:
+        """Hambre (baja 5 veces mas rapido con energia critica) y su estado (Cyra.update_hunger)."""
+        decrement = np.where(self.energy_state == EnergyStates.CRITIC.value, HUNGER_DECREMENT * 5, HUNGER_DECREMENT)
+        self.hunger = np.maximum(self.hunger - decrement, 0.0).astype(np.float32)
+        self.hunger_state = np.where(self.hunger <= HUNGER_CRITIC_THRESHOLD, HungerStates.CRITIC.value,
+                                     np.where(self.hunger <= HUNGER_HUNGRY_THRESHOLD, HungerStates.HUNGRY.value,
+                                              HungerStates.GOOD.value))
+
+    def update_energy(self, move_speed: np.ndarray) -> None:
+        """Energia segun el movimiento y su estado (Cyra.update_energy)."""
+        recharged = np.minimum(self.energy + ENERGY_INCREMENT_IDLE, 1.0)
+        reduced = np.maximum(self.energy - ENERGY_DECREMENT * move_speed ** 2, 0.0)
+        self.energy = np.where(move_speed <= 0, recharged, reduced).astype(np.float32)
+        self.energy_state = np.where(self.energy <= ENERGY_CRITIC_THRESHOLD, EnergyStates.CRITIC.value,
+                                     np.where(self.energy <= ENERGY_WEARY_THRESHOLD, EnergyStates.WEARY.value,
+                                              EnergyStates.GOOD.value))
+
+    def update_prev_positions(self, old_pos: np.ndarray) -> None:
+        """Desplaza la ventana de ultimas posiciones (Cyra.update_prev_positions)."""
+        self.prev_positions[:, :, :-1] = self.prev_positions[:, :, 1:]
+        self.prev_positions[:, :, -1] = np.round(old_pos, 1)
+
+    def eat(self) -> np.ndarray:
+        """
+        Cada cyra vivo come la comida mas cercana dentro de 'eat_radius'. Si dos cyras llegan a la
+        misma comida en el mismo paso, la come solo el primero. La comida comida se reposiciona.
+        Retorna la mascara (mundos x agentes) de quienes comieron.
+        """
+        ate = np.zeros((self.num_worlds, self.num_agents), dtype=bool)
+        if self.num_foods == 0:
+            return ate
+        _, food_dist, _ = self.food_distances()
+        nearest = np.argmin(food_dist, axis=2)
+        nearest_dist = np.take_along_axis(food_dist, nearest[..., None], axis=2)[..., 0]
+        candidates = (nearest_dist <= self.eat_radius) & (self.health > 0.0)
+
+        worlds, agents = np.nonzero(candidates)
+        foods = nearest[worlds, agents]
+        _, first = np.unique(worlds * self.num_foods + foods, return_index=True)
+        worlds, agents, foods = worlds[first], agents[first], foods[first]
+
+        nutrition = self.nutrition[worlds, foods]
+        self.hunger[worlds, agents] = np.minimum(self.hunger[worlds, agents] + nutrition, 1.0)
+        self.energy[worlds, agents] = np.minimum(self.energy[worlds, agents] + nutrition, 1.0)
+
+        eaten = np.zeros((self.num_worlds, self.num_foods), dtype=bool)
+        eaten[worlds, foods] = True
+        self.reset_foods(eaten)
+
+        ate[worlds, agents] = True
+        return ate
+
+    # ---------------------------
+    # FUNCIONES DE PERCEPCION
+    # ---------------------------
+    def food_distances(self) -> tuple:
+        """Diferencias, distancias y mascara de deteccion cyra -> comida (mundos x agentes x comidas)."""
+        food_diff = self.food_pos[:, None, :, :] - self.pos[:, :, None, :]
+        food_dist = np.linalg.norm(food_diff, axis=3)
+        return food_diff, food_dist, food_dist <= DETECT_RADIO
+
+    def nearest_food_positions(self, food_dist: np.ndarray, food_in_range: np.ndarray) -> np.ndarray:
+        """Posicion de la comida detectada mas cercana, o (0, 0) si no hay (Cyra.get_nearest_food)."""
+        if self.num_foods == 0:
+            return np.zeros((self.num_worlds, self.num_agents, 2), dtype=np.float32)
+        masked = np.where(food_in_range, food_dist, np.inf)
+        nearest = np.argmin(masked, axis=2)
+        positions = np.take_along_axis(self.food_pos, nearest[..., None].repeat(2, axis=2), axis=1)
+        return np.where(food_in_range.any(axis=2)[..., None], positions, 0.0)
+
+    def dist_food(self, nearest_food: np.ndarray) -> np.ndarray:
+        """Misma medida de distancia a la comida que Cyra.update_all."""
+        return np.minimum.reduce([self.pos[..., 0], nearest_food[..., 0] - self.pos[..., 0],
+                                  self.pos[..., 1], nearest_food[..., 1] - self.pos[..., 1]])
+
+    def dist_border(self) -> np.ndarray:
+        """Distancia al borde mas cercano."""
+        return np.minimum.reduce([self.pos[..., 0], self.width - self.pos[..., 0],
+                                  self.pos[..., 1], self.height - self.pos[..., 1]])
+
+    def get_observations(self) -> np.ndarray:
+        """
+        Observaciones (mundos x agentes x 31): las 16 de Cyra.get_state seguidas de 15 de percepcion
+        (comida detectada, comida y cyra mas cercanos, distancias a los bordes y direccion previa),
+        mas las features por sector si la percepcion por sectores esta activa.
+        """
+        observations = np.zeros((self.num_worlds, self.num_agents, self.observation_size), dtype=np.float32)
+        # --- Estado propio (Cyra.get_state)
+        observations[..., 0] = self.pos[..., 0] / self.width
+        observations[..., 1] = self.pos[..., 1] / self.height
+        observations[..., 2] = self.hunger
+        observations[..., 3] = self.energy
+        observations[..., 4] = self.health
+        observations[..., 5] = self.last_speed / np.where(self.max_speed > 0, self.max_speed, 1.0)
+        self.one_hot(observations, 6, self.hunger_state)
+        self.one_hot(observations, 9, self.energy_state)
+        self.one_hot(observations, 12, self.health_state)
+        # --- Percepcion
+        observations[..., STATE_SIZE:OBSERVATION_SIZE] = self.perception()
+        if self.sector_perception is not None:
+            observations[..., OBSERVATION_SIZE:] = self.sector_perception.compute(self.pos, self.food_pos, self.nutrition)
+        return observations
+
+    def perception(self) -> np.ndarray:
+        """Features de percepcion vectorizadas (mundos x agentes x 15), normalizadas con el radio de deteccion."""
+        features = np.zeros((self.num_worlds, self.num_agents, PERCEPTION_SIZE), dtype=np.float32)
+        if self.num_foods == 0:
+            features[..., 3] = 1.0 # Sin comida: distancia maxima (igual que sin comida detectada)
+        else:
+            food_diff, food_dist, food_in_range = self.food_distances()
+            any_food = food_in_range.any(axis=2)
+            nearest = np.argmin(np.where(food_in_range, food_dist, np.inf), axis=2)[..., None]
+            features[..., 0] = food_in_range.sum(axis=2) / self.num_foods
+            features[..., 1] = np.where(any_food, np.take_along_axis(food_diff[..., 0], nearest, axis=2)[..., 0], 0.0) / DETECT_RADIO
+            features[..., 2] = np.where(any_food, np.take_along_axis(food_diff[..., 1], nearest, axis=2)[..., 0], 0.0) / DETECT_RADIO
+            features[..., 3] = np.where(any_food, np.take_along_axis(food_dist, nearest, axis=2)[..., 0] / DETECT_RADIO, 1.0)
+            features[..., 4] = np.where(any_food, np.take_along_axis(self.nutrition[:, None, :].repeat(self.num_agents, axis=1),
+                                                                     nearest, axis=2)[..., 0], 0.0)
+
+        # Cyra mas cercano (sin contarse a si mismo)
+        cyra_diff = self.pos[:, None, :, :] - self.pos[:, :, None, :]
+        cyra_dist = np.linalg.norm(cyra_diff, axis=3)
+        cyra_dist[:, np.arange(self.num_agents), np.arange(self.num_agents)] = np.inf
+        cyra_in_range = cyra_dist <= DETECT_RADIO
+        any_cyra = cyra_in_range.any(axis=2)
+        nearest_cyra = np.argmin(cyra_dist, axis=2)[..., None]
+        features[..., 5] = cyra_in_range.sum(axis=2) / max(1, self.num_agents - 1)
+        features[..., 6] = np.where(any_cyra, np.take_along_axis(cyra_diff[..., 0], nearest_cyra, axis=2)[..., 0], 0.0) / DETECT_RADIO
+        features[..., 7] = np.where(any_cyra, np.take_along_axis(cyra_diff[..., 1], nearest_cyra, axis=2)[..., 0], 0.0) / DETECT_RADIO
+        features[..., 8] = np.where(any_cyra, np.take_along_axis(cyra_dist, nearest_cyra, axis=2)[..., 0] / DETECT_RADIO, 1.0)
+
+        # Bordes y direccion previa
+        features[..., 9] = self.pos[..., 0] / self.width
+        features[..., 10] = (self.width - self.pos[..., 0]) / self.width
+        features[..., 11] = self.pos[..., 1] / self.height
+        features[..., 12] = (self.height - self.pos[..., 1]) / self.height
+        features[..., 13:15] = np.clip(self.prev_direction / MAX_SPEED, -1.0, 1.0)
+        return features
+
+    def one_hot(self, observations: np.ndarray, start: int, values: np.ndarray) -> None:
+        """Escribe el one-hot de 'values' desde la columna 'start'."""
+        np.put_along_axis(observations, (start + values)[..., None], 1.0, axis=2)
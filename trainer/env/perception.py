@@ -0,0 +1,90 @@
+import numpy as np
+from config.trainer_config import PERCEPTION_SECTORS, PERCEPTION_RADIUS
+
+# Features por sector: distancia a la comida mas cercana, su nutricion y distancia al cyra mas cercano
+FEATURES_PER_SECTOR = 3
+
+class SectorPerception:
+    """
+    Percepcion por sectores angulares alrededor de cada cyra.
+
+    El circulo de deteccion se divide en 'num_sectors' sectores iguales (el sector 0 empieza
+    en el angulo -pi, medido con arctan2 en coordenadas de pantalla). Por sector se codifica la
+    distancia a la comida mas cercana (normalizada con el radio, 1.0 si no hay), la nutricion de
+    esa comida (0.0 si no hay) y la distancia al cyra mas cercano (1.0 si no hay).
+
+    Todo se calcula con arrays a la vez para todos los agentes, sin recorrer objetos, y funciona
+    con o sin la dimension de mundos adelante. El angulo y el ordenamiento solo se calculan
+    para los pares dentro del radio.
+    """
+    def __init__(self, num_sectors: int=PERCEPTION_SECTORS, radius: float=PERCEPTION_RADIUS) -> None:
+        self.num_sectors = num_sectors
+        self.radius = radius
+        self.size = num_sectors * FEATURES_PER_SECTOR
+
+    def compute(self, pos: np.ndarray, food_pos: np.ndarray, nutrition: np.ndarray) -> np.ndarray:
+        """
+        pos: (..., agentes, 2), food_pos: (..., comidas, 2), nutrition: (..., comidas).
+        Retorna (..., agentes, num_sectors * 3) con [comida_dist, nutricion, cyra_dist] por sector.
+        """
+        pos = np.asarray(pos, dtype=np.float32)
+        food_pos = np.asarray(food_pos, dtype=np.float32)
+        nutrition = np.asarray(nutrition, dtype=np.float32)
+        num_agents = pos.shape[-2]
+
+        features = np.empty(pos.shape[:-1] + (self.num_sectors, FEATURES_PER_SECTOR), dtype=np.float32)
+        features = features.reshape(-1, self.num_sectors, FEATURES_PER_SECTOR)
+
+        # --- Comida
+        food_dist, food_index = self.nearest_per_sector(pos, food_pos)
+        found = np.isfinite(food_dist)
+        worlds = np.arange(len(food_dist))[:, None] // num_agents # Mundo de cada agente (filas aplanadas)
+        features[..., 0] = np.where(found, food_dist / self.radius, 1.0)
+        features[..., 1] = np.where(found, nutrition.reshape(-1, nutrition.shape[-1])[worlds, food_index], 0.0) \
+            if nutrition.shape[-1] > 0 else 0.0
+
+        # --- Otros cyras (sin contarse a si mismo)
+        cyra_dist, _ = self.nearest_per_sector(pos, pos, exclude_self=True)
+        features[..., 2] = np.where(np.isfinite(cyra_dist), cyra_dist / self.radius, 1.0)
+
+        return features.reshape(pos.shape[:-1] + (self.size,))
+
+    def nearest_per_sector(self, pos: np.ndarray, targets: np.ndarray, exclude_self: bool=False) -> tuple:
+        """
+        Distancia e indice del objetivo mas cercano en cada sector para cada agente, con los
+        agentes aplanados: (agentes_totales, sectores). Sin objetivo la distancia es inf.
+        Solo los pares dentro del radio calculan angulo y entran al ordenamiento.
+        """
+        num_targets = targets.shape[-2]
+        num_rows = int(np.prod(pos.shape[:-1])) # Agentes de todos los mundos
+        diff = targets[..., None, :, :] - pos[..., :, None, :] # (..., agentes, objetivos, 2)
+        squared = np.square(diff[..., 0]) + np.square(diff[..., 1])
+        if exclude_self:
+            squared[..., np.arange(num_targets), np.arange(num_targets)] = np.inf
+        squared = squared.reshape(num_rows, num_targets)
+        diff = diff.reshape(num_rows, num_targets, 2)
+
+        rows, cols = np.nonzero(squared <= self.radius ** 2)
+        dist = np.sqrt(squared[rows, cols])
+        angle = np.arctan2(diff[rows, cols, 1], diff[rows, cols, 0])
+        sector = np.floor((angle + np.pi) * (self.num_sectors / (2 * np.pi))).astype(np.int64) % self.num_sectors
+
+        # Ordena por (agente y sector, distancia) y se queda con el primero de cada grupo
+        group = rows * self.num_sectors + sector
+        order = np.lexsort((dist, group))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = group[order][1:] != group[order][:-1]
+        best = order[first]
+
+        nearest_dist = np.full(num_rows * self.num_sectors, np.inf, dtype=np.float32)
+        nearest_index = np.zeros(num_rows * self.num_sectors, dtype=np.int64)
+        nearest_dist[group[best]] = dist[best]
+        nearest_index[group[best]] = cols[best]
+        return nearest_dist.reshape(num_rows, self.num_sectors), nearest_index.reshape(num_rows, self.num_sectors)
+
+    def compute_from_objects(self, cyras: list, foods: list) -> np.ndarray:
+        """Adaptador para el entorno de objetos: toma los Cyra y Food y retorna (agentes, num_sectors * 3)."""
+        pos = np.array([[cyra.pos.x, cyra.pos.y] for cyra in cyras], dtype=np.float32)
+        food_pos = np.array([[food.pos.x, food.pos.y] for food in foods], dtype=np.float32).reshape(-1, 2)
+        nutrition = np.array([food.nutrition for food in foods], dtype=np.float32)
+        return self.compute(pos, food_pos, nutrition)
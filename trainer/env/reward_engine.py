@@ -0,0 +1,132 @@
+import numpy as np
+from enums.health_actions import HealthActions
+from enums.health_states import HealthStates
+from enums.hunger_states import HungerStates
+from enums.energy_states import EnergyStates
+from config.general_config import WINDOWS_WIDTH, WINDOWS_HEIGHT
+from config.trainer_config import REWARD_TERMS
+
+# Indice de cada termino en la matriz de features (terminos x agentes)
+TERM_INDEX = {name: i for i, name in enumerate(REWARD_TERMS)}
+
+# Los bonus suman y las penalizaciones restan: los pesos se guardan como magnitudes (en el csv
+# de entrenamiento todos los valores son positivos) y el signo sale del sufijo del nombre
+TERM_SIGNS = np.array([1.0 if name.endswith("_bonus") else -1.0 for name in REWARD_TERMS], dtype=np.float32)
+
+class RewardEngine:
+    """
+    Recompensas vectorizadas de BatchedWorld. Cada termino de RewardsAndPenalty se calcula como
+    una fila de una matriz de features (terminos x agentes) y la recompensa es un solo producto
+    pesos @ features. Opcionalmente devuelve la contribucion de cada termino.
+
+    Solo lo usa BatchedWorld: Environment.step sigue calculando la recompensa con
+    RewardsAndPenalty, asi que el desglose describe la recompensa de los mundos en lote
+    (mismos nombres y pesos, con las reglas de cada termino reimplementadas sobre arrays),
+    no la que optimiza el entrenamiento con ventana.
+    """
+    def __init__(self, weights: dict=None, border_margin: float=0.0,
+                 width: float=WINDOWS_WIDTH, height: float=WINDOWS_HEIGHT) -> None:
+        self.border_margin = border_margin # 0 = pegado al borde, donde Cyra.move limita la posicion
+        self.width = width
+        self.height = height
+        self.set_weights(weights)
+
+        # Acumulado de contribuciones por termino (para ver que terminos mueven el retorno)
+        self.breakdown_totals = np.zeros(len(REWARD_TERMS), dtype=np.float64)
+
+    def set_weights(self, weights: dict=None) -> None:
+        """
+        Toma los pesos del diccionario dado o, si no se indica, de los atributos de RewardsAndPenalty
+        (que deben ser exactamente los terminos que calcula este motor). Los pesos son magnitudes:
+        un peso negativo invertiria el signo que le da el nombre del termino.
+        """
+        if weights is None:
+            from trainer.env.rewards_and_penalty import RewardsAndPenalty
+            weights = {name: float(value) for name, value in vars(RewardsAndPenalty).items()
+                       if name.endswith(("_bonus", "_penalty"))}
+        missing = set(REWARD_TERMS) - set(weights)
+        unknown = set(weights) - set(REWARD_TERMS)
+        if missing or unknown:
+            raise ValueError(f"Terminos de recompensa distintos a REWARD_TERMS (faltan: {sorted(missing)}, "
+                             f"sin calcular: {sorted(unknown)})")
+        negative = [name for name in REWARD_TERMS if weights[name] < 0]
+        if negative:
+            raise ValueError(f"Los pesos de recompensa deben ser magnitudes positivas: {negative}")
+        self.weights = np.array([weights[name] for name in REWARD_TERMS], dtype=np.float32) * TERM_SIGNS
+
+    # ---------------------------
+    # FUNCIONES DE FEATURES
+    # ---------------------------
+    def build_features(self, old_dist_food, new_dist_food, old_dist_border, new_dist_border, pos_x, pos_y,
+                       direction_changed, move_speed, cant_food, ate, hunger_state, energy_state,
+                       health_state, health_action, health, repeated_position) -> np.ndarray:
+        """
+        Construye la matriz de features (terminos x ...) a partir de arrays con la misma forma
+        (agentes, o mundos x agentes). Los estados son los valores enteros de los enums.
+        """
+        cant_food = np.asarray(cant_food)
+        features = np.zeros((len(REWARD_TERMS),) + cant_food.shape, dtype=np.float32)
+        food_in_range = cant_food > 0
+        food_improved = np.asarray(new_dist_food) < np.asarray(old_dist_food)
+        new_dist_border = np.asarray(new_dist_border)
+        near_x = (np.asarray(pos_x) <= self.border_margin) | (np.asarray(pos_x) >= self.width - self.border_margin)
+        near_y = (np.asarray(pos_y) <= self.border_margin) | (np.asarray(pos_y) >= self.height - self.border_margin)
+        hunger_state = np.asarray(hunger_state)
+        energy_state = np.asarray(energy_state)
+        health_state = np.asarray(health_state)
+        health_action = np.asarray(health_action)
+
+        # Comida y hambre
+        features[TERM_INDEX['upgrade_food_dist_bonus']] = food_in_range & food_improved
+        features[TERM_INDEX['food_eat_bonus']] = np.asarray(ate)
+        features[TERM_INDEX['food_found_bonus']] = food_in_range
+        features[TERM_INDEX['hunger_good_bonus']] = hunger_state == HungerStates.GOOD.value
+        features[TERM_INDEX['no_upgrade_food_dist_penalty']] = food_in_range & ~food_improved
+        features[TERM_INDEX['no_food_in_range_penalty']] = ~food_in_range
+        features[TERM_INDEX['hunger_hungry_penalty']] = hunger_state == HungerStates.HUNGRY.value
+        features[TERM_INDEX['hunger_critic_penalty']] = hunger_state == HungerStates.CRITIC.value
+        # Energia
+        features[TERM_INDEX['energy_recharge_bonus']] = np.asarray(move_speed) <= 0
+        features[TERM_INDEX['energy_good_bonus']] = energy_state == EnergyStates.GOOD.value
+        features[TERM_INDEX['energy_weary_penalty']] = energy_state == EnergyStates.WEARY.value
+        features[TERM_INDEX['energy_critic_penalty']] = energy_state == EnergyStates.CRITIC.value
+        # Salud
+        features[TERM_INDEX['health_recove_bonus']] = health_action == HealthActions.RECOVE.value
+        features[TERM_INDEX['health_any_bonus']] = health_action == HealthActions.ANY.value
+        features[TERM_INDEX['health_good_bonus']] = health_state == HealthStates.GOOD.value
+        features[TERM_INDEX['health_loss_penalty']] = health_action == HealthActions.LOSS.value
+        features[TERM_INDEX['health_wounded_penalty']] = health_state == HealthStates.WOUNDED.value
+        features[TERM_INDEX['health_critic_penalty']] = health_state == HealthStates.CRITIC.value
+        features[TERM_INDEX['dead_penalty']] = np.asarray(health) <= 0.0
+        # Movimiento y bordes
+        features[TERM_INDEX['change_direction_bonus']] = np.asarray(direction_changed)
+        features[TERM_INDEX['away_border_bonus']] = new_dist_border > np.asarray(old_dist_border)
+        features[TERM_INDEX['border_penalty']] = new_dist_border <= self.border_margin
+        features[TERM_INDEX['corner_penalty']] = near_x & near_y
+        features[TERM_INDEX['repeat_position_penalty']] = np.asarray(repeated_position)
+        return features
+
+    # ---------------------------
+    # FUNCIONES DE RECOMPENSA
+    # ---------------------------
+    def compute(self, features: np.ndarray, breakdown: bool=False) -> tuple:
+        """
+        Combina la matriz de features con el vector de pesos en un solo producto.
+        Retorna (recompensas, contribuciones por termino o None).
+        """
+        flat = features.reshape(len(REWARD_TERMS), -1)
+        rewards = (self.weights @ flat).reshape(features.shape[1:])
+        if not breakdown:
+            return rewards, None
+        contributions = self.weights[:, None] * flat
+        self.breakdown_totals += contributions.sum(axis=1)
+        return rewards, contributions.reshape(features.shape)
+
+    def get_breakdown(self) -> dict:
+        """Contribucion acumulada de cada termino, ordenada por magnitud."""
+        order = np.argsort(-np.abs(self.breakdown_totals))
+        return {REWARD_TERMS[i]: float(self.breakdown_totals[i]) for i in order}
+
+    def reset_breakdown(self) -> None:
+        """Reinicia el acumulado de contribuciones."""
+        self.breakdown_totals[:] = 0.0
@@ -0,0 +1,72 @@
+import copy
+import random
+import numpy as np
+
+# Atributos de Cyra que se recalculan en cada paso (referencian objetos del mundo), no se guardan
+CYRA_TRANSIENT_ATTRIBUTES = ("detected_objects", "food_objects")
+
+class WorldSnapshot:
+    """
+    Foto completa del mundo: vitales, posiciones y estados de los cyras, posiciones y nutricion
+    de la comida, atributos simples del entorno, estados de los generadores aleatorios
+    (random, numpy y torch) y las observaciones del momento.
+
+    Restaurar la misma foto antes de evaluar cada candidato hace que todos empiecen del mismo
+    estado y vean la misma aleatoriedad (common random numbers). La foto se puede serializar
+    con pickle para evaluar en otros procesos.
+    """
+    def __init__(self, cyras: list, foods: list, env_values: dict, rng_states: tuple, states) -> None:
+        self.cyras = cyras
+        self.foods = foods
+        self.env_values = env_values
+        self.rng_states = rng_states
+        self.states = states
+
+    def capture(env, states) -> "WorldSnapshot":
+        """Toma una foto del entorno. 'states' son las observaciones actuales (por ejemplo, las de env.reset())."""
+        import torch
+        cyras = [WorldSnapshot.copy_entity(cyra, CYRA_TRANSIENT_ATTRIBUTES) for cyra in env.cyras]
+        foods = [WorldSnapshot.copy_entity(food) for food in env.foods]
+        env_values = {name: value for name, value in vars(env).items()
+                      if isinstance(value, (bool, int, float, str))}
+        rng_states = (random.getstate(), np.random.get_state(), torch.get_rng_state())
+        return WorldSnapshot(cyras, foods, env_values, rng_states, copy.deepcopy(states))
+
+    def restore(self, env) -> list:
+        """Devuelve el entorno al estado de la foto y retorna una copia de las observaciones guardadas."""
+        import torch
+        for cyra, cyra_state in zip(env.cyras, self.cyras):
+            WorldSnapshot.load_entity(cyra, cyra_state)
+            for name in CYRA_TRANSIENT_ATTRIBUTES:
+                setattr(cyra, name, [])
+
+        # La comida se restaura en los mismos objetos; si cambio la cantidad se vuelve a armar la lista
+        if len(env.foods) == len(self.foods):
+            for food, food_state in zip(env.foods, self.foods):
+                WorldSnapshot.load_entity(food, food_state)
+        else:
+            food_class = type(env.foods[0]) if env.foods else None
+            env.foods = [WorldSnapshot.load_entity(food_class.__new__(food_class), food_state)
+                         for food_state in self.foods]
+
+        for name, value in self.env_values.items():
+            setattr(env, name, value)
+
+        random_state, numpy_state, torch_state = self.rng_states
+        random.setstate(random_state)
+        np.random.set_state(numpy_state)
+        torch.set_rng_state(torch_state)
+        return copy.deepcopy(self.states)
+
+    # ---------------------------
+    # FUNCIONES AUXILIARES
+    # ---------------------------
+    def copy_entity(entity, skip: tuple=()) -> dict:
+        """Copia superficial de cada atributo (los Vector2 y arrays de numpy se copian)."""
+        return {name: copy.copy(value) for name, value in vars(entity).items() if name not in skip}
+
+    def load_entity(entity, entity_state: dict) -> object:
+        """Carga una copia de los atributos guardados en la entidad (la foto se puede reutilizar)."""
+        for name, value in entity_state.items():
+            setattr(entity, name, copy.copy(value))
+        return entity
@@ -0,0 +1,148 @@
+import os
+import math
+import random
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config.general_config import AGENT_BASE_PATH
+from config.trainer_config import NUM_AGENTS, EVAL_EPISODES, EVAL_STEPS, EVAL_WORKERS, EVAL_BASE_SEED, EVAL_REWARD_AGE
+
+def set_seed(seed: int) -> None:
+    """Fija las semillas de random, numpy y torch para que el episodio sea reproducible."""
+    import torch
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+def run_episode(env, agents, steps: int, deterministic: bool=True, states=None) -> tuple:
+    """
+    Corre un episodio con los agentes dados usando solo inferencia (Agent.act).
+    Si no se indican 'states' se reinicia el entorno (si se indican, se continua desde ellos,
+    por ejemplo despues de restaurar una WorldSnapshot).
+    Retorna (retorno por agente, pasos sobrevividos por agente).
+    """
+    if states is None:
+        states = env.reset()
+    returns = np.zeros(len(agents))
+    survival = np.full(len(agents), steps)
+    alive = np.ones(len(agents), dtype=bool)
+
+    for step in range(steps):
+        actions = [agent.act(states[i], deterministic) for i, agent in enumerate(agents)]
+        states, rewards, done = env.step(actions)
+        returns += np.asarray(rewards, dtype=np.float64)
+
+        # Registra el primer paso en que cada cyra se queda sin salud
+        for i, cyra in enumerate(env.cyras):
+            if alive[i] and cyra.health <= 0.0:
+                alive[i] = False
+                survival[i] = step + 1
+        if done:
+            survival[alive] = step + 1
+            break
+    return returns, survival
+
+def evaluate_checkpoint_episode(path: str, reward_age: int, seed: int, steps: int=EVAL_STEPS,
+                                deterministic: bool=True) -> dict:
+    """
+    Proceso trabajador: evalua un checkpoint en un episodio con semilla fija, con los pesos de
+    recompensa de la era 'reward_age' (se fijan en cada tarea porque el proceso se reutiliza entre checkpoints).
+    Todos los cyras del mundo usan el mismo modelo; no se calculan gradientes ni se llenan buffers.
+    """
+    import torch
+    from trainer.headless_view import HeadlessView
+    from trainer.env.environment import Environment
+    from trainer.env.rewards_and_penalty import RewardsAndPenalty
+    from cyra_ai.agent.agent import Agent
+
+    torch.set_num_threads(1) # Un hilo por proceso, el paralelismo lo dan los procesos
+    RewardsAndPenalty.set_rewards_and_penalty_values(reward_age)
+    set_seed(seed)
+
+    agents = [Agent() for _ in range(NUM_AGENTS)]
+    for agent in agents:
+        agent.load_model(path, shared=True)
+
+    env = Environment(HeadlessView().screen, num_cyras=NUM_AGENTS)
+    returns, survival = run_episode(env, agents, steps, deterministic)
+    return {'path': path, 'seed': seed, 'return': float(returns.mean()), 'survival': float(survival.mean())}
+
+def mean_and_ci(values) -> tuple:
+    """Media e intervalo de confianza del 95% (aproximacion normal)."""
+    values = np.asarray(values, dtype=np.float64)
+    mean = float(values.mean())
+    if len(values) < 2:
+        return mean, float('nan')
+    half_width = 1.96 * float(values.std(ddof=1)) / math.sqrt(len(values))
+    return mean, half_width
+
+class Evaluator:
+    """
+    Evalua checkpoints guardados (cyraai_models/agent_{age}.pth) en muchos episodios con semillas
+    fijas y en paralelo. Todos los checkpoints usan las mismas semillas. Reporta media e intervalo
+    de confianza del retorno y del tiempo de supervivencia.
+
+    Los pesos de recompensa son aleatorios por era, asi que por defecto (reward_age=None) cada
+    checkpoint se puntua con los de su propia era y solo la supervivencia se compara entre eras.
+    Con 'reward_age' todos se puntuan con los pesos de esa era y los retornos tambien se comparan.
+    """
+    def __init__(self, episodes: int=EVAL_EPISODES, steps: int=EVAL_STEPS, workers: int=EVAL_WORKERS,
+                 base_seed: int=EVAL_BASE_SEED, deterministic: bool=True, reward_age: int=EVAL_REWARD_AGE) -> None:
+        self.reward_age = reward_age
+        self.episodes = episodes
+        self.steps = steps
+        self.workers = workers
+        self.seeds = [base_seed + i for i in range(episodes)]
+        self.deterministic = deterministic
+
+    def evaluate_ages(self, ages: list) -> list:
+        """Evalua los modelos de las eras indicadas."""
+        return self.evaluate_paths([AGENT_BASE_PATH + f"agent_{age}.pth" for age in ages], ages)
+
+    def evaluate_paths(self, paths: list, ages: list) -> list:
+        """
+        Evalua cada checkpoint en todos los episodios (con los pesos de recompensa de 'reward_age'
+        o, si no se indico, de la era de ese checkpoint) y devuelve un resumen por checkpoint.
+        'returns_comparable' indica si los retornos de los resumenes se pueden comparar entre si.
+        """
+        checkpoint_ages = {path: age for path, age in zip(paths, ages) if os.path.exists(path)}
+        reward_ages = {path: self.reward_age if self.reward_age is not None else age
+                       for path, age in checkpoint_ages.items()}
+        paths = list(checkpoint_ages)
+        episodes = {path: [] for path in paths}
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            futures = [pool.submit(evaluate_checkpoint_episode, path, reward_ages[path], seed, self.steps,
+                                   self.deterministic)
+                       for path in paths for seed in self.seeds]
+            for future in futures:
+                result = future.result()
+                episodes[result['path']].append(result)
+
+        summaries = []
+        for path in paths:
+            return_mean, return_ci = mean_and_ci([episode['return'] for episode in episodes[path]])
+            survival_mean, survival_ci = mean_and_ci([episode['survival'] for episode in episodes[path]])
+            summaries.append({'path': path,
+                              'age': checkpoint_ages[path],
+                              'reward_age': reward_ages[path],
+                              'returns_comparable': self.reward_age is not None,
+                              'episodes': len(episodes[path]),
+                              'return_mean': return_mean,
+                              'return_ci95': return_ci,
+                              'survival_mean': survival_mean,
+                              'survival_ci95': survival_ci})
+        return summaries
+
+    def print_summaries(self, summaries: list) -> None:
+        """Muestra el resumen de la evaluacion como tabla, indicando con que pesos se puntuo el retorno."""
+        if self.reward_age is not None:
+            print(f"Retornos con los pesos de recompensa de la era {self.reward_age} (comparables entre checkpoints)")
+        else:
+            print("Retornos con los pesos de recompensa de cada era: no se comparan entre eras, solo la supervivencia")
+        print(f"{'checkpoint':<32} {'retorno':>22} {'supervivencia':>22}")
+        for summary in summaries:
+            print(f"{os.path.basename(summary['path']):<32} "
+                  f"{summary['return_mean']:>12.3f} ± {summary['return_ci95']:<7.3f} "
+                  f"{summary['survival_mean']:>12.1f} ± {summary['survival_ci95']:<7.1f}")
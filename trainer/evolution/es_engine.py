@@ -0,0 +1,170 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import torch
+from torch.nn.utils import parameters_to_vector, vector_to_parameters
+from config.general_config import AGENT_BASE_PATH
+from config.trainer_config import (NUM_AGENTS, TRAIN_AGE, ES_PAIRS, ES_SIGMA, ES_LEARNING_RATE, ES_WORKERS,
+                                   ES_EPISODE_STEPS, ES_ANCHOR_INTERVAL, ES_BASE_SEED)
+
+# Estado de cada proceso trabajador (se reutiliza entre tareas)
+WORKER_CACHE = {}
+
+def perturbation(seed: int, size: int) -> torch.Tensor:
+    """Ruido gaussiano reproducible a partir de una semilla entera."""
+    generator = torch.Generator().manual_seed(int(seed))
+    return torch.randn(size, generator=generator)
+
+def apply_update(theta: torch.Tensor, seeds: list, coefficients: list, sigma: float, learning_rate: float) -> None:
+    """
+    Reconstruye y aplica la actualizacion de una generacion solo con (semilla, coeficiente).
+    El orden de la suma es siempre el mismo, asi todos los procesos obtienen el mismo theta.
+    """
+    step = torch.zeros_like(theta)
+    for seed, coefficient in zip(seeds, coefficients):
+        step.add_(perturbation(seed, theta.numel()), alpha=float(coefficient))
+    theta.add_(step, alpha=learning_rate / (2 * len(seeds) * sigma))
+
+def centered_ranks(values: np.ndarray) -> np.ndarray:
+    """Transforma los retornos en rangos centrados en [-0.5, 0.5] (robusto a la escala de la recompensa)."""
+    ranks = np.empty(len(values), dtype=np.float64)
+    ranks[np.argsort(values)] = np.arange(len(values))
+    return ranks / max(1, len(values) - 1) - 0.5
+
+def worker_theta(anchor_path: str, updates: list) -> torch.Tensor:
+    """
+    Theta actual en el proceso trabajador: parte del ancla (pesos guardados cada tanto) y
+    reaplica las actualizaciones (semillas y coeficientes) que todavia no aplico.
+    """
+    if WORKER_CACHE.get('anchor_path') != anchor_path:
+        WORKER_CACHE['anchor_path'] = anchor_path
+        WORKER_CACHE['theta'] = torch.load(anchor_path, map_location="cpu", weights_only=True)
+        WORKER_CACHE['applied'] = 0
+    for seeds, coefficients, sigma, learning_rate in updates[WORKER_CACHE['applied']:]:
+        apply_update(WORKER_CACHE['theta'], seeds, coefficients, sigma, learning_rate)
+    WORKER_CACHE['applied'] = len(updates)
+    return WORKER_CACHE['theta']
+
+def evaluate_candidate(age: int, anchor_path: str, updates: list, seed: int, sign: int, sigma: float,
+                       episode_seed: int, steps: int) -> dict:
+    """
+    Proceso trabajador: evalua theta + sign * sigma * ruido(seed) en un episodio.
+    Solo recibe semillas y coeficientes (ademas del ancla en disco), nunca pesos completos.
+    Con sign=0 se evalua el theta central.
+    """
+    from trainer.evaluation.evaluator import set_seed, run_episode
+
+    if 'env' not in WORKER_CACHE:
+        from trainer.headless_view import HeadlessView
+        from trainer.env.environment import Environment
+        from trainer.env.rewards_and_penalty import RewardsAndPenalty
+        from cyra_ai.agent.agent import Agent
+        torch.set_num_threads(1) # Un hilo por proceso, el paralelismo lo dan los procesos
+        RewardsAndPenalty.set_rewards_and_penalty_values(age)
+        WORKER_CACHE['env'] = Environment(HeadlessView().screen, num_cyras=NUM_AGENTS)
+        WORKER_CACHE['agent'] = Agent()
+
+    theta = worker_theta(anchor_path, updates)
+    candidate = theta if sign == 0 else theta + sign * sigma * perturbation(seed, theta.numel())
+    agent = WORKER_CACHE['agent']
+    vector_to_parameters(candidate, agent.actor.parameters())
+
+    set_seed(episode_seed)
+    returns, _ = run_episode(WORKER_CACHE['env'], [agent] * NUM_AGENTS, steps)
+    return {'seed': seed, 'sign': sign, 'return': float(returns.mean())}
+
+class EvolutionStrategies:
+    """
+    Entrenamiento con estrategias evolutivas (ES) y perturbaciones antiteticas.
+
+    Cada generacion se eligen ES_PAIRS semillas; cada semilla define un ruido gaussiano que se
+    evalua sumado y restado a los pesos del actor (theta +- sigma * ruido), en paralelo y con la
+    misma semilla de episodio para todos. La actualizacion se reconstruye solo con los pares
+    (semilla, retorno): los trabajadores reciben semillas y coeficientes, y parten de un ancla
+    de pesos que se guarda cada ES_ANCHOR_INTERVAL generaciones.
+    El theta central tambien se evalua y, si mejora, se guarda en cyraai_models/agent_{age}.pth.
+    """
+    def __init__(self, age: int=TRAIN_AGE, pairs: int=ES_PAIRS, sigma: float=ES_SIGMA,
+                 learning_rate: float=ES_LEARNING_RATE, workers: int=ES_WORKERS, steps: int=ES_EPISODE_STEPS,
+                 anchor_interval: int=ES_ANCHOR_INTERVAL, base_seed: int=ES_BASE_SEED) -> None:
+        from cyra_ai.agent.agent import Agent
+        from graphics_and_data.training_data import TrainCsvData
+
+        self.age = age
+        self.pairs = pairs
+        self.sigma = sigma
+        self.learning_rate = learning_rate
+        self.workers = workers
+        self.steps = steps
+        self.anchor_interval = anchor_interval
+        self.base_seed = base_seed
+        self.rng = np.random.default_rng()
+
+        # La era debe existir en el csv (de ahi salen los pesos de recompensa)
+        train_data = TrainCsvData.get_train_data_by_age(age)
+        self.generation = int(train_data['generations'])
+        self.best_reward = float(train_data['best_reward'])
+
+        self.model_path = AGENT_BASE_PATH + f"agent_{age}.pth"
+        self.anchors_path = AGENT_BASE_PATH + f"es/age_{age}/"
+        os.makedirs(self.anchors_path, exist_ok=True)
+
+        self.agent = Agent()
+        if os.path.exists(self.model_path):
+            self.agent.load_model(self.model_path)
+        self.theta = parameters_to_vector(self.agent.actor.parameters()).detach().clone()
+        self.save_anchor()
+
+    def save_anchor(self) -> None:
+        """Guarda theta como nueva ancla y reinicia la lista de actualizaciones."""
+        self.anchor_path = self.anchors_path + f"anchor_{self.generation}.pt"
+        torch.save(self.theta.clone(), self.anchor_path)
+        self.updates = []
+
+    def run(self, generations: int) -> None:
+        """Entrena 'generations' generaciones con un pool de procesos."""
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            for _ in range(generations):
+                self.run_generation(pool)
+
+    def run_generation(self, pool) -> None:
+        """Evalua los pares antiteticos y el centro, y actualiza theta."""
+        start_time = time.perf_counter()
+        seeds = [int(seed) for seed in self.rng.integers(0, 2**31 - 1, size=self.pairs)]
+        episode_seed = self.base_seed + self.generation
+
+        tasks = [(seed, sign) for seed in seeds for sign in (1, -1)] + [(0, 0)]
+        futures = [pool.submit(evaluate_candidate, self.age, self.anchor_path, self.updates, seed, sign,
+                               self.sigma, episode_seed, self.steps) for seed, sign in tasks]
+        results = [future.result() for future in futures]
+
+        returns_pos = np.array([result['return'] for result in results[0:-1:2]])
+        returns_neg = np.array([result['return'] for result in results[1:-1:2]])
+        center_return = results[-1]['return']
+
+        # Guarda el theta evaluado (antes de actualizarlo) si mejora el mejor modelo de la era
+        self.generation += 1
+        if center_return > self.best_reward:
+            self.save_best(center_return)
+
+        ranks = centered_ranks(np.concatenate([returns_pos, returns_neg]))
+        coefficients = (ranks[:self.pairs] - ranks[self.pairs:]).tolist()
+        apply_update(self.theta, seeds, coefficients, self.sigma, self.learning_rate)
+        self.updates.append((seeds, coefficients, self.sigma, self.learning_rate))
+        if len(self.updates) >= self.anchor_interval:
+            self.save_anchor()
+
+        print(f"ES generacion {self.generation}: centro {center_return:.3f}, "
+              f"media {np.concatenate([returns_pos, returns_neg]).mean():.3f}, "
+              f"mejor {self.best_reward:.3f} ({time.perf_counter() - start_time:.1f}s)")
+
+    def save_best(self, reward: float) -> None:
+        """Guarda theta en el formato de agent_{age}.pth y actualiza el csv de la era."""
+        from graphics_and_data.training_data import TrainCsvData
+        self.best_reward = reward
+        vector_to_parameters(self.theta, self.agent.actor.parameters())
+        self.agent.save_model(self.model_path)
+        TrainCsvData.update_gen_and_rewards_data(self.age, self.generation, self.best_reward)
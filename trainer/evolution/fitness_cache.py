@@ -0,0 +1,77 @@
+import hashlib
+import math
+from config.trainer_config import FITNESS_CACHE_Z, FITNESS_CACHE_MIN_SAMPLES, FITNESS_CACHE_TOLERANCE
+
+class FitnessCache:
+    """
+    Estadisticas de retorno acumuladas por agente entre generaciones.
+
+    La clave es el hash de los pesos (actor y critico) y de la tasa de exploracion: un elite
+    que pasa sin cambios a la siguiente generacion conserva sus retornos anteriores, y cada
+    nueva simulacion se suma con el algoritmo de Welford (media y varianza en un solo paso).
+    La seleccion usa la media menos 'z' errores estandar, asi un mutante con una sola muestra
+    afortunada no le gana a un elite con muchas muestras solo por ruido.
+    """
+    def __init__(self, z: float=FITNESS_CACHE_Z, min_samples: int=FITNESS_CACHE_MIN_SAMPLES,
+                 tolerance: float=FITNESS_CACHE_TOLERANCE) -> None:
+        self.z = z
+        self.min_samples = min_samples
+        self.tolerance = tolerance
+        self.stats = {} # clave -> (cantidad, media, m2, ultimo retorno)
+
+    @staticmethod
+    def key(agent) -> str:
+        """Hash del contenido de los pesos del agente y de su tasa de exploracion."""
+        digest = hashlib.sha256()
+        for module in (agent.actor, agent.critic):
+            for name, tensor in module.state_dict().items():
+                digest.update(name.encode("utf-8"))
+                digest.update(tensor.detach().cpu().contiguous().numpy().tobytes())
+        digest.update(repr(float(agent.exploration_rate)).encode("utf-8"))
+        return digest.hexdigest()
+
+    # ---------------------------
+    # FUNCIONES DE ESTADISTICAS
+    # ---------------------------
+    def add(self, key: str, value: float) -> None:
+        """Suma un retorno a las estadisticas de la clave (Welford)."""
+        count, mean, m2, _ = self.stats.get(key, (0, 0.0, 0.0, 0.0))
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+        self.stats[key] = (count, mean, m2, value)
+
+    def count(self, key: str) -> int:
+        return self.stats.get(key, (0, 0.0, 0.0, 0.0))[0]
+
+    def mean(self, key: str) -> float:
+        return self.stats[key][1]
+
+    def last(self, key: str) -> float:
+        """Ultimo retorno registrado de la clave."""
+        return self.stats[key][3]
+
+    def std_error(self, key: str, prior_std: float=0.0) -> float:
+        """Error estandar de la media; con menos de dos muestras se usa 'prior_std' como desvio."""
+        count, _, m2, _ = self.stats[key]
+        std = math.sqrt(m2 / (count - 1)) if count > 1 else prior_std
+        return std / math.sqrt(count)
+
+    def scores(self, keys: list, prior_std: float=0.0) -> list:
+        """Puntaje de seleccion de cada clave: media - z * error estandar."""
+        return [self.mean(key) - self.z * self.std_error(key, prior_std) for key in keys]
+
+    def is_tight(self, key: str) -> bool:
+        """
+        True si la estimacion ya es precisa: al menos 'min_samples' muestras y un intervalo
+        (z errores estandar) menor que 'tolerance' veces el valor absoluto de la media (minimo 1).
+        """
+        if self.count(key) < max(2, self.min_samples):
+            return False
+        return self.z * self.std_error(key) <= self.tolerance * max(1.0, abs(self.mean(key)))
+
+    def retain(self, keys) -> None:
+        """Descarta las estadisticas de los agentes que ya no estan en la poblacion."""
+        keys = set(keys)
+        self.stats = {key: value for key, value in self.stats.items() if key in keys}
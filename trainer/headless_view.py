@@ -0,0 +1,26 @@
+import os
+from config.general_config import WINDOWS_WIDTH, WINDOWS_HEIGHT
+
+class HeadlessView:
+    """
+    Vista sin ventana para correr el entrenamiento en servidores o procesos trabajadores.
+    Dibuja sobre una superficie en memoria y no procesa eventos de teclado.
+    """
+    def __init__(self) -> None:
+        # Import diferido: pygame solo se necesita para la superficie en memoria (sin display)
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+        import pygame
+        pygame.init()
+        self.screen = pygame.Surface((WINDOWS_WIDTH, WINDOWS_HEIGHT))
+        
+        self.train_running = True
+        self.running = True
+    
+    def process_events(self) -> None:
+        """No hay eventos de teclado en modo sin ventana."""
+        pass
+    
+    def render(self) -> None:
+        """No hay pantalla que actualizar en modo sin ventana."""
+        pass
@@ -0,0 +1,173 @@
+import copy
+import queue
+import threading
+from collections import deque
+import numpy as np
+from config.trainer_config import PIPELINE_MAX_LAG
+
+class PipelinedLearner:
+    """
+    Learner en segundo plano para solapar el aprendizaje de una generacion con la
+    recoleccion de la siguiente.
+
+    El hilo del learner tiene su propia copia de la poblacion (master). Por cada generacion
+    recolectada recibe las trayectorias (estados, acciones crudas, recompensas) y el fitness,
+    aplica update_from_trajectory a cada agente y arma la siguiente poblacion (next_population).
+    Los actores que simulan reciben los pesos nuevos solo en los limites de generacion
+    (hand_off) y como maximo van 'max_lag' generaciones por detras del learner.
+
+    Cada agente tiene un id propio y cada generacion enviada lleva los ids de los agentes que
+    la simularon, asi una generacion atrasada se aprende igual: las trayectorias y el fitness
+    se asignan por id (no por posicion) a los agentes guardados de las ultimas 'max_lag' + 1
+    poblaciones. El elite sale de los agentes de esa generacion y del elite actual, que compite
+    con su ultimo fitness para que una generacion atrasada no reemplace a uno mejor.
+    """
+    def __init__(self, train, max_lag: int=PIPELINE_MAX_LAG) -> None:
+        self.train = train
+        self.max_lag = max(1, max_lag)
+
+        # Copia propia de la poblacion: el learner nunca toca los modulos de los actores
+        self.master = [copy.deepcopy(agent) for agent in train.cyras]
+        for agent in self.master:
+            agent.clear_buffers()
+        self.last_id = 0
+        self.master_ids = [self.new_id() for _ in self.master]
+        self.actor_ids = list(self.master_ids)        # Ids de los agentes que simulan (hilo principal)
+
+        # Agentes de las poblaciones que los actores todavia pueden estar simulando (hilo del learner)
+        self.recent_ids = deque([self.master_ids], maxlen=self.max_lag + 1)
+        self.agents = dict(zip(self.master_ids, self.master))
+        self.fitness = {}                             # id -> ultimo fitness de ese agente
+        self.elite_id = None
+
+        self.jobs = queue.Queue(maxsize=self.max_lag) # Generaciones pendientes de aprender
+        self.results = []                             # Resultados listos para el hand-off
+        self.results_condition = threading.Condition()
+        self.submitted = 0                            # Generaciones enviadas al learner
+        self.completed = 0                            # Generaciones aprendidas
+        self.error = None
+
+        self.thread = threading.Thread(target=self.learner_loop, daemon=True)
+        self.thread.start()
+
+    def new_id(self) -> int:
+        self.last_id += 1
+        return self.last_id
+
+    # ---------------------------
+    # FUNCIONES DEL HILO LEARNER
+    # ---------------------------
+    def learner_loop(self) -> None:
+        """Aprende cada generacion recibida y publica la poblacion resultante."""
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            try:
+                result = self.learn_generation(job)
+            except Exception as error:
+                result = None
+                self.error = error
+            with self.results_condition:
+                if result is not None:
+                    self.results.append(result)
+                self.completed += 1
+                self.results_condition.notify_all()
+
+    def learn_generation(self, job: dict) -> dict:
+        """
+        Actualiza los agentes que simularon la generacion (por id) con sus trayectorias y
+        evoluciona la poblacion a partir del mejor de ellos o del elite actual.
+        """
+        ids = job['ids']
+        agents = [self.agents[agent_id] for agent_id in ids]
+        if self.train.population_learner is not None:
+            self.train.population_learner.update(agents, job['trajectories'])
+        else:
+            for agent, (states, actions, rewards) in zip(agents, job['trajectories']):
+                if len(rewards) > 0:
+                    agent.update_from_trajectory(states, actions, rewards)
+        for agent in agents:
+            agent.end_generation()
+
+        for agent_id, reward in zip(ids, job['rewards']):
+            self.fitness[agent_id] = float(reward)
+        candidates = list(ids) + ([self.elite_id] if self.elite_id is not None and self.elite_id not in ids else [])
+        best_id = max(candidates, key=lambda agent_id: self.fitness[agent_id])
+
+        # El elite ocupa su lugar en la poblacion de la que viene (la de la generacion o la master)
+        population, population_ids = (agents, ids) if best_id in ids else (self.master, self.master_ids)
+        best_index = population_ids.index(best_id)
+        best_agent = population[best_index]
+        self.master = self.train.next_population(population, best_index)
+        self.master_ids = [best_id if agent is best_agent else self.new_id() for agent in self.master]
+        self.elite_id = best_id
+
+        # Solo se guardan los agentes que los actores todavia pueden estar simulando
+        self.recent_ids.append(self.master_ids)
+        recent = set().union(*self.recent_ids)
+        self.agents.update(zip(self.master_ids, self.master))
+        self.agents = {agent_id: agent for agent_id, agent in self.agents.items() if agent_id in recent}
+        self.fitness = {agent_id: value for agent_id, value in self.fitness.items() if agent_id in recent}
+
+        # Copias de los pesos para entregar a los actores sin compartir tensores con el master
+        states = [{'actor_state_dict': copy.deepcopy(agent.actor.state_dict()),
+                   'critic_state_dict': copy.deepcopy(agent.critic.state_dict()),
+                   'exploration_rate': agent.exploration_rate,
+                   'lineage_parent': agent.lineage_parent} for agent in self.master]
+        return {'generation': job['generation'],
+                'ids': list(self.master_ids),
+                'best_index': best_index,
+                'best_reward': self.fitness[best_id],
+                'states': states}
+
+    # ---------------------------
+    # FUNCIONES DEL HILO PRINCIPAL
+    # ---------------------------
+    def submit(self, generation: int, rewards) -> None:
+        """
+        Envia la generacion recien recolectada al learner y vacia los buffers de los actores.
+        Se bloquea si ya hay 'max_lag' generaciones pendientes.
+        """
+        trajectories = [(np.asarray(agent.states, dtype=np.float32),
+                         np.asarray(agent.actions, dtype=np.float32),
+                         np.asarray(agent.rewards, dtype=np.float32)) for agent in self.train.cyras]
+        for agent in self.train.cyras:
+            agent.clear_buffers()
+        self.jobs.put({'generation': generation, 'ids': list(self.actor_ids),
+                       'rewards': np.asarray(rewards), 'trajectories': trajectories})
+        self.submitted += 1
+
+    def hand_off(self, wait_all: bool=False) -> None:
+        """
+        Limite de generacion: espera hasta que el retraso de politica sea como maximo 'max_lag'
+        (o todo, con wait_all) y carga en los actores los pesos mas recientes del learner.
+        """
+        pending_allowed = 0 if wait_all else self.max_lag
+        with self.results_condition:
+            while self.submitted - self.completed > pending_allowed:
+                self.results_condition.wait()
+            results = self.results
+            self.results = []
+        if self.error is not None:
+            raise RuntimeError("Fallo el learner en segundo plano") from self.error
+
+        for result in results:
+            self.apply_result(result)
+
+    def apply_result(self, result: dict) -> None:
+        """Carga los pesos del learner en los actores y guarda el mejor modelo de esa generacion."""
+        for agent, state in zip(self.train.cyras, result['states']):
+            agent.unshare_weights()
+            agent.actor.load_state_dict(state['actor_state_dict'])
+            agent.critic.load_state_dict(state['critic_state_dict'])
+            agent.exploration_rate = state['exploration_rate']
+            agent.lineage_parent = state['lineage_parent']
+        self.actor_ids = result['ids']
+        self.train.record_generation_result(result['generation'], result['best_reward'], result['best_index'])
+
+    def stop(self) -> None:
+        """Aprende lo pendiente, entrega los ultimos pesos y termina el hilo."""
+        self.hand_off(wait_all=True)
+        self.jobs.put(None)
+        self.thread.join()
@@ -0,0 +1,154 @@
+import os
+import queue
+import threading
+import numpy as np
+from config.general_config import WINDOWS_WIDTH, WINDOWS_HEIGHT, BACKGROUND_COLOR
+from config.trainer_config import (RECORDING_MODE, RECORDING_STRIDE, RECORDING_DOWNSAMPLE, RECORDING_QUEUE_SIZE,
+                                   RECORDING_CHUNK_FRAMES, RECORDING_FORMAT, RECORDING_PATH)
+
+class FrameRecorder:
+    """
+    Grabador de frames que nunca frena el bucle de pasos.
+
+    El bucle solo copia el frame (o una foto del mundo) cada 'stride' pasos y lo deja en una
+    cola acotada. Un hilo escritor los guarda como .npz comprimidos o como secuencia .png.
+    Si la cola esta llena el frame se descarta (y se cuenta) en vez de esperar. Los cambios de
+    grabacion no pasan por la cola: cada frame lleva el numero de su grabacion y el nombre de
+    la carpeta se busca en 'recordings', asi nunca hace falta esperar a que la cola se vacie.
+
+    Modos:
+        - "surface": copia la superficie donde dibuja el entorno.
+        - "snapshot": guarda una WorldSnapshot y el hilo escritor dibuja el mundo en su propia
+          superficie, asi funciona sin ventana aunque nadie dibuje en pantalla.
+    """
+    def __init__(self, mode: str=RECORDING_MODE, stride: int=RECORDING_STRIDE, downsample: int=RECORDING_DOWNSAMPLE,
+                 queue_size: int=RECORDING_QUEUE_SIZE, chunk_frames: int=RECORDING_CHUNK_FRAMES,
+                 image_format: str=RECORDING_FORMAT, output_path: str=RECORDING_PATH) -> None:
+        self.mode = mode
+        self.stride = max(1, stride)
+        self.downsample = max(1, downsample)
+        self.chunk_frames = chunk_frames
+        self.image_format = image_format
+        self.output_path = output_path
+
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.recordings = {0: "recording"} # Numero de grabacion -> carpeta (lo escribe el bucle de pasos)
+        self.recording_index = 0
+        self.dropped_frames = 0
+        self.saved_frames = 0
+        self.thread = None
+        self.stopping = threading.Event() # El hilo escritor termina al vaciar la cola
+        self.render_surface = None # Superficie propia del hilo escritor (modo snapshot)
+
+    # ---------------------------
+    # FUNCIONES DEL BUCLE DE PASOS
+    # ---------------------------
+    def start(self) -> None:
+        """Inicia el hilo escritor."""
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self.writer_loop, daemon=True)
+        self.thread.start()
+
+    def start_generation(self, name: str) -> None:
+        """Indica que los proximos frames pertenecen a una nueva grabacion (carpeta 'name')."""
+        self.recordings[self.recording_index + 1] = name # Antes de encolar frames con el nuevo numero
+        self.recording_index += 1
+
+    def capture(self, step: int, surface=None, env=None) -> None:
+        """Graba el paso si corresponde segun 'stride'. Nunca bloquea."""
+        if step % self.stride != 0:
+            return
+        if self.mode == "snapshot":
+            from trainer.env.world_snapshot import WorldSnapshot
+            self.put(('snapshot', self.recording_index, step, WorldSnapshot.capture(env, None)))
+            return
+        import pygame
+        frame = pygame.surfarray.array3d(surface) # Copia (ancho, alto, 3)
+        self.put(('frame', self.recording_index, step, frame[::self.downsample, ::self.downsample]))
+
+    def put(self, item: tuple) -> None:
+        """Agrega a la cola sin esperar; si esta llena descarta el frame."""
+        try:
+            self.frames.put_nowait(item)
+        except queue.Full:
+            self.dropped_frames += 1
+
+    def stop(self) -> None:
+        """Avisa al hilo escritor que termine cuando guarde lo pendiente. Nunca bloquea."""
+        self.stopping.set()
+
+    def join(self) -> None:
+        """Espera a que el hilo escritor guarde los frames pendientes (al cerrar el entrenamiento)."""
+        if self.thread is None:
+            return
+        self.stop()
+        self.thread.join()
+        self.thread = None
+        print(f"Grabacion terminada: {self.saved_frames} frames guardados, {self.dropped_frames} descartados")
+
+    # ---------------------------
+    # FUNCIONES DEL HILO ESCRITOR
+    # ---------------------------
+    def writer_loop(self) -> None:
+        """Saca frames de la cola y los guarda por bloques."""
+        recording = 0
+        directory = os.path.join(self.output_path, self.recordings[recording])
+        chunk = []
+        chunk_index = 0
+        while True:
+            try:
+                item = self.frames.get(timeout=0.1)
+            except queue.Empty:
+                if not self.stopping.is_set():
+                    continue
+                item = None # Cola vacia y grabacion detenida
+            if item is None or item[1] != recording:
+                # Fin o frame de otra grabacion: se cierra el bloque de la grabacion anterior
+                self.write_chunk(directory, chunk_index, chunk)
+                if item is None:
+                    return
+                recording = item[1]
+                directory = os.path.join(self.output_path, self.recordings[recording])
+                chunk = []
+                chunk_index = 0
+
+            kind, _, step, data = item
+            frame = self.render_snapshot(data) if kind == 'snapshot' else data
+            chunk.append((step, frame))
+            if len(chunk) >= self.chunk_frames:
+                self.write_chunk(directory, chunk_index, chunk)
+                chunk = []
+                chunk_index += 1
+
+    def write_chunk(self, directory: str, chunk_index: int, chunk: list) -> None:
+        """Guarda un bloque de frames como .npz comprimido o como .png individuales."""
+        if not chunk:
+            return
+        os.makedirs(directory, exist_ok=True)
+        steps = np.array([step for step, _ in chunk])
+        frames = np.stack([frame.transpose(1, 0, 2) for _, frame in chunk]) # (frames, alto, ancho, 3)
+        if self.image_format == "png":
+            from PIL import Image
+            for step, frame in zip(steps, frames):
+                Image.fromarray(frame).save(os.path.join(directory, f"frame_{step:07d}.png"))
+        else:
+            np.savez_compressed(os.path.join(directory, f"frames_{chunk_index:05d}.npz"), frames=frames, steps=steps)
+        self.saved_frames += len(chunk)
+
+    def render_snapshot(self, snapshot) -> np.ndarray:
+        """Dibuja una WorldSnapshot en la superficie propia del hilo escritor y devuelve el frame."""
+        import pygame
+        from trainer.entities.cyras import Cyra
+        from trainer.entities.foods import Food
+        from trainer.env.world_snapshot import WorldSnapshot
+
+        if self.render_surface is None:
+            self.render_surface = pygame.Surface((WINDOWS_WIDTH, WINDOWS_HEIGHT))
+        self.render_surface.fill(BACKGROUND_COLOR)
+        for food_state in snapshot.foods:
+            WorldSnapshot.load_entity(Food.__new__(Food), food_state).draw(self.render_surface)
+        for cyra_state in snapshot.cyras:
+            WorldSnapshot.load_entity(Cyra.__new__(Cyra), cyra_state).draw(self.render_surface)
+        frame = pygame.surfarray.array3d(self.render_surface)
+        return frame[::self.downsample, ::self.downsample]
@@ -0,0 +1,165 @@
+from typing import Any
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from config.general_config import AGENT_BASE_PATH
+from config.trainer_config import (REWARD_TERMS, SWEEP_TRIALS, SWEEP_WORKERS, SWEEP_MIN_GENERATIONS,
+                                   SWEEP_MAX_GENERATIONS, SWEEP_ETA)
+from graphics_and_data.sweep_data import SweepCsvData
+
+def run_trial_rung(trial_id: int, weights: dict, generations: int, state_path: str) -> dict:
+    """
+    Proceso trabajador: entrena 'generations' generaciones mas de una prueba (trial)
+    sin ventana y guarda la poblacion para poder continuarla en el siguiente escalon.
+    """
+    from trainer.headless_view import HeadlessView
+    from trainer.training import Train
+
+    train = Train(HeadlessView(), reward_weights=weights)
+    if os.path.exists(state_path):
+        train.load_population(state_path)
+
+    for _ in range(generations):
+        train_rewards = train.run_generation()
+        train.evolve_population(avg_rewards=train_rewards)
+
+    train.save_population(state_path)
+    return {'trial_id': trial_id, 'generation': train.generation, 'best_reward': float(train.best_reward)}
+
+class SweepScheduler:
+    """
+    Barrido de pesos de recompensa en paralelo con ASHA (successive halving asincrono).
+
+    Cada prueba es una configuracion aleatoria de RewardsAndPenalty. Todas empiezan con
+    pocas generaciones y solo el mejor 1/ETA de cada escalon (segun 'best_reward') sigue
+    entrenando con ETA veces mas generaciones. Cada resultado se registra en sweeps.csv.
+    """
+    def __init__(self, num_trials: int=SWEEP_TRIALS, num_workers: int=SWEEP_WORKERS,
+                 min_generations: int=SWEEP_MIN_GENERATIONS, max_generations: int=SWEEP_MAX_GENERATIONS,
+                 eta: int=SWEEP_ETA) -> None:
+        self.num_trials = num_trials
+        self.num_workers = num_workers
+        self.eta = eta
+
+        # Escalones (rungs): generaciones totales que alcanza una prueba en cada escalon
+        self.rungs = []
+        generations = min_generations
+        while generations < max_generations:
+            self.rungs.append(generations)
+            generations *= eta
+        self.rungs.append(max_generations)
+
+        self.sweep_id = time.strftime("%Y%m%d%H%M%S")
+        self.sweep_path = AGENT_BASE_PATH + f"sweeps/{self.sweep_id}/"
+
+        self.trials = {}                                      # trial_id -> {'weights', 'generation'}
+        self.rung_results = [dict() for _ in self.rungs]      # Por escalon: trial_id -> best_reward
+        self.promoted = [set() for _ in self.rungs]           # Por escalon: pruebas ya promovidas
+
+    # ---------------------------
+    # FUNCIONES DE PLANIFICACION
+    # ---------------------------
+    def sample_weights(self) -> dict:
+        """Obtiene una configuracion aleatoria de recompensas usando RewardsAndPenalty."""
+        from trainer.env.rewards_and_penalty import RewardsAndPenalty
+        RewardsAndPenalty.get_random_rewards_and_penalty()
+        return {name: float(getattr(RewardsAndPenalty, name)) for name in REWARD_TERMS}
+
+    def get_promotable(self) -> Any:
+        """
+        Busca una prueba que este en el mejor 1/ETA de su escalon y que todavia no
+        haya sido promovida. Empieza por los escalones mas altos.
+        """
+        for rung in reversed(range(len(self.rungs) - 1)):
+            results = self.rung_results[rung]
+            top_count = len(results) // self.eta
+            top_trials = sorted(results, key=results.get, reverse=True)[:top_count]
+            for trial_id in top_trials:
+                if trial_id not in self.promoted[rung]:
+                    return trial_id, rung + 1
+        return None
+
+    def next_job(self) -> Any:
+        """Devuelve la siguiente (prueba, escalon) a entrenar, o None si no queda trabajo."""
+        promotion = self.get_promotable()
+        if promotion is not None:
+            trial_id, rung = promotion
+            self.promoted[rung - 1].add(trial_id)
+            return trial_id, rung
+
+        if len(self.trials) < self.num_trials:
+            trial_id = len(self.trials)
+            self.trials[trial_id] = {'weights': self.sample_weights(), 'generation': 0}
+            return trial_id, 0
+        return None
+
+    # ---------------------------
+    # FUNCIONES DE EJECUCION
+    # ---------------------------
+    def run(self) -> dict:
+        """
+        Ejecuta el barrido completo y devuelve la mejor prueba
+        ({'trial_id', 'rung', 'best_reward', 'weights'}).
+        """
+        os.makedirs(self.sweep_path, exist_ok=True)
+        context = multiprocessing.get_context("spawn")
+        running = {}
+
+        with ProcessPoolExecutor(max_workers=self.num_workers, mp_context=context) as pool:
+            def submit_next() -> bool:
+                job = self.next_job()
+                if job is None:
+                    return False
+                trial_id, rung = job
+                trial = self.trials[trial_id]
+                generations = self.rungs[rung] - trial['generation']
+                state_path = self.sweep_path + f"trial_{trial_id}.pth"
+                future = pool.submit(run_trial_rung, trial_id, trial['weights'], generations, state_path)
+                running[future] = (trial_id, rung)
+                return True
+
+            while len(running) < self.num_workers and submit_next():
+                pass
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    trial_id, rung = running.pop(future)
+                    self.record_result(future, trial_id, rung)
+
+                while len(running) < self.num_workers and submit_next():
+                    pass
+
+        return self.get_best_trial()
+
+    def record_result(self, future, trial_id: int, rung: int) -> None:
+        """Guarda el resultado de un escalon en memoria y en el registro del barrido."""
+        trial = self.trials[trial_id]
+        try:
+            result = future.result()
+        except Exception as error:
+            print(f"Prueba {trial_id} fallo en el escalon {rung}: {error}")
+            SweepCsvData.add_trial_result(self.sweep_id, trial_id, rung, trial['generation'],
+                                          float('nan'), "failed", trial['weights'])
+            return
+
+        trial['generation'] = result['generation']
+        self.rung_results[rung][trial_id] = result['best_reward']
+        status = "complete" if rung == len(self.rungs) - 1 else "evaluated"
+        SweepCsvData.add_trial_result(self.sweep_id, trial_id, rung, result['generation'],
+                                      result['best_reward'], status, trial['weights'])
+        print(f"Prueba {trial_id} | escalon {rung} | generaciones {result['generation']} | "
+              f"mejor recompensa {result['best_reward']:.3f}")
+
+    def get_best_trial(self) -> dict:
+        """Devuelve la mejor prueba del escalon mas alto que tenga resultados."""
+        for rung in reversed(range(len(self.rungs))):
+            results = self.rung_results[rung]
+            if results:
+                trial_id = max(results, key=results.get)
+                return {'trial_id': trial_id,
+                        'rung': rung,
+                        'best_reward': results[trial_id],
+                        'weights': self.trials[trial_id]['weights']}
+        return None
@@ -0,0 +1,188 @@
+import csv
+import gc
+import os
+import sys
+import tracemalloc
+import warnings
+from config.trainer_config import (MEMORY_TRACEMALLOC, MEMORY_TOP_ALLOCATORS, MEMORY_WARMUP_GENERATIONS,
+                                   MEMORY_GROWTH_THRESHOLD_MB)
+
+MB = 1024 * 1024
+
+def process_memory_mb(peak: bool=False) -> float:
+    """
+    Memoria residente del proceso en MB (con peak=True, el pico). Usa /proc en Linux,
+    GetProcessMemoryInfo en Windows y getrusage en el resto (solo tiene el pico).
+    Retorna nan si la plataforma no permite medirla.
+    """
+    if sys.platform == "win32":
+        return windows_memory_mb(peak)
+    if not peak:
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+        except (OSError, ValueError, AttributeError):
+            pass # Sin /proc (macOS): se usa el pico de RSS
+    try:
+        import resource
+    except ImportError:
+        return float('nan')
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / MB if sys.platform == "darwin" else maxrss / 1024 # Bytes en macOS, KB en Linux
+
+def windows_memory_mb(peak: bool=False) -> float:
+    """Working set (o su pico) del proceso actual con GetProcessMemoryInfo."""
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(ProcessMemoryCounters)
+    try:
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return float('nan')
+    except (AttributeError, OSError):
+        return float('nan')
+    return (counters.PeakWorkingSetSize if peak else counters.WorkingSetSize) / MB
+
+class MemoryMonitor:
+    """
+    Telemetria de memoria por generacion: RSS del proceso, tensores vivos, tensores y bytes
+    de cada agente (pesos, estado de Adam y buffers del rollout) y, opcionalmente, los mayores
+    asignadores segun tracemalloc. Si la memoria crece sobre la base mas que el umbral, avisa.
+    """
+    csv_path = "graphics_and_data/data/memory.csv"
+
+    def __init__(self, use_tracemalloc: bool=MEMORY_TRACEMALLOC, top_allocators: int=MEMORY_TOP_ALLOCATORS,
+                 warmup_generations: int=MEMORY_WARMUP_GENERATIONS,
+                 growth_threshold_mb: float=MEMORY_GROWTH_THRESHOLD_MB) -> None:
+        self.use_tracemalloc = use_tracemalloc
+        self.top_allocators = top_allocators
+        self.warmup_generations = warmup_generations
+        self.growth_threshold_mb = growth_threshold_mb
+
+        self.samples = 0
+        self.baseline_rss_mb = None
+        if self.use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    # ---------------------------
+    # FUNCIONES DE MEDICION
+    # ---------------------------
+    def get_rss_mb(self) -> float:
+        """Memoria residente (RSS) actual del proceso en MB."""
+        return process_memory_mb()
+
+    def tensor_stats(self, tensors) -> tuple:
+        """Cantidad de tensores y bytes totales (contando cada almacenamiento una sola vez)."""
+        import torch
+        count = 0
+        total_bytes = 0
+        seen_storages = set()
+        for tensor in tensors:
+            if not torch.is_tensor(tensor):
+                continue
+            count += 1
+            storage = tensor.untyped_storage()
+            if storage.data_ptr() in seen_storages:
+                continue
+            seen_storages.add(storage.data_ptr())
+            total_bytes += storage.nbytes()
+        return count, total_bytes
+
+    def agent_stats(self, agent) -> dict:
+        """Tensores y bytes de un agente, separados en pesos, optimizadores y buffers del rollout."""
+        params = list(agent.actor.parameters()) + list(agent.critic.parameters())
+        optimizer_tensors = [value
+                             for optimizer in (agent.actor_optimizer, agent.critic_optimizer)
+                             for state in optimizer.state.values()
+                             for value in state.values()]
+        buffer_tensors = agent.log_probs + agent.entropies + agent.values
+
+        params_count, params_bytes = self.tensor_stats(params)
+        optimizer_count, optimizer_bytes = self.tensor_stats(optimizer_tensors)
+        buffer_count, buffer_bytes = self.tensor_stats(buffer_tensors)
+        # Modo trayectoria: estados y acciones guardados como arrays de numpy
+        buffer_bytes += sum(array.nbytes for array in agent.states) + sum(array.nbytes for array in agent.actions)
+
+        return {'params_tensors': params_count, 'params_mb': params_bytes / MB,
+                'optimizer_tensors': optimizer_count, 'optimizer_mb': optimizer_bytes / MB,
+                'buffer_tensors': buffer_count, 'buffer_entries': len(agent.rewards), 'buffer_mb': buffer_bytes / MB}
+
+    def count_live_tensors(self) -> tuple:
+        """Cantidad y MB de todos los tensores vivos que ve el recolector de basura."""
+        import torch
+        count, total_bytes = self.tensor_stats(obj for obj in gc.get_objects() if torch.is_tensor(obj))
+        return count, total_bytes / MB
+
+    def top_allocations(self) -> list:
+        """Mayores asignadores (archivo:linea, MB) segun tracemalloc."""
+        if not tracemalloc.is_tracing():
+            return []
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:self.top_allocators]
+        return [(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size / MB) for stat in stats]
+
+    # ---------------------------
+    # FUNCIONES DE MUESTREO
+    # ---------------------------
+    def sample(self, generation: int, agents: list) -> dict:
+        """
+        Toma una muestra de memoria de la generacion (llamar antes de 'learn', cuando los
+        buffers del rollout estan llenos), la guarda en memory.csv y avisa si hay crecimiento.
+        """
+        rss_mb = self.get_rss_mb()
+        live_tensors, live_tensors_mb = self.count_live_tensors()
+        agents_stats = [self.agent_stats(agent) for agent in agents]
+
+        sample = {'generation': generation,
+                  'rss_mb': rss_mb,
+                  'live_tensors': live_tensors,
+                  'live_tensors_mb': live_tensors_mb,
+                  'agents_buffer_mb': sum(stats['buffer_mb'] for stats in agents_stats),
+                  'agents_buffer_tensors': sum(stats['buffer_tensors'] for stats in agents_stats),
+                  'agents_params_mb': sum(stats['params_mb'] + stats['optimizer_mb'] for stats in agents_stats)}
+        # Columnas por agente (agent_0_buffer_mb, ...) para ver que agente o buffer crece
+        for i, stats in enumerate(agents_stats):
+            for name, value in stats.items():
+                sample[f"agent_{i}_{name}"] = value
+        self.save_sample(sample)
+
+        top_allocations = self.top_allocations()
+        for location, size_mb in top_allocations:
+            print(f"[Memoria] {location}: {size_mb:.1f} MB")
+
+        self.samples += 1
+        self.check_growth(generation, rss_mb, top_allocations)
+        sample['agents'] = agents_stats
+        sample['top_allocations'] = top_allocations
+        return sample
+
+    def check_growth(self, generation: int, rss_mb: float, top_allocations: list) -> None:
+        """Fija la base despues del calentamiento y avisa si la memoria crece mas que el umbral."""
+        if self.baseline_rss_mb is None:
+            if self.samples >= self.warmup_generations:
+                self.baseline_rss_mb = rss_mb
+            return
+        growth_mb = rss_mb - self.baseline_rss_mb
+        if growth_mb > self.growth_threshold_mb:
+            culprit = f" (mayor asignador: {top_allocations[0][0]})" if top_allocations else ""
+            warnings.warn(f"Generacion {generation}: la memoria crecio {growth_mb:.1f} MB sobre la base "
+                          f"({self.baseline_rss_mb:.1f} MB -> {rss_mb:.1f} MB){culprit}", RuntimeWarning)
+            self.baseline_rss_mb = rss_mb # Evita repetir la misma advertencia en cada generacion
+
+    def save_sample(self, sample: dict) -> None:
+        """Agrega la muestra al csv de memoria."""
+        os.makedirs(os.path.dirname(MemoryMonitor.csv_path), exist_ok=True)
+        write_header = not os.path.exists(MemoryMonitor.csv_path)
+        with open(MemoryMonitor.csv_path, "a", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=list(sample.keys()))
+            if write_header:
+                writer.writeheader()
+            writer.writerow(sample)
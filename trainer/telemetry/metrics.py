@@ -0,0 +1,149 @@
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config.trainer_config import METRICS_HOST, METRICS_PORT
+
+# Limites de los buckets de latencia (segundos)
+STEP_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+LONG_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+class Histogram:
+    """
+    Histograma acumulativo con buckets fijos. Lo escribe solo el hilo de entrenamiento
+    (sin locks); el servidor solo lee, asi que una lectura puede mezclar dos observaciones
+    consecutivas, lo que no importa para monitoreo.
+    """
+    def __init__(self, name: str, help_text: str, buckets: tuple) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # El ultimo es +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            label = "+Inf" if bound == float('inf') else repr(bound)
+            lines.append(f'{self.name}_bucket{{le="{label}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {self.total}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+class TrainingMetrics:
+    """
+    Metricas del entrenamiento en formato de texto de Prometheus: pasos, pasos por segundo,
+    tiempo por generacion, latencias de select_action y env.step, duracion de learn,
+    tiempo de escritura de checkpoints, mejor recompensa, era y generacion.
+    """
+    def __init__(self) -> None:
+        self.steps_total = 0
+        self.generations_total = 0
+        self.steps_per_second = 0.0
+        self.best_reward = 0.0
+        self.age = 0
+        self.generation = 0
+        self.started_at = time.time()
+        self.last_step_at = self.started_at # Ultima vez que avanzo el contador de pasos (unix)
+        self.steps_window_start = time.perf_counter()
+
+        self.generation_seconds = Histogram("cyra_generation_seconds", "Tiempo de pared por generacion.", LONG_BUCKETS)
+        self.select_action_seconds = Histogram("cyra_select_action_seconds", "Latencia de Agent.select_action.", STEP_BUCKETS)
+        self.env_step_seconds = Histogram("cyra_env_step_seconds", "Latencia de Environment.step.", STEP_BUCKETS)
+        self.learn_seconds = Histogram("cyra_learn_seconds", "Duracion del aprendizaje de la poblacion.", LONG_BUCKETS)
+        self.checkpoint_seconds = Histogram("cyra_checkpoint_write_seconds", "Tiempo de escritura de checkpoints.", LONG_BUCKETS)
+
+    # ---------------------------
+    # FUNCIONES DEL ENTRENAMIENTO
+    # ---------------------------
+    def record_steps(self, steps: int) -> None:
+        """
+        Suma pasos simulados desde el bucle de pasos (cada CONTROL_CHECK_STEPS y al final de la
+        generacion). Los pasos por segundo se miden desde el registro anterior, asi una corrida
+        frenada a mitad de generacion se nota sin esperar a que termine.
+        """
+        if steps <= 0:
+            return
+        now = time.perf_counter()
+        seconds = now - self.steps_window_start
+        self.steps_total += steps
+        self.steps_per_second = steps / seconds if seconds > 0 else 0.0
+        self.steps_window_start = now
+        self.last_step_at = time.time()
+
+    def record_generation(self, seconds: float) -> None:
+        """Registra una generacion terminada con su tiempo de pared (los pasos van por record_steps)."""
+        self.generations_total += 1
+        self.generation_seconds.observe(seconds)
+
+    def set_progress(self, age, generation: int, best_reward: float) -> None:
+        self.age = age if age is not None else 0
+        self.generation = generation
+        self.best_reward = best_reward
+
+    # ---------------------------
+    # FUNCIONES DE EXPOSICION
+    # ---------------------------
+    def render(self) -> str:
+        """Texto con todas las metricas (formato de exposicion de Prometheus)."""
+        lines = []
+        for name, kind, help_text, value in (
+            ("cyra_steps_total", "counter", "Pasos de simulacion totales.", self.steps_total),
+            ("cyra_generations_total", "counter", "Generaciones terminadas.", self.generations_total),
+            ("cyra_steps_per_second", "gauge", "Pasos por segundo desde el registro de pasos anterior.", self.steps_per_second),
+            ("cyra_last_step_time_seconds", "gauge", "Ultima vez que avanzaron los pasos (unix).", self.last_step_at),
+            ("cyra_best_reward", "gauge", "Mejor recompensa de la era.", self.best_reward),
+            ("cyra_age", "gauge", "Era actual del entrenamiento.", self.age),
+            ("cyra_generation", "gauge", "Generacion actual.", self.generation),
+            ("cyra_start_time_seconds", "gauge", "Momento de inicio (unix).", self.started_at)):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {float(value)}"]
+        for histogram in (self.generation_seconds, self.select_action_seconds, self.env_step_seconds,
+                          self.learn_seconds, self.checkpoint_seconds):
+            lines += histogram.render()
+        return "\n".join(lines) + "\n"
+
+class MetricsServer:
+    """Servidor HTTP en un hilo aparte que responde GET /metrics."""
+    def __init__(self, metrics: TrainingMetrics, host: str=METRICS_HOST, port: int=METRICS_PORT) -> None:
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.server = None
+
+    def start(self) -> None:
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                payload = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args) -> None:
+                pass # Sin log por peticion
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"Metricas en http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
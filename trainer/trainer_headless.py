@@ -0,0 +1,38 @@
+import time
+from config.trainer_config import CONTROL_ENABLED, HEADLESS_AUTOSTART
+from trainer.headless_view import HeadlessView
+
+class HeadlessTrainer:
+    """
+    Entrenamiento sin ventana (servidores). Se maneja con la API local de control:
+    start, stop, pause, resume, checkpoint, status y quit.
+    """
+    def __init__(self) -> None:
+        self.view = HeadlessView()
+        self.view.train_running = HEADLESS_AUTOSTART
+        
+        self.control = None
+        if CONTROL_ENABLED:
+            from trainer.control.control_server import ControlServer
+            self.control = ControlServer()
+            self.control.start()
+        
+        # Import diferido: torch y el entorno se cargan recien al crear el entrenamiento
+        from trainer.training import Train
+        self.train = Train(self.view, control=self.control)
+    
+    def run(self) -> None:
+        """Bucle principal: ejecuta generaciones mientras el entrenamiento este activo."""
+        try:
+            while self.view.running:
+                # Limite de generacion: procesa comandos de control
+                self.train.check_controls()
+                
+                if self.view.train_running:
+                    self.train.train_generation()
+                else:
+                    time.sleep(0.1) # Espera comandos sin consumir CPU
+        finally:
+            self.train.close()
+            if self.control is not None:
+                self.control.stop()
@@ -1,5 +1,7 @@
 import pygame
 from config.general_config import WINDOWS_WIDTH, WINDOWS_HEIGHT, FPS
+from config.trainer_config import CONTROL_ENABLED
+from trainer.control.control_server import ControlServer
 from trainer.training import Train
 
 class TrainerView:
@@ -13,8 +15,14 @@ class TrainerView:
         # Variable que determina si puede o no pasar a la siguiente generacion
         self.train_running = False
         
+        # API local de control (start, stop, pause, checkpoint, render_interval, status)
+        self.control = None
+        if CONTROL_ENABLED:
+            self.control = ControlServer()
+            self.control.start()
+        
         # Inicializacion del training
-        self.train = Train(self)
+        self.train = Train(self, control=self.control)
         
         # Configuracion del clock y bandera de ejecucion
         self.clock = pygame.time.Clock()
@@ -23,17 +31,25 @@ class TrainerView:
     def run(self) -> None:
         """Bucle principal del juego. Procesa eventos y ejecuta generaciones de entrenamiento."""
         while self.running:
-            self.process_events()
+            # Limite de generacion: procesa eventos y comandos de control
+            self.train.check_controls()
             
             # Si la generacion anterior termino, se inicia la siguiente
             if self.train_running == True:
                 self.run_next_generation()
             
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            self.render()
         
+        self.train.close()
+        if self.control is not None:
+            self.control.stop()
         pygame.quit()
     
+    def render(self) -> None:
+        """Actualiza la pantalla y limita los frames por segundo."""
+        pygame.display.flip()
+        self.clock.tick(FPS)
+    
     def run_next_generation(self) -> None:
         """
         Ejecuta una nueva generación:
@@ -42,9 +58,8 @@ class TrainerView:
             - Guarda el mejor modelo si se mejora la recompensa promedio.
             - Guarda el número de generación.
         """
-        # Ejecuta entrenamiento y obtiene la recompensa promedio del mismo
-        train_rewards = self.train.run_generation()
-        self.train.evolve_population(avg_rewards=train_rewards)
+        # Ejecuta entrenamiento, aprendizaje y evolucion de la poblacion
+        self.train.train_generation()
     
     def process_events(self) -> None:
         """Procesa eventos de Pygame (cierre de ventana y tecla G para entrenamiento, etc)."""
@@ -1,31 +1,103 @@
 from typing import Any
-import pygame
 import os
+import time
 import numpy as np
 from trainer.env.environment import Environment
 from trainer.env.rewards_and_penalty import RewardsAndPenalty
 from cyra_ai.agent.agent import Agent
 from config.trainer_config import *
-from config.general_config import AGENT_BASE_PATH, FPS
+from config.general_config import AGENT_BASE_PATH
 from graphics_and_data.training_data import TrainCsvData
+from cyra_ai.utils.checkpoints import SharedCheckpoint
+from cyra_ai.utils.model_store import ModelStore
+from trainer.telemetry.memory_monitor import MemoryMonitor
+from trainer.telemetry.metrics import TrainingMetrics, MetricsServer
+from trainer.pipeline.pipelined_learner import PipelinedLearner
+from trainer.env.world_snapshot import WorldSnapshot
+from trainer.evaluation.evaluator import run_episode
+from trainer.evolution.fitness_cache import FitnessCache
+from trainer.recording.frame_recorder import FrameRecorder
+from cyra_ai.agent.population_learner import PopulationLearner
 import copy
 import torch
 
 class Train:
-    def __init__(self, view) -> None:
+    def __init__(self, view, control=None, reward_weights=None) -> None:
         # Obtiene la vista
         self.view = view
         
+        # Pesos de recompensa fijos (pruebas de barrido). Si se indican, no se toca el csv ni los modelos guardados
+        self.reward_weights = reward_weights
+        self.persist = reward_weights is None
+        
+        # API local de control (opcional), se revisa solo en limites de generacion o chunk
+        self.control = control
+        self.paused = False
+        self.render_interval = RENDER_INTERVAL
+        self.action_repeat = max(1, ACTION_REPEAT) # Cada cuantos pasos se selecciona una nueva accion
+        self.current_rewards = np.zeros(NUM_AGENTS) # Recompensas acumuladas de la generacion en curso
+        self.last_generation_steps = 0 # Pasos simulados en la ultima generacion
+        self.prescreen_scores = None # Puntajes de los mutantes en el ultimo pre-filtrado
+        # Cache de fitness por hash de pesos (no aplica en modo pipeline, donde elige el hilo del learner)
+        if FITNESS_CACHE_ENABLED and CRN_SELECTION:
+            raise ValueError("FITNESS_CACHE_ENABLED y CRN_SELECTION no se pueden combinar: "
+                             "el cache acumula retornos de generaciones completas, no de evaluaciones CRN")
+        self.fitness_cache = FitnessCache() if FITNESS_CACHE_ENABLED and not PIPELINE_ENABLED else None
+        self.elite = None # Elite sin cambios de la generacion anterior (no aprende, asi conserva su hash)
+        self.parked_elite = None # Elite con estimacion precisa que no se vuelve a simular
+        self.memory_monitor = MemoryMonitor() if MEMORY_TELEMETRY and self.persist else None # Telemetria de memoria por generacion
+        self.model_store = ModelStore() if MODEL_STORE_ENABLED and self.persist else None # Hall of fame y linaje
+        # Metricas en vivo (formato Prometheus) servidas en un hilo aparte
+        self.metrics = None
+        self.metrics_server = None
+        if METRICS_ENABLED and self.persist:
+            self.metrics = TrainingMetrics()
+            self.metrics_server = MetricsServer(self.metrics)
+            self.metrics_server.start()
+        self.recorder = None # Grabador de frames (se crea al activar la grabacion)
+        self.stopped_recorders = [] # Grabadores detenidos que pueden seguir guardando frames pendientes
+        if RECORDING_ENABLED and self.persist:
+            self.set_recording(True)
+        
         self.init_train_values()
         
+        # Ultimo mejor modelo de la era en el hall of fame: padre del proximo mejor modelo
+        self.hall_of_fame_id = None
+        if self.model_store is not None:
+            hall_of_fame = self.model_store.hall_of_fame(age=self.current_age)
+            self.hall_of_fame_id = hall_of_fame[0]['id'] if hall_of_fame else None
+        
         # Inicializacion del entorno y agentes
         self.env = Environment(self.view.screen, num_cyras=NUM_AGENTS)
         self.cyras = [Agent() for _ in range(NUM_AGENTS)]
         
         # Carga el modelo guardado y este existe y evalua para obtener una recompensa base
         self.load_agent_if_exist()
+        
+        # Aprendizaje en lote: los agentes graban trayectorias y se actualizan todos juntos
+        self.population_learner = None
+        if BATCHED_LEARN:
+            self.population_learner = PopulationLearner()
+        # El lote y los tramos recalculan log_probs y valores desde la trayectoria guardada
+        if BATCHED_LEARN or CHUNK_LEARN_STEPS > 0:
+            for agent in self.cyras:
+                agent.record_trajectory = True
+        
+        # Modo pipeline: los actores graban trayectorias y un hilo aprende la generacion anterior
+        self.pipeline = None
+        if PIPELINE_ENABLED and self.persist:
+            for agent in self.cyras:
+                agent.record_trajectory = True
+            self.pipeline = PipelinedLearner(self)
 
     def init_train_values(self) -> None:
+        if not self.persist: # Prueba de un barrido de recompensas
+            for name, value in self.reward_weights.items():
+                setattr(RewardsAndPenalty, name, value)
+            self.generation = 0
+            self.best_reward = -float('inf')
+            self.current_age = None
+            return
         if NEW_TRAIN: # Si es un nuevo entrenamiento
             RewardsAndPenalty.get_random_rewards_and_penalty() # Suministra recompenzas y penalizaciones aleatorias
             TrainCsvData.add_new_train_data_row() # Agrega una nueva fina con los datos del nuevo entrenamiento al csv
@@ -41,95 +113,495 @@ class Train:
     # --------------------------
     # FUNCIONES DE ENTRENAMIENTO Y EVALUACION
     # --------------------------
-    def run_generation(self) -> list:
+    def train_generation(self) -> None:
+        """
+        Ejecuta una generación completa: simulación, aprendizaje y evolución.
+        En modo pipeline el aprendizaje de esta generación corre en segundo plano
+        mientras se simula la siguiente.
+        """
+        start_time = time.perf_counter()
+        if self.pipeline is None:
+            train_rewards = self.run_generation()
+            self.evolve_population(avg_rewards=train_rewards)
+        else:
+            train_rewards = self.run_generation(learn=False)
+            self.pipeline.submit(self.generation, train_rewards)
+            self.pipeline.hand_off()
+        if self.metrics is not None:
+            self.metrics.record_generation(time.perf_counter() - start_time)
+    
+    def close(self) -> None:
+        """Termina el aprendizaje pendiente (modo pipeline) antes de salir."""
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            self.pipeline = None
+        self.set_recording(False)
+        for recorder in self.stopped_recorders:
+            recorder.join()
+        self.stopped_recorders = []
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+    
+    def set_recording(self, enabled: bool) -> None:
+        """
+        Activa o desactiva la grabacion de frames. Al desactivar no espera al disco: el hilo
+        escritor guarda lo pendiente en segundo plano y close() espera a que termine.
+        """
+        if enabled and self.recorder is None:
+            self.stopped_recorders = [recorder for recorder in self.stopped_recorders if recorder.thread.is_alive()]
+            self.recorder = FrameRecorder()
+            self.recorder.start()
+        elif not enabled and self.recorder is not None:
+            self.recorder.stop()
+            self.stopped_recorders.append(self.recorder)
+            self.recorder = None
+    
+    def run_generation(self, learn: bool=True, max_steps: int=MAX_STEPS) -> list:
         """
         Ejecuta un ciclo de entrenamiento (generación) en el entorno.
         Se reutiliza el objeto Environment y se acumulan recompensas de cada episodio.
         Retorna la recompensa promedio por agente para la generación.
+        Con learn=False los agentes conservan sus buffers (por ejemplo, para enviarlos a un learner remoto).
+        Con CHUNK_LEARN_STEPS > 0 los agentes aprenden cada tantos pasos (rollout truncado) sin
+        reiniciar el entorno; el scheduler y la exploracion se ajustan una vez al final.
         """
         self.generation += 1
         states = self.env.reset() # Reposiciona a todos los cyras y actualiza la comida
         generation_rewards = np.zeros(NUM_AGENTS)
         
-        for _ in range(MAX_STEPS):
-            # Selecciona una accion para cada agente usando su estado actual
-            actions = [agent.select_action(states[i]) for i, agent in enumerate(self.cyras)]
+        self.current_rewards = generation_rewards
+        if self.recorder is not None:
+            self.recorder.start_generation(f"age_{self.current_age}/generation_{self.generation:05d}")
+        
+        # Action repeat: la accion de cada agente se mantiene 'action_repeat' pasos
+        # y la recompensa de ese intervalo se guarda una sola vez
+        held_actions = None
+        held_rewards = np.zeros(NUM_AGENTS)
+        held_steps = 0
+        metrics = self.metrics
+        
+        # Aprendizaje por tramos: los buffers solo guardan los pasos desde el ultimo tramo
+        chunk_learn = learn and CHUNK_LEARN_STEPS > 0
+        chunk_steps = 0
+        learn_seconds = 0.0
+        counted_steps = 0 # Pasos ya sumados a las metricas
+        
+        for step in range(max_steps):
+            # Selecciona una accion para cada agente usando su estado actual (solo al inicio del intervalo)
+            if held_steps == 0:
+                held_actions = self.select_actions(states)
 
             # Actualiza el entorno con las acciones y obtiene nuevos estados y recompensas
-            next_states, rewards, done = self.env.step(actions)
+            step_start = time.perf_counter()
+            next_states, rewards, done = self.env.step(held_actions)
+            if metrics is not None:
+                metrics.env_step_seconds.observe(time.perf_counter() - step_start)
             
-            # Almacena la recompensa de cada agente
+            # Acumula la recompensa de cada agente en el intervalo
+            held_steps += 1
             for i in range(NUM_AGENTS):
-                #agent.store_reward(rewards[i])
-                self.cyras[i].store_reward(rewards[i])
+                held_rewards[i] += rewards[i]
                 generation_rewards[i] += rewards[i]
             
             states = next_states
-            # Actializa la pantalla en cada paso
-            pygame.display.flip()
-            self.view.clock.tick(FPS)
+            # Actualiza la pantalla cada 'render_interval' pasos
+            if self.render_interval > 0 and step % self.render_interval == 0:
+                self.view.render()
+            # Graba el frame cada 'stride' pasos sin esperar al disco
+            if self.recorder is not None:
+                self.recorder.capture(step, surface=self.view.screen, env=self.env)
             
-            # Verifica eventos de teclado y si puede seguir con con la generacion
-            self.view.process_events()
-            if done or not self.view.train_running:
+            # Verifica eventos y comandos de control solo en los limites de chunk
+            if (step + 1) % CONTROL_CHECK_STEPS == 0:
+                if metrics is not None:
+                    metrics.record_steps(step + 1 - counted_steps)
+                    counted_steps = step + 1
+                self.check_controls(step=step + 1)
+            finished = done or not self.view.train_running
+            
+            # Al terminar el intervalo guarda la recompensa acumulada (una por cada accion seleccionada)
+            if held_steps >= self.action_repeat or finished or step == max_steps - 1:
+                for i in range(NUM_AGENTS):
+                    self.cyras[i].store_reward(held_rewards[i])
+                held_rewards[:] = 0.0
+                held_steps = 0
+            
+            # Tramo completo (al cerrar un intervalo de accion): aprende y sigue desde el mismo estado
+            chunk_steps += 1
+            if chunk_learn and held_steps == 0 and chunk_steps >= CHUNK_LEARN_STEPS \
+                    and not finished and step < max_steps - 1:
+                learn_start = time.perf_counter()
+                self.learn_chunk(states, done=False)
+                learn_seconds += time.perf_counter() - learn_start
+                chunk_steps = 0
+            
+            if finished:
                 break
+        self.last_generation_steps = step + 1
+        if metrics is not None:
+            metrics.record_steps(self.last_generation_steps - counted_steps)
             
+        # Muestra de memoria con los buffers del rollout llenos (pico de la generacion)
+        if self.memory_monitor is not None:
+            self.memory_monitor.sample(self.generation, self.cyras)
+        
         # Al final de cada generacion, cada agente actualiza su politica
-        for agent in self.cyras:
-            agent.learn()
+        if learn:
+            learn_start = time.perf_counter()
+            learners = [agent for agent in self.cyras if agent is not self.elite]
+            if self.elite is not None and self.elite in self.cyras:
+                self.elite.clear_buffers() # Congelado: sin aprendizaje ni ajustes de exploracion
+            if chunk_learn:
+                # Ultimo tramo (sin valor siguiente solo si el episodio termino) y ajustes de la generacion
+                self.learn_chunk(states, done=done)
+                for agent in learners:
+                    agent.end_generation()
+            elif self.population_learner is not None:
+                self.population_learner.learn(learners)
+            else:
+                for agent in learners:
+                    agent.learn()
+            if metrics is not None:
+                metrics.learn_seconds.observe(learn_seconds + time.perf_counter() - learn_start)
         
         return generation_rewards
     
+    def learn_chunk(self, states, done: bool) -> None:
+        """
+        Un tramo de rollout truncado: cada agente (salvo el elite congelado) aprende de los pasos
+        guardados desde el tramo anterior, completando los retornos con el valor de su critico
+        en el estado actual (salvo que el episodio haya terminado).
+        """
+        learners, next_states = [], []
+        for i, agent in enumerate(self.cyras):
+            if agent is self.elite:
+                agent.clear_buffers()
+                continue
+            learners.append(agent)
+            next_states.append(None if done else states[i])
+        if self.population_learner is not None:
+            self.population_learner.learn_chunk(learners, next_states, epochs=CHUNK_LEARN_EPOCHS)
+        else:
+            for agent, state in zip(learners, next_states):
+                agent.learn_chunk(state, epochs=CHUNK_LEARN_EPOCHS)
+    
+    def select_actions(self, states) -> list:
+        """Una accion por agente (midiendo la latencia de cada select_action si hay metricas)."""
+        if self.metrics is None:
+            return [agent.select_action(states[i]) for i, agent in enumerate(self.cyras)]
+        actions = []
+        for i, agent in enumerate(self.cyras):
+            start = time.perf_counter()
+            actions.append(agent.select_action(states[i]))
+            self.metrics.select_action_seconds.observe(time.perf_counter() - start)
+        return actions
+    
     def evolve_population(self, avg_rewards) -> None:
         """
         Selecciona al mejor agente y genera una nueva población
         copiando sus parámetros con pequeñas mutaciones.
         """
-        best_reward_index = int(np.argmax(avg_rewards))
-        best_agent = self.cyras[best_reward_index]
+        if self.fitness_cache is not None:
+            self.evolve_with_fitness_cache(avg_rewards)
+            return
+        best_reward_index = self.select_best_index(avg_rewards)
         best_reward = avg_rewards[best_reward_index]
 
+        new_cyras = self.next_population(self.cyras, best_reward_index, prescreen=PRESCREEN_ENABLED)
+        
+        self.record_generation_result(self.generation, best_reward, best_reward_index)
+        
+        self.cyras = new_cyras
+    
+    def evolve_with_fitness_cache(self, avg_rewards) -> None:
+        """
+        Como evolve_population, pero elige segun las estadisticas acumuladas de cada agente
+        (cache de fitness). El elite aparcado compite con su estimacion sin haberse simulado;
+        si el nuevo elite ya tiene una estimacion precisa (y FITNESS_CACHE_SKIP_TIGHT), queda
+        aparcado y todos los lugares de la simulacion son para mutantes.
+        """
+        simulated = len(self.cyras)
+        candidates = self.cyras + ([self.parked_elite] if self.parked_elite is not None else [])
+        keys = [FitnessCache.key(agent) for agent in candidates]
+        for key, reward in zip(keys[:simulated], avg_rewards):
+            self.fitness_cache.add(key, float(reward))
+        
+        # Con una sola muestra se usa la dispersion de la generacion como desvio
+        scores = self.fitness_cache.scores(keys, prior_std=float(np.std(avg_rewards)))
+        best_index = int(np.argmax(scores))
+        best_agent = candidates[best_index]
+        # Al csv va la recompensa de generacion del elegido, como en los demas modos
+        # (la de su ultima generacion simulada si es el elite aparcado)
+        best_reward = self.fitness_cache.last(keys[best_index])
+        
+        # El elite aparcado sigue siendo preciso (no suma muestras), asi que si gana vuelve a aparcarse
+        if FITNESS_CACHE_SKIP_TIGHT and self.fitness_cache.is_tight(keys[best_index]):
+            self.store_lineage(best_agent, {'event': 'elite', 'generation': self.generation})
+            new_cyras = self.mutant_clones(best_agent, simulated, prescreen=PRESCREEN_ENABLED)
+            self.parked_elite = best_agent
+            self.elite = None
+        else:
+            new_cyras = self.next_population(self.cyras, best_index, prescreen=PRESCREEN_ENABLED)
+            self.parked_elite = None
+            self.elite = best_agent
+        
+        self.record_generation_result(self.generation, best_reward, best_index, agent=best_agent)
+        self.cyras = new_cyras
+        self.fitness_cache.retain([keys[best_index]])
+    
+    def record_generation_result(self, generation: int, best_reward: float, best_reward_index: int,
+                                 agent=None) -> None:
+        """
+        Guarda el mejor agente (si mejora) y actualiza la generación y la mejor recompensa en el csv.
+        'agent' permite indicar un mejor agente que no esta en self.cyras (por ejemplo, el elite aparcado).
+        """
+        self.save_best_agent(best_reward, best_reward_index, agent)
+        if self.persist:
+            TrainCsvData.update_gen_and_rewards_data(self.current_age, generation, self.best_reward)
+        if self.metrics is not None:
+            self.metrics.set_progress(self.current_age, generation, float(self.best_reward))
+    
+    def select_best_index(self, avg_rewards) -> int:
+        """
+        Indice del mejor agente. Por defecto segun la recompensa de la generación; con CRN_SELECTION
+        segun evaluaciones de todos los agentes desde las mismas fotos del mundo (menos ruido).
+        """
+        if not CRN_SELECTION:
+            return int(np.argmax(avg_rewards))
+        return int(np.argmax(self.evaluate_candidates(self.cyras)))
+    
+    def evaluate_candidates(self, candidates: list, steps: int=CRN_EVAL_STEPS, episodes: int=CRN_EPISODES) -> np.ndarray:
+        """
+        Evalua cada candidato desde fotos idénticas del mundo (common random numbers): mismas
+        posiciones, comida y semillas. Cada candidato controla a todos los cyras y solo se usa
+        inferencia, sin escribir en los buffers. Retorna el retorno medio de cada candidato.
+        """
+        scores = np.zeros(len(candidates))
+        for _ in range(episodes):
+            snapshot = WorldSnapshot.capture(self.env, self.env.reset())
+            for i, candidate in enumerate(candidates):
+                states = snapshot.restore(self.env)
+                returns, _ = run_episode(self.env, [candidate] * NUM_AGENTS, steps, states=states)
+                scores[i] += returns.mean()
+        return scores / episodes
+    
+    def next_population(self, agents: list, best_reward_index: int, prescreen: bool=False) -> list:
+        """
+        Arma la siguiente población: el mejor agente sin cambios y clones mutados en el resto.
+        Con prescreen se generan más mutantes de los necesarios y solo pasan los mejores en
+        rollouts cortos. No guarda checkpoints (solo el linaje en el almacen de modelos), asi
+        se puede usar desde el hilo del learner en modo pipeline (sin prescreen, que usa el entorno).
+        """
+        best_agent = agents[best_reward_index]
+        elite_id = self.store_lineage(best_agent, {'event': 'elite', 'generation': self.generation})
+        clones = self.mutant_clones(best_agent, len(agents) - 1, prescreen)
+        
         new_cyras = []
-        for i in range(len(self.cyras)):
+        for i in range(len(agents)):
             if i == best_reward_index:
                 # mantenemos el mejor sin cambios
                 new_cyras.append(best_agent)
             else:
-                # clon del mejor + mutación
-                clone = copy.deepcopy(best_agent)
-                self._mutate_agent(clone, mutation_rate=0.05, mutation_std=0.02)
-                new_cyras.append(clone)
-        
-        self.save_best_agent(best_reward, best_reward_index)
-        TrainCsvData.update_gen_and_rewards_data(self.current_age, self.generation, self.best_reward)
-        
-        self.cyras = new_cyras
+                new_cyras.append(clones.pop(0))
+        best_agent.lineage_parent = elite_id
+        return new_cyras
+    
+    def mutant_clones(self, best_agent, num_clones: int, prescreen: bool=False) -> list:
+        """Clones mutados del mejor agente (pre-filtrados si prescreen), con su linaje guardado."""
+        if prescreen:
+            clones = self.prescreen_mutants(best_agent, num_clones)
+        else:
+            clones = [self.mutated_clone(best_agent) for _ in range(num_clones)]
+        for clone in clones:
+            self.store_lineage(clone, {'event': 'mutation', 'generation': self.generation})
+        return clones
+    
+    def mutated_clone(self, agent) -> Agent:
+        """Clon del agente + mutación."""
+        clone = copy.deepcopy(agent)
+        self._mutate_agent(clone, mutation_rate=0.05, mutation_std=0.02)
+        return clone
+    
+    def prescreen_mutants(self, best_agent, num_clones: int, candidates: int=PRESCREEN_CANDIDATES) -> list:
+        """
+        Genera 'candidates' mutantes, los evalua en rollouts cortos desde las mismas fotos
+        del mundo (evaluate_candidates, solo inferencia) y retorna los 'num_clones' mejores.
+        """
+        mutants = [self.mutated_clone(best_agent) for _ in range(max(candidates, num_clones))]
+        scores = self.evaluate_candidates(mutants, steps=PRESCREEN_STEPS, episodes=PRESCREEN_EPISODES)
+        order = np.argsort(-scores)[:num_clones]
+        self.prescreen_scores = scores
+        return [mutants[i] for i in order]
+    
+    def store_lineage(self, agent, metadata: dict) -> str:
+        """
+        Guarda el agente en el almacen de modelos (si el linaje esta activo) y lo marca como
+        padre de lo que siga aprendiendo. Los tensores sin cambios no se vuelven a escribir.
+        """
+        if self.model_store is None or not MODEL_STORE_LINEAGE:
+            agent.lineage_mutation = None # La mutacion solo describe pesos que se guardan en este punto
+            return agent.lineage_parent
+        model_id = self.model_store.put_agent(agent, metadata)
+        agent.lineage_parent = model_id
+        agent.lineage_mutation = None
+        return model_id
 
     def _mutate_agent(self, cyra, mutation_rate: float=0.05, mutation_std: float=0.02) -> None:
         """
         Aplica mutaciones gaussianas pequeñas a los parámetros del actor y crítico.
         """
-        for param in cyra.actor.parameters():
+        cyra.unshare_weights() # Copy-on-write antes de mutar
+        mutated = []
+        for name, param in cyra.actor.named_parameters():
             if torch.rand(1).item() < mutation_rate:
                 noise = torch.randn_like(param) * mutation_std
                 param.data.add_(noise)
-        for param in cyra.critic.parameters():
+                mutated.append(f"actor.{name}")
+        for name, param in cyra.critic.named_parameters():
             if torch.rand(1).item() < mutation_rate:
                 noise = torch.randn_like(param) * mutation_std
                 param.data.add_(noise)
+                mutated.append(f"critic.{name}")
+        cyra.lineage_mutation = {'mutation_rate': mutation_rate, 'mutation_std': mutation_std, 'mutated': mutated}
+    
+    # --------------------------
+    # FUNCIONES DE CONTROL
+    # --------------------------
+    def check_controls(self, step: int=0) -> None:
+        """
+        Procesa eventos de la vista y comandos de la API de control.
+        Se llama en los limites de generacion o de chunk, nunca en cada paso.
+        """
+        self.view.process_events()
+        self.apply_control_commands()
+        self.publish_status(step)
+        
+        # Mientras este pausado se queda esperando comandos (sin simular)
+        while self.paused and self.view.running and self.view.train_running:
+            time.sleep(0.1)
+            self.view.process_events()
+            self.apply_control_commands()
+            self.publish_status(step)
+    
+    def apply_control_commands(self) -> None:
+        """Aplica los comandos pendientes del servidor de control."""
+        if self.control is None:
+            return
+        for command, value in self.control.poll_commands():
+            if command == "start":
+                self.view.train_running = True
+                self.paused = False
+            elif command == "stop":
+                self.view.train_running = False
+                self.paused = False
+            elif command == "pause":
+                self.paused = True
+            elif command == "resume":
+                self.paused = False
+            elif command == "checkpoint":
+                self.save_checkpoint()
+            elif command == "render_interval":
+                self.render_interval = value
+            elif command == "action_repeat":
+                self.action_repeat = max(1, value)
+            elif command == "record":
+                self.set_recording(bool(value))
+            elif command == "quit":
+                self.view.train_running = False
+                self.view.running = False
+                self.paused = False
+    
+    def publish_status(self, step: int=0) -> None:
+        """Publica el estado del entrenamiento para el comando 'status'."""
+        if self.control is None:
+            return
+        self.control.update_status(
+            age=self.current_age,
+            generation=self.generation,
+            step=step,
+            best_reward=float(self.best_reward),
+            train_running=self.view.train_running,
+            paused=self.paused,
+            render_interval=self.render_interval,
+            action_repeat=self.action_repeat,
+            generation_rewards=[float(r) for r in self.current_rewards])
     
     # -------------------
     # FUNCIONES DE GUARDADO/CARGA DEL MODELO
     # -------------------
     def load_agent_if_exist(self) -> None:
         """Si existe un modelo guardado, lo carga en todos los agentes y actualiza la mejor recompensa."""
+        if not self.persist:
+            return
         if os.path.exists(AGENT_BASE_PATH+f"agent_{self.current_age}.pth") and NEW_TRAIN == False:
+            # El checkpoint se lee una sola vez y todos los agentes comparten sus tensores
             for agent in self.cyras:
-                agent.load_model(AGENT_BASE_PATH+f"agent_{self.current_age}.pth")
+                agent.load_model(AGENT_BASE_PATH+f"agent_{self.current_age}.pth", shared=True)
+            SharedCheckpoint.clear()
             print("Mejor modelo cargado")
         print("No existe un agente con esa ruta")
         
-    def save_best_agent(self, current_best_reward: float, best_reward_index: int) -> None:
+    def save_best_agent(self, current_best_reward: float, best_reward_index: int, agent=None) -> None:
+        agent = agent if agent is not None else self.cyras[best_reward_index]
         if current_best_reward > self.best_reward:
             self.best_reward = current_best_reward
-            self.cyras[best_reward_index].save_model(AGENT_BASE_PATH+f"agent_{self.current_age}.pth")
\ No newline at end of file
+            if self.persist:
+                self.save_model_timed(agent, AGENT_BASE_PATH+f"agent_{self.current_age}.pth")
+            # Cada mejor modelo queda en el hall of fame (el archivo de la era solo guarda el ultimo),
+            # con el mejor modelo anterior como padre; sin mutacion, porque sus pesos ya pasaron por el aprendizaje
+            if self.model_store is not None:
+                state = {'actor_state_dict': agent.actor.state_dict(), 'critic_state_dict': agent.critic.state_dict()}
+                self.hall_of_fame_id = self.model_store.put_state(
+                    state, parent=self.hall_of_fame_id, exploration_rate=agent.exploration_rate, metadata={
+                        'event': 'best', 'hall_of_fame': True, 'age': self.current_age,
+                        'generation': self.generation, 'reward': float(current_best_reward)})
+    
+    def save_checkpoint(self) -> None:
+        """
+        Guarda (forzado) el agente con mas recompensa en la generacion actual,
+        sin sobrescribir el mejor modelo de la era.
+        """
+        best_index = int(np.argmax(self.current_rewards))
+        path = AGENT_BASE_PATH+f"agent_{self.current_age}_checkpoint.pth"
+        self.save_model_timed(self.cyras[best_index], path)
+        print(f"Checkpoint guardado en {path}")
+    
+    def save_model_timed(self, agent, path) -> None:
+        """Guarda el modelo del agente registrando el tiempo de escritura en las metricas."""
+        start = time.perf_counter()
+        agent.save_model(path)
+        if self.metrics is not None:
+            self.metrics.checkpoint_seconds.observe(time.perf_counter() - start)
+    
+    def save_population(self, path) -> None:
+        """
+        Guarda toda la poblacion junto con la generacion y la mejor recompensa: pesos, tasa de
+        exploracion, estado de Adam y del scheduler de cada agente (para continuar el entrenamiento).
+        """
+        torch.save({
+            'generation': self.generation,
+            'best_reward': float(self.best_reward),
+            'agents': [{
+                'actor_state_dict': agent.actor.state_dict(),
+                'critic_state_dict': agent.critic.state_dict(),
+                'exploration_rate': agent.exploration_rate,
+                'actor_optimizer_state_dict': agent.actor_optimizer.state_dict(),
+                'critic_optimizer_state_dict': agent.critic_optimizer.state_dict(),
+                'scheduler_state_dict': agent.scheduler.state_dict()
+            } for agent in self.cyras]
+        }, path)
+    
+    def load_population(self, path) -> None:
+        """Carga una poblacion guardada con 'save_population' y continua desde el mismo estado."""
+        checkpoint = torch.load(path, map_location="cpu", weights_only=True)
+        self.generation = checkpoint['generation']
+        self.best_reward = checkpoint['best_reward']
+        for agent, state in zip(self.cyras, checkpoint['agents']):
+            agent.unshare_weights()
+            agent.actor.load_state_dict(state['actor_state_dict'])
+            agent.critic.load_state_dict(state['critic_state_dict'])
+            agent.exploration_rate = state['exploration_rate']
+            agent.actor_optimizer.load_state_dict(state['actor_optimizer_state_dict'])
+            agent.critic_optimizer.load_state_dict(state['critic_optimizer_state_dict'])
+            agent.scheduler.load_state_dict(state['scheduler_state_dict'])
\ No newline at end of file